@@ -3,6 +3,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from collections import defaultdict
 
+import numpy as np
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,12 +23,15 @@ from app.schemas.analytics import (
 )
 from app.api.routes.auth import get_current_user
 from app.services.holding_service import holding_service
-from app.external.yfinance_client import yfinance_client
+from app.services.benchmark_service import BENCHMARKS, DEFAULT_BENCHMARK, get_benchmark_closes
+from app.services.portfolio_overview import (
+    build_concentration,
+    build_sector_allocation,
+    get_max_drawdown,
+)
 
 router = APIRouter()
 
-CONCENTRATION_THRESHOLD = 20.0
-
 
 @router.get("/period-returns", response_model=PeriodReturns)
 async def get_period_returns(
@@ -103,68 +107,7 @@ async def get_sector_allocation(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> list[dict]:
     holdings = await holding_service.get_holdings_with_metrics(db, current_user.id)
-
-    # 섹터별 데이터 집계
-    sector_data: dict[str, dict] = defaultdict(
-        lambda: {"value_krw": Decimal("0"), "stocks": []}
-    )
-    total_value = Decimal("0")
-
-    for h in holdings:
-        stock = h["stock"]
-        if not stock:
-            continue
-            
-        sector = stock.sector
-        if not sector or sector == "Unknown":
-            sector = "기타"
-            
-        value_krw = Decimal(str(h["current_value_krw"]))
-        total_value += value_krw
-        
-        # 타입 힌트를 위해 명시적 형변환 또는 any 사용
-        data = sector_data[sector]
-        if isinstance(data["value_krw"], Decimal):
-            data["value_krw"] += value_krw
-            
-        if isinstance(data["stocks"], list):
-            data["stocks"].append({
-                "name": stock.name,
-                "ticker": stock.ticker,
-                "value_krw": float(value_krw),
-                "weight_in_sector": 0.0 
-            })
-
-    result = []
-    for sector, data in sorted(sector_data.items(), key=lambda x: x[1]["value_krw"], reverse=True):
-        # 형변환 안전하게 처리
-        sector_val_decimal = data["value_krw"] if isinstance(data["value_krw"], Decimal) else Decimal(str(data["value_krw"]))
-        
-        weight = float(sector_val_decimal / total_value * 100) if total_value > 0 else 0
-        
-        stocks_info = []
-        raw_stocks = data["stocks"] if isinstance(data["stocks"], list) else []
-        
-        for s in raw_stocks:
-            s_weight = float(Decimal(str(s["value_krw"])) / total_value * 100) if total_value > 0 else 0
-            stocks_info.append({
-                "name": s["name"],
-                "ticker": s["ticker"],
-                "value_krw": s["value_krw"],
-                "weight_percent": s_weight
-            })
-        
-        stocks_info.sort(key=lambda x: x["value_krw"], reverse=True)
-        
-        result.append({
-            "sector": sector,
-            "value_krw": float(sector_val_decimal),
-            "weight_percent": weight,
-            "stock_count": len(stocks_info),
-            "stocks": stocks_info
-        })
-
-    return result
+    return build_sector_allocation(holdings)
 
 
 @router.get("/benchmark", response_model=BenchmarkComparison)
@@ -174,13 +117,9 @@ async def get_benchmark_comparison(
     benchmark: Annotated[str, Query()] = "SP500",
     days: Annotated[int, Query(ge=30, le=365)] = 90,
 ) -> dict:
-    benchmark_tickers = {
-        "KOSPI": ("^KS11", "KOSPI"),
-        "SP500": ("^GSPC", "S&P 500"),
-        "NASDAQ": ("^IXIC", "NASDAQ"),
-    }
-    
-    ticker, name = benchmark_tickers.get(benchmark, ("^GSPC", "S&P 500"))
+    if benchmark not in BENCHMARKS:
+        benchmark = DEFAULT_BENCHMARK
+    ticker, name = BENCHMARKS[benchmark]
     start_date = date.today() - timedelta(days=days)
 
     stmt = (
@@ -194,35 +133,47 @@ async def get_benchmark_comparison(
     result = await db.execute(stmt)
     performances = list(result.scalars().all())
 
-    benchmark_data = await yfinance_client.get_benchmark_data(
-        benchmark, start_date, date.today()
+    # 로컬 지수 이력 테이블에서 조회 (비어 있는 앞/뒤 구간만 yfinance 호출)
+    benchmark_dates, benchmark_closes = await get_benchmark_closes(
+        db, benchmark, start_date, date.today()
     )
 
-    benchmark_by_date = {d["date"]: d["close"] for d in benchmark_data}
-
     data = []
-    portfolio_base = performances[0].total_value_krw if performances else 0
-    benchmark_base = benchmark_data[0]["close"] if benchmark_data else 0
-
-    for p in performances:
-        benchmark_close = benchmark_by_date.get(p.record_date)
-        if benchmark_close is None:
-            continue
-
-        portfolio_return = (
-            float((p.total_value_krw - portfolio_base) / portfolio_base * 100)
-            if portfolio_base > 0 else 0
+    if performances and len(benchmark_dates):
+        # 포트폴리오 기록일과 벤치마크 거래일이 일치하는 날짜만 비교 (배열 searchsorted)
+        record_dates = np.array(
+            [p.record_date for p in performances], dtype="datetime64[D]"
         )
-        benchmark_return = (
-            float((benchmark_close - benchmark_base) / benchmark_base * 100)
-            if benchmark_base > 0 else 0
+        values = np.array([float(p.total_value_krw) for p in performances])
+        idx = np.searchsorted(benchmark_dates, record_dates)
+        idx_clipped = np.minimum(idx, len(benchmark_dates) - 1)
+        matched = (idx < len(benchmark_dates)) & (
+            benchmark_dates[idx_clipped] == record_dates
         )
+        closes = benchmark_closes[idx_clipped[matched]]
 
-        data.append({
-            "date": p.record_date,
-            "portfolio_return_percent": portfolio_return,
-            "benchmark_return_percent": benchmark_return,
-        })
+        portfolio_base = values[0]
+        benchmark_base = benchmark_closes[0]
+        portfolio_returns = (
+            (values[matched] - portfolio_base) / portfolio_base * 100
+            if portfolio_base > 0 else np.zeros(int(matched.sum()))
+        )
+        benchmark_returns = (
+            (closes - benchmark_base) / benchmark_base * 100
+            if benchmark_base > 0 else np.zeros(len(closes))
+        )
+        data = [
+            {
+                "date": d,
+                "portfolio_return_percent": pr,
+                "benchmark_return_percent": br,
+            }
+            for d, pr, br in zip(
+                record_dates[matched].astype(object),
+                portfolio_returns.tolist(),
+                benchmark_returns.tolist(),
+            )
+        ]
 
     portfolio_total = data[-1]["portfolio_return_percent"] if data else 0
     benchmark_total = data[-1]["benchmark_return_percent"] if data else 0
@@ -244,68 +195,9 @@ async def get_risk_metrics(
     days: Annotated[int, Query(ge=30, le=365)] = 90,
 ) -> dict:
     holdings = await holding_service.get_holdings_with_metrics(db, current_user.id)
-
-    warnings = []
-    sorted_holdings = sorted(holdings, key=lambda h: h["weight_percent"], reverse=True)
-
-    for h in sorted_holdings:
-        if h["weight_percent"] >= CONCENTRATION_THRESHOLD:
-            stock = h["stock"]
-            if stock:
-                warnings.append({
-                    "ticker": stock.ticker,
-                    "name": stock.name,
-                    "weight_percent": h["weight_percent"],
-                    "threshold_percent": CONCENTRATION_THRESHOLD,
-                    "message": f"{stock.ticker} is {h['weight_percent']:.1f}% of portfolio (threshold: {CONCENTRATION_THRESHOLD}%)",
-                })
-
-    top_5_weight = sum(h["weight_percent"] for h in sorted_holdings[:5])
-
-    unique_sectors = len(set(h["stock"].sector for h in holdings if h["stock"] and h["stock"].sector))
-    total_stocks = len(holdings)
-    diversification_score = min(100, (unique_sectors * 10) + (total_stocks * 5))
-
-    start_date = date.today() - timedelta(days=days)
-    stmt = (
-        select(DailyPerformance)
-        .where(
-            DailyPerformance.user_id == current_user.id,
-            DailyPerformance.record_date >= start_date,
-        )
-        .order_by(DailyPerformance.record_date)
-    )
-    result = await db.execute(stmt)
-    performances = list(result.scalars().all())
-
-    max_drawdown = Decimal("0")
-    max_drawdown_start = None
-    max_drawdown_end = None
-    peak_value = Decimal("0")
-    peak_date = None
-    current_drawdown_start = None
-
-    for p in performances:
-        value = Decimal(str(p.total_value_krw))
-        if value >= peak_value:
-            peak_value = value
-            peak_date = p.record_date
-            current_drawdown_start = p.record_date
-        else:
-            if peak_value > 0:
-                drawdown = (peak_value - value) / peak_value * 100
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-                    max_drawdown_start = current_drawdown_start
-                    max_drawdown_end = p.record_date
-
     return {
-        "max_drawdown_percent": float(max_drawdown),
-        "max_drawdown_start": max_drawdown_start,
-        "max_drawdown_end": max_drawdown_end,
-        "concentration_warnings": warnings,
-        "top_5_weight_percent": top_5_weight,
-        "diversification_score": diversification_score,
+        **await get_max_drawdown(db, current_user.id, days),
+        **build_concentration(holdings),
     }
 
 
@@ -10,6 +10,7 @@ from app.tasks.batch_tasks import (
     _update_kr_prices,
     _update_us_prices,
     _create_daily_snapshot,
+    _backfill_exchange_rates,
 )
 
 router = APIRouter()
@@ -35,10 +36,11 @@ def parse_date(date_str: str | None) -> date | None:
 async def trigger_update_kr_prices(
     _: Annotated[User, Depends(get_current_user)],
     target_date: str | None = Query(None, description="대상 날짜 (YYYY-MM-DD)"),
+    concurrency: int | None = Query(None, ge=1, le=50, description="동시 시세 조회 수"),
 ) -> dict:
     try:
         parsed_date = parse_date(target_date)
-        await _update_kr_prices(parsed_date)
+        await _update_kr_prices(parsed_date, concurrency)
         target = parsed_date or date.today()
         return {
             "status": "success",
@@ -94,6 +96,26 @@ async def trigger_create_snapshot(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/backfill-exchange-rates", response_model=BatchResponse)
+async def trigger_backfill_exchange_rates(
+    _: Annotated[User, Depends(get_current_user)],
+    start_date: str | None = Query(None, description="시작 날짜 (YYYY-MM-DD, 생략 시 마지막 저장일부터)"),
+) -> dict:
+    try:
+        parsed_date = parse_date(start_date)
+        await _backfill_exchange_rates(parsed_date)
+        return {
+            "status": "success",
+            "message": "USD/KRW 환율 이력이 업데이트되었습니다.",
+            "task": "backfill_exchange_rates",
+            "target_date": str(parsed_date) if parsed_date else None,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/refresh-all", response_model=BatchResponse)
 async def trigger_refresh_all(
     _: Annotated[User, Depends(get_current_user)],
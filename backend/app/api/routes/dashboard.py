@@ -1,13 +1,18 @@
 from typing import Annotated
 from datetime import date, timedelta
+import asyncio
+import json
 from decimal import Decimal
 from collections import defaultdict
 
-from fastapi import APIRouter, Depends, Query
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import async_session_maker, get_db
 from app.models.daily_performance import DailyPerformance
 from app.models.stock import MarketType
 from app.models.user import User
@@ -17,9 +22,22 @@ from app.schemas.dashboard import (
     MarketBreakdown,
     DailyPerformancePoint,
     AssetTrendResponse,
+    DashboardOverview,
 )
-from app.api.routes.auth import get_current_user
+from app.api.routes.auth import get_current_user, oauth2_scheme
 from app.services.holding_service import holding_service
+from app.services.live_valuation import LiveValuation, price_broadcaster
+from app.services.portfolio_overview import (
+    build_concentration,
+    build_market_breakdown,
+    build_sector_allocation,
+    build_summary,
+    get_max_drawdown,
+    get_previous_day_value,
+    OVERVIEW_FIELDS,
+)
+from app.services.fx_service import get_fx_series
+from app.services.price_series import PriceSeries
 from app.external.yfinance_client import yfinance_client
 from app.external.kis_client import kis_client
 from sqlalchemy.orm import selectinload
@@ -36,51 +54,48 @@ async def get_portfolio_summary(
     holdings = await holding_service.get_holdings_with_metrics(
         db, current_user.id, exchange_rate
     )
+    previous_value = await get_previous_day_value(db, current_user.id)
+    return build_summary(holdings, exchange_rate, previous_value)
 
-    total_value_krw = Decimal("0")
-    total_invested_krw = Decimal("0")
-    total_dividends = Decimal("0")
 
-    for h in holdings:
-        total_value_krw += Decimal(str(h["current_value_krw"]))
-        total_invested_krw += Decimal(str(h["total_invested"]))
-        total_dividends += Decimal(str(h["total_dividends"]))
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    total_unrealized_gain = total_value_krw - total_invested_krw
-    total_unrealized_gain_pct = (
-        float(total_unrealized_gain / total_invested_krw * 100)
-        if total_invested_krw > 0 else 0.0
-    )
 
-    yesterday = date.today() - timedelta(days=1)
-    stmt = (
-        select(DailyPerformance)
-        .where(
-            DailyPerformance.user_id == current_user.id,
-            DailyPerformance.record_date == yesterday,
-        )
-    )
-    result = await db.execute(stmt)
-    yesterday_perf = result.scalar_one_or_none()
-
-    daily_pnl = float(total_value_krw) - (float(yesterday_perf.total_value_krw) if yesterday_perf else float(total_invested_krw))
-    daily_pnl_pct = (
-        (daily_pnl / float(yesterday_perf.total_value_krw) * 100)
-        if yesterday_perf and yesterday_perf.total_value_krw > 0
-        else 0.0
+@router.get("/live")
+async def stream_portfolio_value(
+    request: Request,
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> StreamingResponse:
+    """
+    Server-Sent Events. 접속 시 snapshot을 한 번 보내고, 보유 종목 시세나 환율이 바뀔 때만 delta를 보낸다.
+    """
+    # get_db 의존성은 스트림이 끝날 때까지 커넥션을 잡고 있으므로 쓰지 않는다.
+    # 인증과 시작 상태 조회만 짧은 세션에서 하고, 스트림을 돌려주기 전에 세션을 닫는다
+    exchange_rate = await yfinance_client.get_exchange_rate()
+    async with async_session_maker() as db:
+        current_user = await get_current_user(token, db)
+        valuation = await LiveValuation.load(db, current_user.id, exchange_rate)
+
+    async def events():
+        async with price_broadcaster.subscribe() as queue:
+            yield _sse("snapshot", valuation.snapshot())
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.live_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                delta = valuation.apply(event)
+                if delta is not None:
+                    yield _sse("delta", delta)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return {
-        "total_value_krw": float(total_value_krw),
-        "total_invested_krw": float(total_invested_krw),
-        "total_unrealized_gain": float(total_unrealized_gain),
-        "total_unrealized_gain_percent": total_unrealized_gain_pct,
-        "daily_pnl": daily_pnl,
-        "daily_pnl_percent": daily_pnl_pct,
-        "total_dividends": float(total_dividends),
-        "exchange_rate": exchange_rate,
-    }
-
 
 @router.get("/market-breakdown", response_model=list[MarketBreakdown])
 async def get_market_breakdown(
@@ -91,55 +106,44 @@ async def get_market_breakdown(
     holdings = await holding_service.get_holdings_with_metrics(
         db, current_user.id, exchange_rate
     )
+    return build_market_breakdown(holdings)
 
-    kr_value = Decimal("0")
-    kr_invested = Decimal("0")
-    us_value_usd = Decimal("0")
-    us_value_krw = Decimal("0")
-    us_invested = Decimal("0")
-    total_value_krw = Decimal("0")
-
-    for h in holdings:
-        stock = h["stock"]
-        if not stock:
-            continue
-        
-        value_krw = Decimal(str(h["current_value_krw"]))
-        total_value_krw += value_krw
-        
-        if stock.market_type == MarketType.KR:
-            kr_value += value_krw
-            kr_invested += Decimal(str(h["total_invested"]))
-        else:
-            us_value_krw += value_krw
-            us_value_usd += Decimal(str(h["current_value"]))
-            us_invested += Decimal(str(h["total_invested"]))
-
-    result = []
-    
-    if kr_value > 0:
-        kr_gain = kr_value - kr_invested
-        result.append({
-            "market_type": MarketType.KR,
-            "value_original": float(kr_value),
-            "value_krw": float(kr_value),
-            "weight_percent": float(kr_value / total_value_krw * 100) if total_value_krw > 0 else 0,
-            "unrealized_gain": float(kr_gain),
-            "unrealized_gain_percent": float(kr_gain / kr_invested * 100) if kr_invested > 0 else 0,
-        })
 
-    if us_value_krw > 0:
-        us_gain = us_value_krw - us_invested
-        result.append({
-            "market_type": MarketType.US,
-            "value_original": float(us_value_usd),
-            "value_krw": float(us_value_krw),
-            "weight_percent": float(us_value_krw / total_value_krw * 100) if total_value_krw > 0 else 0,
-            "unrealized_gain": float(us_gain),
-            "unrealized_gain_percent": float(us_gain / us_invested * 100) if us_invested > 0 else 0,
-        })
+@router.get("/overview", response_model=DashboardOverview, response_model_exclude_unset=True)
+async def get_dashboard_overview(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    fields: Annotated[
+        str | None,
+        Query(description=f"쉼표로 구분한 섹션 목록 ({', '.join(OVERVIEW_FIELDS)}), 생략 시 전체"),
+    ] = None,
+    days: Annotated[int, Query(ge=30, le=365)] = 90,
+) -> dict:
+    """summary/market-breakdown/analytics sectors/risk를 보유 종목 한 번 조회로 계산"""
+    requested = set(OVERVIEW_FIELDS) if not fields else {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(OVERVIEW_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    exchange_rate = await yfinance_client.get_exchange_rate()
+    holdings = await holding_service.get_holdings_with_metrics(
+        db, current_user.id, exchange_rate
+    )
 
-    return result
+    overview: dict = {}
+    if "summary" in requested:
+        previous_value = await get_previous_day_value(db, current_user.id)
+        overview["summary"] = build_summary(holdings, exchange_rate, previous_value)
+    if "market_breakdown" in requested:
+        overview["market_breakdown"] = build_market_breakdown(holdings)
+    if "sectors" in requested:
+        overview["sectors"] = build_sector_allocation(holdings)
+    if "risk" in requested:
+        overview["risk"] = {
+            **await get_max_drawdown(db, current_user.id, days),
+            **build_concentration(holdings),
+        }
+    return overview
 
 
 @router.get("/trend", response_model=AssetTrendResponse)
@@ -151,7 +155,6 @@ async def get_asset_trend(
     stock_ids: Annotated[list[int] | None, Query()] = None,
 ) -> dict:
     from app.models.holding import Holding
-    from app.models.market_data import MarketDataHistory
     
     if not end_date:
         end_date = date.today()
@@ -204,33 +207,25 @@ async def get_asset_trend(
         holdings = {h.stock_id: h for h in holdings_result.scalars().all()}
         
         if holdings:
-            exchange_rate = await yfinance_client.get_exchange_rate()
+            prices = await PriceSeries.load(db, holdings.keys(), start_date, end_date)
+            record_dates = prices.record_dates(start_date, end_date)
+            # 날짜별 당시 환율 (저장된 환율 이력 as-of 조회, 네트워크 호출 없음)
+            fx_rates = (await get_fx_series(db)).rates_for(record_dates)
             
-            market_data_stmt = (
-                select(MarketDataHistory)
-                .where(
-                    MarketDataHistory.stock_id.in_(stock_ids),
-                    MarketDataHistory.record_date >= start_date,
-                    MarketDataHistory.record_date <= end_date,
-                )
-                .order_by(MarketDataHistory.record_date)
-            )
-            market_result = await db.execute(market_data_stmt)
-            market_data = market_result.scalars().all()
-            
-            date_values: dict[date, Decimal] = {}
-            for md in market_data:
-                h = holdings.get(md.stock_id)
-                if not h or not h.stock:
+            # 날짜 x 종목 종가를 as-of로 채운 뒤 한 번에 평가금액 합산
+            values = np.zeros(len(record_dates))
+            for stock_id, h in holdings.items():
+                if not h.stock:
                     continue
-                
-                value = Decimal(str(h.quantity)) * Decimal(str(md.close_price))
+                closes = np.nan_to_num(prices.forward_fill(stock_id, record_dates))
+                position = float(h.quantity) * closes
                 if h.stock.market_type == MarketType.US:
-                    value = value * Decimal(str(exchange_rate))
-                
-                if md.record_date not in date_values:
-                    date_values[md.record_date] = Decimal("0")
-                date_values[md.record_date] += value
+                    position = position * fx_rates
+                values += position
+            
+            date_values: dict[date, Decimal] = {
+                d: Decimal(str(v)) for d, v in zip(record_dates, values.tolist())
+            }
             
             total_invested = sum(Decimal(str(h.total_invested)) for h in holdings.values())
             prev_value = None
@@ -290,9 +285,6 @@ async def get_daily_pnl_history(
         end_date = date.today()
 
     data_points = []
-    
-    # Pre-fetch exchange rate once
-    exchange_rate = await yfinance_client.get_exchange_rate()
 
     if not stock_ids:
         stmt = (
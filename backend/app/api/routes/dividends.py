@@ -1,50 +1,81 @@
 from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.response_cache import bump_user_version
 from app.api.routes.auth import get_current_user
 from app.models.dividend import Dividend
 from app.models.user import User
 from app.models.stock import Stock
 from app.schemas.dividend import DividendCreate, DividendResponse, DividendUpdate
+from app.services.pagination import InvalidCursor, before_cursor, encode_cursor, get_year_counts, in_year
+from app.services.performance_service import rebuild_daily_performance
 
 router = APIRouter()
 
 
+def _before_cursor(cursor: str):
+    try:
+        return before_cursor(Dividend.dividend_date, Dividend.id, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("", response_model=List[DividendResponse])
 async def get_dividends(
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     stock_id: Optional[int] = None,
-    year: Optional[str] = None,
+    year: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
+    """cursor를 주면 skip 대신 (지급일, ID) 키셋으로 이어서 조회. 다음 커서는 X-Next-Cursor 헤더로 반환"""
     query = (
         select(Dividend)
         .where(Dividend.user_id == current_user.id)
         .options(selectinload(Dividend.stock))
-        .order_by(desc(Dividend.dividend_date))
+        .order_by(desc(Dividend.dividend_date), desc(Dividend.id))
+        .limit(limit)
     )
 
     if stock_id:
         query = query.where(Dividend.stock_id == stock_id)
-        
-    # 날짜 필터링은 DB 종속적일 수 있으므로 Python에서 처리하거나 extract 사용
-    # 여기서는 간단히 모든 데이터를 가져와서 필터링 (데이터 양이 많지 않다고 가정)
-    # 또는 extract('year', Dividend.dividend_date) == year 사용
-    
-    result = await db.execute(query)
-    dividends = result.scalars().all()
-    
     if year:
-        dividends = [d for d in dividends if str(d.dividend_date.year) == year]
-        
-    return dividends[skip : skip + limit]
+        query = query.where(in_year(Dividend.dividend_date, year))
+    if cursor:
+        query = query.where(_before_cursor(cursor))
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(query)
+    dividends = list(result.scalars().all())
+    if len(dividends) == limit:
+        last = dividends[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.dividend_date, last.id)
+    return dividends
+
+
+@router.get("/years", response_model=List[int])
+async def get_dividend_years(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    stock_id: Optional[int] = None,
+):
+    """배당 내역이 있는 연도 (최신순, 캐시)"""
+    filters = [Dividend.user_id == current_user.id]
+    if stock_id:
+        filters.append(Dividend.stock_id == stock_id)
+    year_counts = await get_year_counts(
+        db, current_user.id, f"dividends:{stock_id or 'all'}", Dividend.dividend_date, filters
+    )
+    return sorted(year_counts, reverse=True)
 
 
 @router.post("", response_model=DividendResponse)
@@ -63,7 +94,10 @@ async def create_dividend(
         user_id=current_user.id
     )
     db.add(dividend)
+    await db.flush()
+    await rebuild_daily_performance(db, current_user.id, since=dividend.dividend_date)
     await db.commit()
+    await bump_user_version(current_user.id)
     await db.refresh(dividend)
     
     # 관계 로드
@@ -92,11 +126,17 @@ async def update_dividend(
     if not dividend:
         raise HTTPException(status_code=404, detail="Dividend not found")
 
+    previous_date = dividend.dividend_date
     update_data = dividend_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(dividend, field, value)
 
+    await db.flush()
+    await rebuild_daily_performance(
+        db, current_user.id, since=min(previous_date, dividend.dividend_date)
+    )
     await db.commit()
+    await bump_user_version(current_user.id)
     await db.refresh(dividend)
     return dividend
 
@@ -116,6 +156,10 @@ async def delete_dividend(
     if not dividend:
         raise HTTPException(status_code=404, detail="Dividend not found")
 
+    dividend_date = dividend.dividend_date
     await db.delete(dividend)
+    await db.flush()
+    await rebuild_daily_performance(db, current_user.id, since=dividend_date)
     await db.commit()
+    await bump_user_version(current_user.id)
     return {"status": "success"}
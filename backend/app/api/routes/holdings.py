@@ -8,7 +8,7 @@ from app.models.stock import MarketType
 from app.models.user import User
 from app.schemas.holding import HoldingWithMetrics
 from app.api.routes.auth import get_current_user
-from app.services.holding_service import holding_service
+from app.services.holding_service import HoldingMetrics, holding_service
 
 router = APIRouter()
 
@@ -18,10 +18,10 @@ async def list_holdings(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     market: Annotated[MarketType | None, Query()] = None,
-) -> list[dict]:
+) -> list[HoldingMetrics]:
     holdings = await holding_service.get_holdings_with_metrics(db, current_user.id)
 
     if market:
-        holdings = [h for h in holdings if h["stock"] and h["stock"].market_type == market]
+        holdings = [h for h in holdings if h.stock and h.stock.market_type == market]
 
     return holdings
@@ -10,6 +10,7 @@ from app.models.user import User
 from app.schemas.stock import StockCreate, StockResponse, StockSearchResult
 from app.api.routes.auth import get_current_user
 from app.external.kis_client import kis_client
+from app.external.quote_cache import quote_cache
 from app.external.yfinance_client import yfinance_client
 
 router = APIRouter()
@@ -62,6 +63,13 @@ async def get_exchange_rate(
     return {"usd_krw": rate}
 
 
+@router.get("/quote-cache")
+async def get_quote_cache_stats(
+    _: Annotated[User, Depends(get_current_user)],
+) -> dict:
+    return quote_cache.stats()
+
+
 @router.post("", response_model=StockResponse)
 async def create_stock(
     stock_data: StockCreate,
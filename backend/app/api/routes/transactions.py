@@ -1,13 +1,16 @@
 from typing import Annotated
 from datetime import date
+import io
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, extract, distinct
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 import math
 
 from app.core.database import get_db
+from app.core.response_cache import bump_user_version
+from app.models.lot_ledger import RealizedGain
 from app.models.stock import Stock, MarketType
 from app.models.transaction import Transaction, TransactionType
 from app.models.user import User
@@ -17,57 +20,22 @@ from app.schemas.transaction import (
     TransactionWithStock,
     TransactionUpdate,
     TransactionPageResponse,
+    TransactionImportResult,
 )
 from app.api.routes.auth import get_current_user
 from app.services.holding_service import holding_service
+from app.services.pagination import InvalidCursor, before_cursor, encode_cursor, get_year_counts, in_year
+from app.services.performance_service import rebuild_daily_performance
+from app.services.transaction_import import TransactionImportError, import_transactions
 
 router = APIRouter()
 
 
-def calculate_realized_gains_for_transactions(
-    transactions: list[Transaction],
-) -> dict[int, dict[str, float]]:
-    sorted_txns = sorted(transactions, key=lambda t: (t.transaction_date, t.id))
-    buy_queue: list[dict[str, float]] = []
-    realized_gains: dict[int, dict[str, float]] = {}
-    
-    for txn in sorted_txns:
-        if txn.transaction_type == TransactionType.BUY:
-            buy_queue.append({
-                'quantity': float(txn.quantity),
-                'price': float(txn.price),
-                'rate': float(txn.exchange_rate),
-            })
-        elif txn.transaction_type == TransactionType.SELL:
-            sell_qty = float(txn.quantity)
-            sell_price = float(txn.price)
-            sell_rate = float(txn.exchange_rate)
-            total_cost_krw = 0.0
-            remaining = sell_qty
-            
-            while remaining > 0 and buy_queue:
-                buy = buy_queue[0]
-                take = min(remaining, buy['quantity'])
-                total_cost_krw += take * buy['price'] * buy['rate']
-                
-                buy['quantity'] -= take
-                remaining -= take
-                
-                if buy['quantity'] <= 0:
-                    buy_queue.pop(0)
-            
-            sell_proceeds_krw = sell_qty * sell_price * sell_rate
-            realized_gain = sell_proceeds_krw - total_cost_krw
-            realized_gain_percent = (
-                (realized_gain / total_cost_krw * 100) if total_cost_krw > 0 else 0.0
-            )
-            
-            realized_gains[txn.id] = {
-                'realized_gain': realized_gain,
-                'realized_gain_percent': realized_gain_percent,
-            }
-    
-    return realized_gains
+def _before_cursor(cursor: str):
+    try:
+        return before_cursor(Transaction.transaction_date, Transaction.id, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("", response_model=TransactionResponse)
@@ -96,22 +64,57 @@ async def create_transaction(
     db.add(transaction)
     await db.flush()
 
-    await holding_service.recalculate_holding(db, current_user.id, txn_data.stock_id)
+    await holding_service.apply_transaction(db, transaction)
+    await rebuild_daily_performance(db, current_user.id, since=transaction.transaction_date)
+    await db.commit()
+    await bump_user_version(current_user.id)
 
     return transaction
 
 
+@router.post("/import", response_model=TransactionImportResult)
+async def import_transactions_csv(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    file: Annotated[UploadFile, File()],
+    skip_invalid: Annotated[bool, Query()] = False,
+    encoding: Annotated[str, Query()] = "utf-8-sig",
+) -> dict:
+    """CSV 거래내역 일괄 등록 (ticker, transaction_type, quantity, price, transaction_date[, exchange_rate, fees, notes])"""
+    try:
+        # 실제 읽기는 import_transactions가 배치 단위로 스레드에서 수행
+        lines = io.TextIOWrapper(file.file, encoding=encoding, newline="")
+        result = await import_transactions(db, current_user.id, lines, skip_invalid=skip_invalid)
+    except TransactionImportError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": str(e), "rows_read": e.rows_read, "errors": e.errors},
+        )
+    except (UnicodeDecodeError, LookupError) as e:
+        raise HTTPException(status_code=400, detail=f"Cannot decode file: {e}")
+
+    if result["imported"]:
+        await db.commit()
+        await bump_user_version(current_user.id)
+    return result
+
+
 @router.get("", response_model=list[TransactionWithStock])
 async def list_transactions(
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     stock_id: Annotated[int | None, Query()] = None,
     transaction_type: Annotated[TransactionType | None, Query()] = None,
     start_date: Annotated[date | None, Query()] = None,
     end_date: Annotated[date | None, Query()] = None,
+    # 기본값 1000 유지: 거래 목록 화면(TransactionList)은 페이지 없이 한 번에 받아 그린다.
+    # 더 많은 거래는 X-Next-Cursor 헤더의 커서로 이어서 조회
     limit: Annotated[int, Query(ge=1, le=1000)] = 1000,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> list[Transaction]:
+    """cursor를 주면 offset 대신 (거래일, ID) 키셋으로 이어서 조회. 다음 커서는 X-Next-Cursor 헤더로 반환"""
     stmt = (
         select(Transaction)
         .options(selectinload(Transaction.stock))
@@ -126,12 +129,19 @@ async def list_transactions(
         stmt = stmt.where(Transaction.transaction_date >= start_date)
     if end_date:
         stmt = stmt.where(Transaction.transaction_date <= end_date)
+    if cursor:
+        stmt = stmt.where(_before_cursor(cursor))
+    else:
+        stmt = stmt.offset(offset)
 
-    stmt = stmt.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
-    stmt = stmt.offset(offset).limit(limit)
+    stmt = stmt.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit)
 
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    transactions = list(result.scalars().all())
+    if len(transactions) == limit:
+        last = transactions[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.transaction_date, last.id)
+    return transactions
 
 
 @router.get("/by-stock/{stock_id}", response_model=TransactionPageResponse)
@@ -142,59 +152,49 @@ async def get_transactions_by_stock(
     year: Annotated[int | None, Query()] = None,
     page: Annotated[int, Query(ge=1)] = 1,
     size: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> TransactionPageResponse:
-    all_txns_stmt = (
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.stock_id == stock_id)
-        .order_by(Transaction.transaction_date, Transaction.id)
-    )
-    all_txns_result = await db.execute(all_txns_stmt)
-    all_transactions = list(all_txns_result.scalars().all())
-    
-    realized_gains = calculate_realized_gains_for_transactions(all_transactions)
-    
-    base_stmt = (
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.stock_id == stock_id)
+    filters = [Transaction.user_id == current_user.id, Transaction.stock_id == stock_id]
+
+    # 연도 목록과 전체 건수는 캐시된 연도별 건수에서 계산 (페이지마다 COUNT/DISTINCT 쿼리 없음)
+    year_counts = await get_year_counts(
+        db, current_user.id, f"transactions:{stock_id}", Transaction.transaction_date, filters
     )
-    
-    if year:
-        base_stmt = base_stmt.where(extract('year', Transaction.transaction_date) == year)
-    
-    count_stmt = select(func.count()).select_from(base_stmt.subquery())
-    count_result = await db.execute(count_stmt)
-    total_elements = count_result.scalar() or 0
+    total_elements = year_counts.get(year, 0) if year else sum(year_counts.values())
     total_pages = math.ceil(total_elements / size) if total_elements > 0 else 1
-    
-    offset = (page - 1) * size
+    available_years = sorted(year_counts, reverse=True)
+
+    if year:
+        filters.append(in_year(Transaction.transaction_date, year))
+
+    # 실현 손익은 거래 저장 시 갱신되는 FIFO 원장(realized_gains)에서 같은 쿼리로 읽음
     data_stmt = (
-        base_stmt
-        .options(selectinload(Transaction.stock))
+        select(Transaction, RealizedGain)
+        .where(*filters)
+        .outerjoin(RealizedGain, RealizedGain.sell_transaction_id == Transaction.id)
+        .options(joinedload(Transaction.stock))
         .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
-        .offset(offset)
         .limit(size)
     )
-    result = await db.execute(data_stmt)
-    transactions = list(result.scalars().all())
-    
-    years_stmt = (
-        select(distinct(extract('year', Transaction.transaction_date)))
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.stock_id == stock_id)
-        .order_by(extract('year', Transaction.transaction_date).desc())
-    )
-    years_result = await db.execute(years_stmt)
-    available_years = [int(y) for y in years_result.scalars().all()]
+    if cursor:
+        data_stmt = data_stmt.where(_before_cursor(cursor))
+    else:
+        data_stmt = data_stmt.offset((page - 1) * size)
+
+    rows = (await db.execute(data_stmt)).all()
     
     content = []
-    for txn in transactions:
+    for txn, gain in rows:
         txn_data = TransactionWithStock.model_validate(txn)
-        if txn.id in realized_gains:
-            txn_data.realized_gain = realized_gains[txn.id]['realized_gain']
-            txn_data.realized_gain_percent = realized_gains[txn.id]['realized_gain_percent']
+        if gain is not None:
+            txn_data.realized_gain = float(gain.realized_gain)
+            txn_data.realized_gain_percent = gain.realized_gain_percent
         content.append(txn_data)
+
+    next_cursor = None
+    if len(rows) == size:
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.transaction_date, last.id)
     
     return TransactionPageResponse(
         content=content,
@@ -202,6 +202,7 @@ async def get_transactions_by_stock(
         total_pages=total_pages,
         current_page=page,
         available_years=available_years,
+        next_cursor=next_cursor,
     )
 
 
@@ -238,13 +239,19 @@ async def update_transaction(
     if not txn:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
+    previous_date = txn.transaction_date
     update_data = txn_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(txn, key, value)
 
     await db.flush()
     await holding_service.recalculate_holding(db, current_user.id, txn.stock_id)
-    
+    await rebuild_daily_performance(
+        db, current_user.id, since=min(previous_date, txn.transaction_date)
+    )
+    await db.commit()
+    await bump_user_version(current_user.id)
+
     return txn
 
 
@@ -263,9 +270,13 @@ async def delete_transaction(
         raise HTTPException(status_code=404, detail="Transaction not found")
 
     stock_id = txn.stock_id
+    transaction_date = txn.transaction_date
     await db.delete(txn)
     await db.flush()
 
     await holding_service.recalculate_holding(db, current_user.id, stock_id)
+    await rebuild_daily_performance(db, current_user.id, since=transaction_date)
+    await db.commit()
+    await bump_user_version(current_user.id)
 
     return {"message": "Transaction deleted"}
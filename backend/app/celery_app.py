@@ -1,5 +1,10 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
 
@@ -31,8 +36,52 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.batch_tasks.update_us_stock_prices",
         "schedule": crontab(hour=6, minute=5, day_of_week="tue-sat"),
     },
+    "backfill-exchange-rates-daily": {
+        "task": "app.tasks.batch_tasks.backfill_exchange_rates",
+        "schedule": crontab(hour=6, minute=0),
+    },
+    "refresh-benchmark-indices-daily": {
+        "task": "app.tasks.batch_tasks.refresh_benchmark_indices",
+        "schedule": crontab(hour=6, minute=10, day_of_week="tue-sat"),
+    },
     "refresh-kis-token": {
         "task": "app.tasks.batch_tasks.refresh_kis_token",
         "schedule": crontab(hour=0, minute=0),
     },
 }
+
+
+# 워커 프로세스마다 이벤트 루프 하나를 유지해 KIS HTTP 커넥션 풀과 DB 풀을 태스크 간에 재사용한다
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+@worker_process_init.connect
+def _open_worker_resources(**kwargs) -> None:
+    global _worker_loop
+    from app.external.kis_client import kis_client
+
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_loop.run_until_complete(kis_client.open())
+
+
+@worker_process_shutdown.connect
+def _close_worker_resources(**kwargs) -> None:
+    global _worker_loop
+    from app.core.database import close_db
+    from app.core.redis import close_redis
+    from app.external.kis_client import kis_client
+
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+    _worker_loop.run_until_complete(kis_client.close())
+    _worker_loop.run_until_complete(close_redis())
+    _worker_loop.run_until_complete(close_db())
+    _worker_loop.close()
+    _worker_loop = None
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        return _worker_loop.run_until_complete(coro)
+    return asyncio.run(coro)
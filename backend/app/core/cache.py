@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.loop_local import LoopLocal
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "stockflow:cache:"
+
+
+class TTLCache:
+    """
+    프로세스 메모리 + Redis 2단 TTL 캐시.
+
+    - ttl 이내: 캐시 값 반환
+    - ttl ~ ttl + stale_ttl: 오래된 값을 바로 반환하고 백그라운드에서 한 번만 갱신 (stale-while-revalidate)
+    - 그 이후/없음: 동시에 들어온 요청은 하나의 로드 결과를 함께 기다린다 (single-flight)
+    Redis에는 값과 조회 시각을 함께 저장해 API/Celery 워커가 같은 값을 공유한다.
+    Redis 장애 시에는 메모리 캐시만으로 동작한다.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, use_redis: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.use_redis = use_redis
+        self._entries: dict[str, tuple[Any, float]] = {}
+        # 진행 중인 로드는 그 이벤트 루프에서만 기다릴 수 있으므로 루프별로 둔다
+        self._inflight: LoopLocal[dict[str, asyncio.Future]] = LoopLocal(dict)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{self.name}:{key}"
+
+    def peek(self, key: str) -> Any | None:
+        """만료 여부와 관계없이 마지막으로 알려진 값"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh(key, loader).add_done_callback(
+                    lambda t: self._log_background_failure(key, t)
+                )
+                return value
+
+        # 대기 중인 호출자 하나가 취소돼도 공유 로드는 계속되도록 shield
+        return await asyncio.shield(self._refresh(key, loader))
+
+    def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        inflights = self._inflight.get()
+        inflight = inflights.get(key)
+        if inflight is not None and not inflight.done():
+            return inflight
+
+        task = asyncio.ensure_future(self._load(key, loader))
+        inflights[key] = task
+        task.add_done_callback(lambda t: self._done(inflights, key, t))
+        return task
+
+    @staticmethod
+    def _done(inflights: dict[str, asyncio.Future], key: str, task: asyncio.Future) -> None:
+        if inflights.get(key) is task:
+            del inflights[key]
+
+    def _log_background_failure(self, key: str, task: asyncio.Future) -> None:
+        # 백그라운드 갱신 실패는 기다리는 호출자가 없으므로 여기서 로그만 남긴다
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("%s cache refresh failed for %s: %s", self.name, key, task.exception())
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        shared = await self._read_redis(key)
+        if shared is not None and time.time() - shared[1] < self.ttl:
+            self._entries[key] = shared
+            return shared[0]
+
+        value = await loader()
+        fetched_at = time.time()
+        self._entries[key] = (value, fetched_at)
+        await self._write_redis(key, value, fetched_at)
+        return value
+
+    async def _read_redis(self, key: str) -> tuple[Any, float] | None:
+        if not self.use_redis:
+            return None
+        try:
+            raw = await get_redis().get(self._redis_key(key))
+        except Exception as e:
+            logger.debug("redis read failed (%s): %s", self.name, e)
+            return None
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return payload["value"], payload["fetched_at"]
+
+    async def _write_redis(self, key: str, value: Any, fetched_at: float) -> None:
+        if not self.use_redis:
+            return
+        payload = json.dumps({"value": value, "fetched_at": fetched_at})
+        try:
+            await get_redis().set(
+                self._redis_key(key), payload, ex=max(1, int(self.ttl + self.stale_ttl))
+            )
+        except Exception as e:
+            logger.debug("redis write failed (%s): %s", self.name, e)
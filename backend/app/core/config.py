@@ -1,4 +1,5 @@
 from functools import lru_cache
+from pathlib import Path
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +21,7 @@ class Settings(BaseSettings):
     database_echo: bool = False
     
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout: float = 1.0
     
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
     
@@ -31,6 +33,37 @@ class Settings(BaseSettings):
     kis_app_secret: str = ""
     kis_base_url: str = "https://openapi.koreainvestment.com:9443"
     kis_websocket_url: str = "ws://ops.koreainvestment.com:21000"
+    kis_rate_limit_per_second: float = 18.0
+    kis_max_concurrency: int = 10
+    kis_http_pool_size: int = 20
+    kis_http2: bool = True
+    # KIS 실시간 등록 한도 (세션당)
+    kis_websocket_max_subscriptions: int = 41
+    price_stream_flush_seconds: float = 2.0
+    price_stream_refresh_seconds: float = 60.0
+    
+    # 시세 캐시 TTL: 정규장 중에는 짧게, 장 마감 후에는 길게
+    quote_cache_max_entries: int = 10000
+    quote_cache_ttl_open_seconds: float = 5.0
+    quote_cache_ttl_closed_seconds: float = 600.0
+    
+    exchange_rate_cache_ttl_seconds: int = 300
+    exchange_rate_stale_ttl_seconds: int = 3600
+    # 일별 환율 이력(리플레이/CSV 환율 채움/실시간 평가용) 프로세스 캐시. 지나면 저장된 이력이 바뀌었는지 확인
+    fx_series_cache_ttl_seconds: int = 60
+    
+    # /dashboard/live SSE 유휴 시 keep-alive 주기
+    live_heartbeat_seconds: float = 15.0
+    
+    # /dashboard, /analytics 사용자별 응답 캐시 (실시간 시세 변동은 TTL 내에서만 늦게 반영)
+    response_cache_enabled: bool = True
+    response_cache_ttl_seconds: int = 60
+
+    # 거래/배당 목록의 연도별 건수(필터 목록, 전체 건수) 캐시. 쓰기 시 사용자 버전으로 무효화
+    year_facet_cache_ttl_seconds: int = 86400
+    
+    # 런타임 캐시 파일(KRX 종목 마스터 스냅샷 등) 위치. 실행 위치(CWD)와 무관하게 backend/data가 기본값
+    cache_dir: Path = Path(__file__).resolve().parents[2] / "data"
     
     rate_limit_requests: int = 100
     rate_limit_window_seconds: int = 60
@@ -1,6 +1,9 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
+from typing import Any
 
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -10,6 +13,9 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+# asyncpg는 한 문장에 최대 32767개의 바인드 파라미터만 허용
+MAX_BIND_PARAMS = 32767
+
 
 class Base(DeclarativeBase):
     pass
@@ -64,3 +70,58 @@ async def init_db() -> None:
 
 async def close_db() -> None:
     await engine.dispose()
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: type[Base],
+    rows: Sequence[dict[str, Any]],
+    constraint: str,
+    update_columns: Sequence[str] | None = None,
+) -> int:
+    """rows를 multi-row INSERT ... ON CONFLICT DO UPDATE로 일괄 저장"""
+    if not rows:
+        return 0
+
+    table = model.__table__
+    unique = next(
+        c for c in table.constraints
+        if isinstance(c, UniqueConstraint) and c.name == constraint
+    )
+    key_columns = set(unique.columns.keys())
+    columns = list(rows[0].keys())
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in key_columns]
+
+    chunk_size = max(1, MAX_BIND_PARAMS // (len(columns) + 1))
+    for start in range(0, len(rows), chunk_size):
+        stmt = pg_insert(table).values(list(rows[start:start + chunk_size]))
+        stmt = stmt.on_conflict_do_update(
+            constraint=constraint,
+            set_={c: stmt.excluded[c] for c in update_columns},
+        )
+        await db.execute(stmt)
+
+    return len(rows)
+
+
+async def copy_records(
+    db: AsyncSession,
+    model: type[Base],
+    columns: Sequence[str],
+    records: Sequence[tuple],
+    chunk_size: int = 10000,
+) -> int:
+    """대량 적재용 asyncpg COPY (세션과 같은 트랜잭션, ORM 객체/바인드 파라미터 없음)"""
+    if not records:
+        return 0
+
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    for start in range(0, len(records), chunk_size):
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__,
+            records=records[start:start + chunk_size],
+            columns=list(columns),
+        )
+    return len(records)
@@ -0,0 +1,24 @@
+import asyncio
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """
+    이벤트 루프마다 새로 만드는 객체. asyncio.Lock 등은 처음 사용한 루프에 묶여
+    스크립트/run_async의 asyncio.run 반복 호출 시 다른 루프에서 쓰면 RuntimeError가 난다.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: T | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._value = self._factory()
+            self._loop = loop
+        return self._value
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+PRICE_CHANNEL = "stockflow:prices"
+
+
+async def publish(channel: str, event: dict[str, Any]) -> None:
+    try:
+        await get_redis().publish(channel, json.dumps(event))
+    except Exception as e:
+        logger.debug(f"publish to {channel} failed: {e}")
+
+
+async def publish_prices(market: str, prices: dict[str, float]) -> None:
+    if prices:
+        await publish(PRICE_CHANNEL, {"type": "prices", "market": market, "prices": prices})
+
+
+async def publish_fx(pair: str, rate: float) -> None:
+    await publish(PRICE_CHANNEL, {"type": "fx", "pair": pair, "rate": rate})
+
+
+class Broadcaster:
+    """
+    Redis 채널을 프로세스당 한 번만 구독해 접속한 클라이언트별 큐로 나눠준다.
+    구독자가 있는 동안에만 리스너(와 pollers)를 돌린다.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        queue_size: int = 256,
+        pollers: list[Callable[[], Awaitable[None]]] | None = None,
+    ):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.pollers = pollers or []
+        self._subscribers: set[asyncio.Queue] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._listen())]
+            self._tasks += [asyncio.create_task(poller()) for poller in self.pollers]
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers:
+                for task in self._tasks:
+                    task.cancel()
+                self._tasks = []
+
+    def dispatch(self, event: dict[str, Any]) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # 느린 클라이언트는 가장 오래된 이벤트를 버린다 (다음 이벤트가 최신 시세를 담고 있음)
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            # 구독 연결은 유휴 시간이 길어 공용 클라이언트의 socket_timeout을 쓰지 않는다
+            client = Redis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=settings.redis_socket_timeout,
+                health_check_interval=30,
+            )
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        self.dispatch(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Subscription to {self.channel} failed: {e}")
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
@@ -0,0 +1,30 @@
+import asyncio
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# redis.asyncio 커넥션은 생성된 이벤트 루프에 묶이므로 루프별로 클라이언트를 둔다
+_clients: dict[asyncio.AbstractEventLoop, Redis] = {}
+
+
+def get_redis() -> Redis:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        for stale_loop in [l for l in _clients if l.is_closed()]:
+            del _clients[stale_loop]
+        client = Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_redis() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.auth_service import decode_token
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = "stockflow:version:data"
+USER_VERSION_KEY = "stockflow:version:user:{user_id}"
+RESPONSE_KEY = "stockflow:response:{user_id}:{digest}"
+
+
+async def bump_user_version(user_id: int) -> None:
+    """거래/배당 등 한 사용자의 데이터가 바뀌면 그 사용자의 캐시된 응답을 모두 무효화"""
+    try:
+        await get_redis().incr(USER_VERSION_KEY.format(user_id=user_id))
+    except Exception as e:
+        logger.warning(f"Failed to bump response cache version for user {user_id}: {e}")
+
+
+async def bump_data_version() -> None:
+    """시세/스냅샷 배치처럼 모든 사용자에게 영향을 주는 쓰기 후 호출"""
+    try:
+        await get_redis().incr(DATA_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to bump response cache data version: {e}")
+
+
+async def get_user_version(user_id: int) -> str:
+    data_version, user_version = await get_redis().mget(
+        [DATA_VERSION_KEY, USER_VERSION_KEY.format(user_id=user_id)]
+    )
+    return f"{data_version or 0}.{user_version or 0}"
+
+
+def _user_id(headers: Headers) -> int | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token)
+    sub = payload.get("sub") if payload else None
+    return int(sub) if sub is not None else None
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    사용자별 GET 응답 캐시 (Redis). 키는 사용자 + 경로 + 쿼리 문자열이고,
+    저장 시점의 (전체 데이터 버전, 사용자 버전)이 현재 값과 같을 때만 재사용한다.
+    본문 해시를 ETag로 내려주고 If-None-Match가 일치하면 재계산 없이 304를 반환한다.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: tuple[str, ...], exclude: tuple[str, ...] = ()):
+        self.app = app
+        self.prefixes = prefixes
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not settings.response_cache_enabled
+            or not path.startswith(self.prefixes)
+            or path in self.exclude
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        user_id = _user_id(headers)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        digest = hashlib.sha1(path.encode() + b"?" + scope.get("query_string", b"")).hexdigest()
+        key = RESPONSE_KEY.format(user_id=user_id, digest=digest)
+        redis = get_redis()
+        try:
+            version = await get_user_version(user_id)
+            cached = await redis.get(key)
+        except Exception as e:
+            logger.debug(f"response cache unavailable: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = headers.get("if-none-match")
+        entry = json.loads(cached) if cached else None
+        if entry and entry["version"] == version:
+            if _etag_matches(if_none_match, entry["etag"]):
+                await self._send_not_modified(send, entry["etag"])
+            else:
+                await self._send_cached(send, entry)
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        response_headers = MutableHeaders(raw=list(start["headers"]))
+        if start["status"] != 200 or not response_headers.get("content-type", "").startswith("application/json"):
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        entry = {
+            "version": version,
+            "etag": etag,
+            "content_type": response_headers["content-type"],
+            "body": body.decode(),
+        }
+        try:
+            await redis.set(key, json.dumps(entry), ex=settings.response_cache_ttl_seconds)
+        except Exception as e:
+            logger.debug(f"response cache write failed: {e}")
+
+        if _etag_matches(if_none_match, etag):
+            await self._send_not_modified(send, etag)
+            return
+        response_headers["etag"] = etag
+        response_headers["cache-control"] = "private, no-cache"
+        response_headers["vary"] = "Authorization"
+        response_headers["x-cache"] = "MISS"
+        await send({**start, "headers": response_headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send_not_modified(send: Send, etag: str) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [
+                (b"etag", etag.encode()),
+                (b"cache-control", b"private, no-cache"),
+                (b"vary", b"Authorization"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _send_cached(send: Send, entry: dict) -> None:
+        body = entry["body"].encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", entry["content_type"].encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"etag", entry["etag"].encode()),
+                (b"cache-control", b"private, no-cache"),
+                (b"vary", b"Authorization"),
+                (b"x-cache", b"HIT"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
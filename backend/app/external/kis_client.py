@@ -8,10 +8,19 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.core.loop_local import LoopLocal
+from app.external.quote_cache import MARKET_KR, quote_cache
+from app.external.rate_limiter import TokenBucket
 from app.services.krx_master import search_by_name
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class KISClient:
     TOKEN_FILE = "kis_token_cache.json"
@@ -21,7 +30,51 @@ class KISClient:
         self._access_token: str | None = None
         self._token_expires_at: datetime | None = None
         self._token_issued_at: datetime | None = None
-        self._lock = asyncio.Lock()
+        self._lock: LoopLocal[asyncio.Lock] = LoopLocal(asyncio.Lock)
+        self._rate_limiter = TokenBucket(settings.kis_rate_limit_per_second)
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.kis_http_pool_size,
+            max_keepalive_connections=settings.kis_http_pool_size,
+            keepalive_expiry=30.0,
+        )
+        return httpx.AsyncClient(
+            timeout=30.0,
+            limits=limits,
+            http2=settings.kis_http2 and HTTP2_AVAILABLE,
+        )
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        # 커넥션 풀은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다 (asyncio.run 반복 호출 대비)
+        loop = asyncio.get_running_loop()
+        if (
+            self._http_client is None
+            or self._http_client.is_closed
+            or self._http_client_loop is not loop
+        ):
+            stale = self._http_client
+            self._http_client = self._build_http_client()
+            self._http_client_loop = loop
+            if stale is not None and not stale.is_closed:
+                try:
+                    await stale.aclose()
+                except Exception as e:
+                    # 이전 루프가 이미 닫혔으면 소켓 정리가 실패할 수 있다 (연결은 루프와 함께 정리됨)
+                    logger.debug(f"Failed to close stale KIS http client: {e}")
+        return self._http_client
+
+    async def open(self) -> None:
+        await self._get_http_client()
+
+    async def close(self) -> None:
+        client = self._http_client
+        self._http_client = None
+        self._http_client_loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
 
     def _is_token_valid(self, expires_at: datetime, issued_at: datetime | None) -> bool:
         now = datetime.now()
@@ -86,46 +139,46 @@ class KISClient:
             logger.warning(f"Failed to remove token cache file: {e}")
 
     async def _request_new_token(self) -> str:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{settings.kis_base_url}/oauth2/tokenP",
-                json={
-                    "grant_type": "client_credentials",
-                    "appkey": settings.kis_app_key,
-                    "appsecret": settings.kis_app_secret,
-                },
+        client = await self._get_http_client()
+        response = await client.post(
+            f"{settings.kis_base_url}/oauth2/tokenP",
+            json={
+                "grant_type": "client_credentials",
+                "appkey": settings.kis_app_key,
+                "appsecret": settings.kis_app_secret,
+            },
+        )
+        
+        if response.status_code != 200:
+            error_detail = response.text
+            logger.error(f"Token request failed: {response.status_code} - {error_detail}")
+            raise httpx.HTTPStatusError(
+                f"Token request failed: {response.status_code}",
+                request=response.request,
+                response=response
             )
-            
-            if response.status_code != 200:
-                error_detail = response.text
-                logger.error(f"Token request failed: {response.status_code} - {error_detail}")
-                raise httpx.HTTPStatusError(
-                    f"Token request failed: {response.status_code}",
-                    request=response.request,
-                    response=response
-                )
-            
-            data = response.json()
-            access_token = data.get("access_token")
-            
-            if not access_token:
-                raise ValueError("No access_token in response")
-            
-            expires_in = int(data.get("expires_in", 86400))
-            now = datetime.now()
-            expires_at = now + timedelta(seconds=expires_in - 300)
-            
-            self._access_token = access_token
-            self._token_expires_at = expires_at
-            self._token_issued_at = now
-            
-            self._save_token_to_disk(access_token, expires_at, now)
-            logger.info(f"New token issued, expires at {expires_at}")
-            
-            return access_token
+        
+        data = response.json()
+        access_token = data.get("access_token")
+        
+        if not access_token:
+            raise ValueError("No access_token in response")
+        
+        expires_in = int(data.get("expires_in", 86400))
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=expires_in - 300)
+        
+        self._access_token = access_token
+        self._token_expires_at = expires_at
+        self._token_issued_at = now
+        
+        self._save_token_to_disk(access_token, expires_at, now)
+        logger.info(f"New token issued, expires at {expires_at}")
+        
+        return access_token
 
     async def _get_access_token(self, force_refresh: bool = False) -> str:
-        async with self._lock:
+        async with self._lock.get():
             if force_refresh:
                 logger.info("Force refreshing token")
                 self._invalidate_token()
@@ -158,22 +211,23 @@ class KISClient:
             "content-type": "application/json; charset=utf-8",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method,
-                f"{settings.kis_base_url}{endpoint}",
-                headers=headers,
-                params=params,
-                json=data,
-            )
-            
-            if response.status_code in (400, 401) and _retry:
-                logger.warning(f"API request failed with {response.status_code}, refreshing token and retrying")
-                self._invalidate_token()
-                return await self._request(method, endpoint, tr_id, params, data, _retry=False)
-            
-            response.raise_for_status()
-            return response.json()
+        await self._rate_limiter.acquire()
+        client = await self._get_http_client()
+        response = await client.request(
+            method,
+            f"{settings.kis_base_url}{endpoint}",
+            headers=headers,
+            params=params,
+            json=data,
+        )
+        
+        if response.status_code in (400, 401) and _retry:
+            logger.warning(f"API request failed with {response.status_code}, refreshing token and retrying")
+            self._invalidate_token()
+            return await self._request(method, endpoint, tr_id, params, data, _retry=False)
+        
+        response.raise_for_status()
+        return response.json()
 
     async def search_stock(self, keyword: str) -> list[dict[str, Any]]:
         is_code = keyword.isdigit() and len(keyword) == 6
@@ -218,9 +272,14 @@ class KISClient:
                 for m in matches
             ]
 
+        # 상위 5개 시세를 동시에 조회 (_request의 토큰 버킷이 초당 호출 수를 제한)
+        top_matches = matches[:5]
+        prices = await asyncio.gather(
+            *(self.get_stock_price(match["code"]) for match in top_matches)
+        )
+
         results = []
-        for match in matches[:5]:
-            price_info = await self.get_stock_price(match["code"])
+        for match, price_info in zip(top_matches, prices):
             results.append({
                 "pdno": match["code"],
                 "prdt_name": match["name"],
@@ -243,6 +302,11 @@ class KISClient:
                 "volume": 1000000,
             }
 
+        return await quote_cache.get_or_fetch(
+            MARKET_KR, ticker, lambda: self._fetch_stock_price(ticker)
+        )
+
+    async def _fetch_stock_price(self, ticker: str) -> dict[str, Any] | None:
         try:
             result = await self._request(
                 "GET",
@@ -264,6 +328,26 @@ class KISClient:
         except Exception:
             return None
 
+    async def get_stock_prices(
+        self, tickers: list[str], concurrency: int | None = None
+    ) -> dict[str, dict[str, Any] | None]:
+        if not settings.kis_app_key:
+            return {ticker: await self.get_stock_price(ticker) for ticker in tickers}
+
+        # 캐시에 있는 종목은 Redis MGET 한 번으로 채우고 나머지만 KIS에 조회
+        cached = await quote_cache.get_many(MARKET_KR, tickers)
+        semaphore = asyncio.Semaphore(concurrency or settings.kis_max_concurrency)
+
+        async def fetch(ticker: str) -> tuple[str, dict[str, Any] | None]:
+            async with semaphore:
+                return ticker, await self._fetch_stock_price(ticker)
+
+        fetched = dict(
+            await asyncio.gather(*(fetch(t) for t in dict.fromkeys(tickers) if t not in cached))
+        )
+        await quote_cache.set_many(MARKET_KR, fetched)
+        return {ticker: cached.get(ticker) or fetched.get(ticker) for ticker in tickers}
+
     async def get_daily_prices(
         self, ticker: str, start_date: str, end_date: str
     ) -> list[dict[str, Any]]:
@@ -0,0 +1,153 @@
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 국내주식 실시간 체결가
+REALTIME_PRICE_TR_ID = "H0STCNT0"
+_PRICE_FIELD_COUNT = 46
+# 체결가 레코드 내 필드 위치
+_TICKER, _PRICE, _CHANGE, _CHANGE_PERCENT, _OPEN, _HIGH, _LOW, _VOLUME = 0, 2, 4, 5, 7, 8, 9, 13
+
+
+def parse_price_frame(text: str) -> list[dict[str, Any]]:
+    """
+    "0|H0STCNT0|002|005930^093354^71900^...^000660^..." 형식의 실시간 체결 메시지를 시세 목록으로 변환.
+    한 메시지에 여러 체결이 이어 붙어 올 수 있다. REST 시세(get_stock_price)와 같은 키를 쓴다.
+    """
+    parts = text.split("|", 3)
+    if len(parts) != 4 or parts[0] != "0" or parts[1] != REALTIME_PRICE_TR_ID:
+        return []
+
+    fields = parts[3].split("^")
+    count = int(parts[2])
+    quotes = []
+    for i in range(count):
+        record = fields[i * _PRICE_FIELD_COUNT:(i + 1) * _PRICE_FIELD_COUNT]
+        if len(record) <= _VOLUME:
+            break
+        quotes.append({
+            "ticker": record[_TICKER],
+            "open_price": float(record[_OPEN]),
+            "high_price": float(record[_HIGH]),
+            "low_price": float(record[_LOW]),
+            "current_price": float(record[_PRICE]),
+            "change": float(record[_CHANGE]),
+            "change_percent": float(record[_CHANGE_PERCENT]),
+            "volume": int(record[_VOLUME]),
+        })
+    return quotes
+
+
+class KISWebSocketClient:
+    """
+    KIS 실시간 시세 웹소켓 세션. 종목 등록/해제와 PINGPONG 응답을 처리하고 체결 시세를 흘려보낸다.
+
+    url/approval_key를 넘기면 로컬 스텁 서버에도 그대로 붙일 수 있다.
+    """
+
+    def __init__(self, url: str | None = None, approval_key: str | None = None):
+        self.url = url or settings.kis_websocket_url
+        self._approval_key = approval_key
+        self._session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self.subscribed: set[str] = set()
+
+    async def _get_approval_key(self) -> str:
+        if self._approval_key:
+            return self._approval_key
+        async with self._session.post(
+            f"{settings.kis_base_url}/oauth2/Approval",
+            json={
+                "grant_type": "client_credentials",
+                "appkey": settings.kis_app_key,
+                "secretkey": settings.kis_app_secret,
+            },
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        approval_key = data.get("approval_key")
+        if not approval_key:
+            raise ValueError("No approval_key in response")
+        self._approval_key = approval_key
+        return approval_key
+
+    async def connect(self) -> None:
+        self._session = aiohttp.ClientSession()
+        try:
+            await self._get_approval_key()
+            self._ws = await self._session.ws_connect(self.url, heartbeat=30)
+        except Exception:
+            await self.close()
+            raise
+        self.subscribed.clear()
+
+    async def close(self) -> None:
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._ws = None
+        self._session = None
+
+    async def __aenter__(self) -> "KISWebSocketClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _send_subscription(self, ticker: str, subscribe: bool) -> None:
+        await self._ws.send_str(json.dumps({
+            "header": {
+                "approval_key": self._approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": REALTIME_PRICE_TR_ID, "tr_key": ticker}},
+        }))
+
+    async def subscribe(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            if ticker not in self.subscribed:
+                await self._send_subscription(ticker, True)
+                self.subscribed.add(ticker)
+
+    async def unsubscribe(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            if ticker in self.subscribed:
+                await self._send_subscription(ticker, False)
+                self.subscribed.discard(ticker)
+
+    async def quotes(self) -> AsyncIterator[dict[str, Any]]:
+        """연결이 끊길 때까지 체결 시세를 하나씩 반환"""
+        async for message in self._ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                if message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+                continue
+
+            data = message.data
+            if data[:1] in ("0", "1"):
+                # 1|... 은 암호화된 체결통보(계좌)로 시세 스트림에서는 쓰지 않음
+                for quote in parse_price_frame(data):
+                    yield quote
+                continue
+
+            control = json.loads(data)
+            header = control.get("header", {})
+            if header.get("tr_id") == "PINGPONG":
+                await self._ws.send_str(data)
+                continue
+            body = control.get("body", {})
+            if body.get("rt_cd") not in (None, "0"):
+                logger.warning(
+                    "KIS realtime %s %s: %s", header.get("tr_id"), header.get("tr_key"), body.get("msg1")
+                )
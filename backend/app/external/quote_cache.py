@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from datetime import datetime, time as dt_time
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.core.loop_local import LoopLocal
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+MARKET_KR = "KR"
+MARKET_US = "US"
+
+REDIS_KEY_PREFIX = "stockflow:quote:"
+
+# 정규장 시간 (공휴일은 고려하지 않음)
+_SESSIONS = {
+    MARKET_KR: (ZoneInfo("Asia/Seoul"), dt_time(9, 0), dt_time(15, 30)),
+    MARKET_US: (ZoneInfo("America/New_York"), dt_time(9, 30), dt_time(16, 0)),
+}
+
+Quote = dict[str, Any]
+
+
+def is_market_open(market: str, now: datetime | None = None) -> bool:
+    tz, open_at, close_at = _SESSIONS[market]
+    local = (now or datetime.now(tz)).astimezone(tz)
+    return local.weekday() < 5 and open_at <= local.time() < close_at
+
+
+class QuoteCache:
+    """
+    (market, ticker) 단위 시세 캐시. 프로세스 내 LRU + Redis 2단 구성.
+
+    장중에는 짧은 TTL, 장 마감 후에는 긴 TTL을 쓴다. 같은 종목의 값은 필드 단위로 병합해
+    시세만 있는 항목(일괄 조회)과 종목 정보까지 있는 항목(yfinance .info)을 함께 보관한다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        open_ttl: float | None = None,
+        closed_ttl: float | None = None,
+        use_redis: bool = True,
+    ):
+        self.max_entries = max_entries or settings.quote_cache_max_entries
+        self.open_ttl = open_ttl if open_ttl is not None else settings.quote_cache_ttl_open_seconds
+        self.closed_ttl = closed_ttl if closed_ttl is not None else settings.quote_cache_ttl_closed_seconds
+        self.use_redis = use_redis
+        self._entries: OrderedDict[tuple[str, str], tuple[Quote, float]] = OrderedDict()
+        # 진행 중인 조회는 그 이벤트 루프에서만 기다릴 수 있으므로 루프별로 둔다
+        self._inflight: LoopLocal[dict[tuple[str, str], asyncio.Future]] = LoopLocal(dict)
+        self.counters: Counter[str] = Counter()
+
+    def ttl_for(self, market: str) -> float:
+        return self.open_ttl if is_market_open(market) else self.closed_ttl
+
+    def stats(self) -> dict[str, Any]:
+        stats = {name: self.counters[name] for name in ("hits", "redis_hits", "misses", "stores", "evictions")}
+        lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+        stats["entries"] = len(self._entries)
+        stats["hit_ratio"] = (stats["hits"] + stats["redis_hits"]) / lookups if lookups else None
+        return stats
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.counters.clear()
+
+    def _get_local(self, key: tuple[str, str], require: Sequence[str]) -> Quote | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        quote, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        if any(quote.get(field) is None for field in require):
+            return None
+        self._entries.move_to_end(key)
+        return quote
+
+    def _put_local(self, key: tuple[str, str], quote: Quote, expires_at: float) -> None:
+        self._entries[key] = (quote, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    @staticmethod
+    def _redis_key(market: str, ticker: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{market}:{ticker}"
+
+    async def get_many(
+        self, market: str, tickers: Iterable[str], require: Sequence[str] = ("current_price",)
+    ) -> dict[str, Quote]:
+        found: dict[str, Quote] = {}
+        missing: list[str] = []
+        for ticker in dict.fromkeys(tickers):
+            quote = self._get_local((market, ticker), require)
+            if quote is not None:
+                found[ticker] = quote
+                self.counters["hits"] += 1
+            else:
+                missing.append(ticker)
+
+        if missing and self.use_redis:
+            try:
+                raws = await get_redis().mget([self._redis_key(market, t) for t in missing])
+            except Exception as e:
+                logger.debug("quote cache redis read failed: %s", e)
+                raws = [None] * len(missing)
+            now = time.time()
+            still_missing = []
+            for ticker, raw in zip(missing, raws):
+                payload = json.loads(raw) if raw else None
+                if payload and payload["expires_at"] > now and all(
+                    payload["quote"].get(field) is not None for field in require
+                ):
+                    self._put_local((market, ticker), payload["quote"], payload["expires_at"])
+                    found[ticker] = payload["quote"]
+                    self.counters["redis_hits"] += 1
+                else:
+                    still_missing.append(ticker)
+            missing = still_missing
+
+        self.counters["misses"] += len(missing)
+        return found
+
+    async def get(
+        self, market: str, ticker: str, require: Sequence[str] = ("current_price",)
+    ) -> Quote | None:
+        return (await self.get_many(market, [ticker], require)).get(ticker)
+
+    async def set_many(self, market: str, quotes: dict[str, Quote | None]) -> None:
+        ttl = self.ttl_for(market)
+        expires_at = time.time() + ttl
+        stored: dict[str, str] = {}
+        for ticker, quote in quotes.items():
+            if not quote:
+                continue
+            key = (market, ticker)
+            previous = self._entries.get(key)
+            merged = {**previous[0], **quote} if previous and previous[1] > time.time() else quote
+            self._put_local(key, merged, expires_at)
+            stored[self._redis_key(market, ticker)] = json.dumps(
+                {"quote": merged, "expires_at": expires_at}, default=str
+            )
+        self.counters["stores"] += len(stored)
+
+        if stored and self.use_redis:
+            try:
+                pipe = get_redis().pipeline(transaction=False)
+                for redis_key, payload in stored.items():
+                    pipe.set(redis_key, payload, px=max(1, int(ttl * 1000)))
+                await pipe.execute()
+            except Exception as e:
+                logger.debug("quote cache redis write failed: %s", e)
+
+    async def set(self, market: str, ticker: str, quote: Quote | None) -> None:
+        await self.set_many(market, {ticker: quote})
+
+    async def get_or_fetch(
+        self,
+        market: str,
+        ticker: str,
+        fetch: Callable[[], Awaitable[Quote | None]],
+        require: Sequence[str] = ("current_price",),
+    ) -> Quote | None:
+        """캐시에 없으면 fetch 결과를 저장 (같은 종목 동시 조회는 네트워크 호출 1회로 합침)"""
+        quote = await self.get(market, ticker, require)
+        if quote is not None:
+            return quote
+
+        key = (market, ticker)
+        inflights = self._inflight.get()
+        inflight = inflights.get(key)
+        if inflight is None or inflight.done():
+
+            async def load() -> Quote | None:
+                fetched = await fetch()
+                await self.set(market, ticker, fetched)
+                return fetched
+
+            inflight = asyncio.ensure_future(load())
+            inflights[key] = inflight
+            inflight.add_done_callback(
+                lambda t: inflights.pop(key, None) if inflights.get(key) is t else None
+            )
+        return await asyncio.shield(inflight)
+
+
+quote_cache = QuoteCache()
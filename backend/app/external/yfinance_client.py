@@ -1,14 +1,29 @@
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import Any
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pubsub import publish_fx
+from app.external.quote_cache import MARKET_US, quote_cache
+
 
 _executor = ThreadPoolExecutor(max_workers=4)
 
+DEFAULT_EXCHANGE_RATE = 1300.0
+
+_exchange_rate_cache = TTLCache(
+    "exchange_rate",
+    ttl=settings.exchange_rate_cache_ttl_seconds,
+    stale_ttl=settings.exchange_rate_stale_ttl_seconds,
+)
+
 
 def _sync_get_stock_info(ticker: str) -> dict[str, Any] | None:
     try:
@@ -53,70 +68,243 @@ def _sync_search_stocks(query: str) -> list[dict[str, Any]]:
         return []
 
 
-def _sync_get_historical_data(
+@dataclass(slots=True)
+class PriceHistory:
+    """일봉 시세를 컬럼별 NumPy 배열로 보관 (dates는 datetime64[D])"""
+
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "PriceHistory":
+        return cls(
+            np.array([], dtype="datetime64[D]"),
+            *(np.array([], dtype=np.float64) for _ in range(4)),
+            np.array([], dtype=np.int64),
+        )
+
+    @classmethod
+    def from_frame(cls, hist: pd.DataFrame) -> "PriceHistory":
+        if hist is None or hist.empty:
+            return cls.empty()
+        index = hist.index
+        if getattr(index, "tz", None) is not None:
+            index = index.tz_localize(None)
+        return cls(
+            index.to_numpy(dtype="datetime64[D]"),
+            hist["Open"].to_numpy(dtype=np.float64),
+            hist["High"].to_numpy(dtype=np.float64),
+            hist["Low"].to_numpy(dtype=np.float64),
+            hist["Close"].to_numpy(dtype=np.float64),
+            hist["Volume"].fillna(0).to_numpy(dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return [
+            {"date": d, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for d, o, h, l, c, v in zip(
+                self.dates.astype(object),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+            )
+        ]
+
+    def to_arrow(self):
+        """pyarrow가 설치된 경우에만 사용 가능 (필수 의존성 아님)"""
+        import pyarrow as pa
+
+        return pa.table({
+            "date": self.dates,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+
+
+def _sync_get_historical_columns(
     ticker: str, start_date: date, end_date: date
-) -> list[dict[str, Any]]:
+) -> PriceHistory:
     try:
         stock = yf.Ticker(ticker)
         hist = stock.history(start=start_date, end=end_date)
-        if hist.empty:
-            return []
-        
-        result = []
-        for idx, row in hist.iterrows():
-            result.append({
-                "date": idx.date(),
-                "open": row["Open"],
-                "high": row["High"],
-                "low": row["Low"],
-                "close": row["Close"],
-                "volume": int(row["Volume"]),
-            })
+        return PriceHistory.from_frame(hist)
+    except Exception:
+        return PriceHistory.empty()
+
+
+def _sync_get_historical_data(
+    ticker: str, start_date: date, end_date: date
+) -> list[dict[str, Any]]:
+    return _sync_get_historical_columns(ticker, start_date, end_date).to_rows()
+
+
+QUOTE_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def _parse_quotes_frame(frame: pd.DataFrame, tickers: list[str]) -> dict[str, dict[str, Any] | None]:
+    """yf.download 결과(필드 x 티커 컬럼)에서 티커별 마지막 거래일 시세와 전일 대비 변동을 추출"""
+    result: dict[str, dict[str, Any] | None] = {ticker: None for ticker in tickers}
+    if frame is None or frame.empty:
         return result
+
+    if not isinstance(frame.columns, pd.MultiIndex):
+        # 단일 티커 + 구버전 yfinance는 단층 컬럼으로 반환
+        frame = pd.concat({tickers[0]: frame}, axis=1).swaplevel(axis=1)
+
+    columns = [t for t in tickers if t in frame["Close"].columns]
+    if not columns:
+        return result
+
+    fields = {
+        field: frame[field].reindex(columns=columns).to_numpy(dtype=np.float64)
+        for field in QUOTE_FIELDS
+    }
+    close = fields["Close"]
+    valid = ~np.isnan(close)
+    n_rows = close.shape[0]
+    col_idx = np.arange(len(columns))
+
+    has_last = valid.any(axis=0)
+    last = n_rows - 1 - valid[::-1].argmax(axis=0)
+    valid[last, col_idx] = False
+    has_prev = valid.any(axis=0) & has_last
+    prev = n_rows - 1 - valid[::-1].argmax(axis=0)
+
+    last_close = close[last, col_idx]
+    prev_close = np.where(has_prev, close[prev, col_idx], np.nan)
+    change = last_close - prev_close
+    change_percent = np.divide(
+        change * 100, prev_close, out=np.full_like(change, np.nan), where=prev_close > 0
+    )
+    trade_dates = frame.index[last]
+
+    values = {field: fields[field][last, col_idx] for field in QUOTE_FIELDS}
+    for i, ticker in enumerate(columns):
+        if not has_last[i]:
+            continue
+        volume = values["Volume"][i]
+        result[ticker] = {
+            "ticker": ticker,
+            "date": trade_dates[i].date(),
+            "open_price": _nan_to_none(values["Open"][i]),
+            "high_price": _nan_to_none(values["High"][i]),
+            "low_price": _nan_to_none(values["Low"][i]),
+            "current_price": float(last_close[i]),
+            "volume": None if np.isnan(volume) else int(volume),
+            "change": _nan_to_none(change[i]),
+            "change_percent": _nan_to_none(change_percent[i]),
+        }
+    return result
+
+
+def _nan_to_none(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def _sync_get_quotes_batch(tickers: list[str]) -> dict[str, dict[str, Any] | None]:
+    try:
+        frame = yf.download(
+            tickers,
+            period="5d",
+            interval="1d",
+            group_by="column",
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+        )
     except Exception:
-        return []
+        return {ticker: None for ticker in tickers}
+    return _parse_quotes_frame(frame, tickers)
 
 
-def _sync_get_exchange_rate() -> float:
+def _sync_get_exchange_rate() -> float | None:
     try:
         usd_krw = yf.Ticker("USDKRW=X")
         info = usd_krw.info
-        return info.get("regularMarketPrice", 1300.0)
+        return info.get("regularMarketPrice")
     except Exception:
-        return 1300.0
+        return None
 
 
 class YFinanceClient:
     async def get_stock_info(self, ticker: str) -> dict[str, Any] | None:
+        async def fetch() -> dict[str, Any] | None:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(_executor, _sync_get_stock_info, ticker)
+
+        # 일괄 시세로 채워진 항목에는 종목명이 없으므로 name까지 있어야 캐시 적중
+        return await quote_cache.get_or_fetch(
+            MARKET_US, ticker, fetch, require=("current_price", "name")
+        )
+
+    async def get_quotes_batch(
+        self, tickers: list[str], chunk_size: int = 200
+    ) -> dict[str, dict[str, Any] | None]:
+        """여러 티커의 최근 일봉 시세를 yf.download 일괄 호출로 조회 (chunk_size개씩 나눠 병렬)"""
+        tickers = list(dict.fromkeys(tickers))
+        cached = await quote_cache.get_many(MARKET_US, tickers)
+        missing = [t for t in tickers if t not in cached]
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, _sync_get_stock_info, ticker)
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(_executor, _sync_get_quotes_batch, missing[start:start + chunk_size])
+            for start in range(0, len(missing), chunk_size)
+        ))
+        result: dict[str, dict[str, Any] | None] = {}
+        for chunk in chunks:
+            result.update(chunk)
+        await quote_cache.set_many(MARKET_US, result)
+        result.update(cached)
+        return result
 
     async def search_stocks(self, query: str) -> list[dict[str, Any]]:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, _sync_search_stocks, query)
 
     async def get_historical_data(
-        self, ticker: str, start_date: date, end_date: date
-    ) -> list[dict[str, Any]]:
+        self, ticker: str, start_date: date, end_date: date, columnar: bool = False
+    ) -> list[dict[str, Any]] | PriceHistory:
+        """columnar=True면 행별 dict 대신 컬럼 배열(PriceHistory)을 반환"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor, _sync_get_historical_data, ticker, start_date, end_date
-        )
+        fetch = _sync_get_historical_columns if columnar else _sync_get_historical_data
+        return await loop.run_in_executor(_executor, fetch, ticker, start_date, end_date)
 
-    async def get_exchange_rate(self) -> float:
+    async def _fetch_exchange_rate(self) -> float:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, _sync_get_exchange_rate)
+        rate = await loop.run_in_executor(_executor, _sync_get_exchange_rate)
+        if not rate:
+            raise ValueError("USDKRW=X 환율 조회 실패")
+        await publish_fx("USDKRW", float(rate))
+        return float(rate)
+
+    async def get_exchange_rate(self) -> float:
+        # 조회 실패 시 기본값은 캐시하지 않고 마지막으로 알려진 값이 있으면 그 값을 사용
+        try:
+            return await _exchange_rate_cache.get("USDKRW", self._fetch_exchange_rate)
+        except Exception:
+            return _exchange_rate_cache.peek("USDKRW") or DEFAULT_EXCHANGE_RATE
 
     async def get_benchmark_data(
-        self, benchmark: str, start_date: date, end_date: date
-    ) -> list[dict[str, Any]]:
+        self, benchmark: str, start_date: date, end_date: date, columnar: bool = False
+    ) -> list[dict[str, Any]] | PriceHistory:
         benchmark_tickers = {
             "KOSPI": "^KS11",
             "SP500": "^GSPC",
             "NASDAQ": "^IXIC",
         }
         ticker = benchmark_tickers.get(benchmark, benchmark)
-        return await self.get_historical_data(ticker, start_date, end_date)
+        return await self.get_historical_data(ticker, start_date, end_date, columnar=columnar)
 
 
 yfinance_client = YFinanceClient()
@@ -7,12 +7,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import stocks, transactions, holdings, dashboard, analytics, auth, batch, dividends
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.redis import close_redis
+from app.core.response_cache import ResponseCacheMiddleware
+from app.external.kis_client import kis_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
+    await kis_client.open()
     yield
+    await kis_client.close()
+    await close_redis()
     await close_db()
 
 
@@ -22,12 +28,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 나중에 추가한 미들웨어가 바깥쪽: 캐시 HIT/304 응답도 CORS 헤더를 거치도록 CORS를 마지막에 추가
+app.add_middleware(
+    ResponseCacheMiddleware,
+    prefixes=("/api/dashboard", "/api/analytics"),
+    exclude=("/api/dashboard/live",),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 목록 API의 다음 페이지 커서는 헤더로 내려주므로 다른 출처의 브라우저에서도 읽을 수 있게 노출
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
@@ -7,6 +7,9 @@ from app.models.market_data import MarketDataHistory
 from app.models.batch_job import BatchJobStatus
 from app.models.dividend import Dividend
 from app.models.stock_daily_performance import StockDailyPerformance
+from app.models.exchange_rate import ExchangeRateHistory
+from app.models.benchmark_index import BenchmarkIndexHistory
+from app.models.lot_ledger import OpenLot, RealizedGain
 
 __all__ = [
     "User",
@@ -18,4 +21,8 @@ __all__ = [
     "BatchJobStatus",
     "Dividend",
     "StockDailyPerformance",
+    "ExchangeRateHistory",
+    "BenchmarkIndexHistory",
+    "OpenLot",
+    "RealizedGain",
 ]
@@ -0,0 +1,22 @@
+from datetime import datetime
+from datetime import date as date_type
+
+from sqlalchemy import String, DateTime, Date, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class BenchmarkIndexHistory(Base):
+    __tablename__ = "benchmark_index_history"
+    __table_args__ = (
+        UniqueConstraint("benchmark", "record_date", name="uq_benchmark_date"),
+        {'comment': '벤치마크 지수 일별 종가 이력'}
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment='지수 시세 ID (Primary Key)')
+    benchmark: Mapped[str] = mapped_column(String(20), comment='벤치마크 코드 (예: SP500, KOSPI)')
+    record_date: Mapped[date_type] = mapped_column(Date, index=True, comment='기준일자')
+    close_price: Mapped[float] = mapped_column(Numeric(18, 4), comment='종가')
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, comment='데이터 수집일시')
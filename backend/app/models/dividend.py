@@ -2,7 +2,7 @@ from datetime import date
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -14,7 +14,10 @@ if TYPE_CHECKING:
 
 class Dividend(Base):
     __tablename__ = "dividends"
-    __table_args__ = {'comment': '배당금 수령 내역'}
+    __table_args__ = (
+        Index("ix_dividends_user_date_id", "user_id", "dividend_date", "id"),
+        {'comment': '배당금 수령 내역'}
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment='배당 ID (Primary Key)')
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, comment='사용자 ID (FK)')
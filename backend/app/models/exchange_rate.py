@@ -0,0 +1,22 @@
+from datetime import datetime
+from datetime import date as date_type
+
+from sqlalchemy import String, DateTime, Date, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ExchangeRateHistory(Base):
+    __tablename__ = "exchange_rate_history"
+    __table_args__ = (
+        UniqueConstraint("currency_pair", "record_date", name="uq_currency_pair_date"),
+        {'comment': '일별 환율 이력 (종가 기준)'}
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment='환율 ID (Primary Key)')
+    currency_pair: Mapped[str] = mapped_column(String(10), comment='통화쌍 (예: USDKRW)')
+    record_date: Mapped[date_type] = mapped_column(Date, index=True, comment='기준일자')
+    rate: Mapped[float] = mapped_column(Numeric(12, 4), comment='환율 (종가)')
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, comment='데이터 수집일시')
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, UniqueConstraint
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -27,6 +27,9 @@ class Holding(Base):
     total_invested: Mapped[float] = mapped_column(Numeric(18, 4), default=0, comment='총 투자금액 (KRW)')
     total_dividends: Mapped[float] = mapped_column(Numeric(18, 4), default=0, comment='누적 배당금 (KRW)')
     realized_gain: Mapped[float] = mapped_column(Numeric(18, 4), default=0, comment='실현 손익 (매도 확정 금액)')
+    total_cost: Mapped[float | None] = mapped_column(Numeric(24, 8), nullable=True, comment='보유분 매입원가 (현지 통화, 증분 반영용)')
+    last_transaction_date: Mapped[date | None] = mapped_column(Date, nullable=True, comment='마지막으로 반영한 거래일')
+    last_transaction_id: Mapped[int | None] = mapped_column(nullable=True, comment='마지막으로 반영한 거래 ID')
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, comment='최초 매수일시')
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='마지막 거래 반영일시'
@@ -0,0 +1,45 @@
+from datetime import date as date_type
+
+from sqlalchemy import Date, ForeignKey, Index, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class OpenLot(Base):
+    __tablename__ = "open_lots"
+    __table_args__ = (
+        Index("ix_open_lots_user_stock_fifo", "user_id", "stock_id", "acquired_date", "buy_transaction_id"),
+        {'comment': '선입선출(FIFO) 매칭 대기 중인 매수 lot'}
+    )
+
+    buy_transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True, comment='매수 거래 ID (PK, FK)'
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), comment='사용자 ID (FK)')
+    stock_id: Mapped[int] = mapped_column(ForeignKey("stocks.id"), comment='종목 ID (FK)')
+    acquired_date: Mapped[date_type] = mapped_column(Date, comment='매수 일자')
+    remaining_quantity: Mapped[float] = mapped_column(Numeric(18, 8), comment='미청산 잔여 수량')
+    price: Mapped[float] = mapped_column(Numeric(18, 4), comment='매수 단가')
+    exchange_rate: Mapped[float] = mapped_column(Numeric(10, 4), comment='매수 환율')
+
+
+class RealizedGain(Base):
+    __tablename__ = "realized_gains"
+    __table_args__ = (
+        Index("ix_realized_gains_user_stock", "user_id", "stock_id"),
+        {'comment': '매도 거래별 FIFO 실현 손익'}
+    )
+
+    sell_transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True, comment='매도 거래 ID (PK, FK)'
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), comment='사용자 ID (FK)')
+    stock_id: Mapped[int] = mapped_column(ForeignKey("stocks.id"), comment='종목 ID (FK)')
+    cost_basis_krw: Mapped[float] = mapped_column(Numeric(24, 8), comment='매칭된 매수 원가 (KRW)')
+    realized_gain: Mapped[float] = mapped_column(Numeric(24, 8), comment='실현 손익 (KRW)')
+
+    @property
+    def realized_gain_percent(self) -> float:
+        cost = float(self.cost_basis_krw)
+        return float(self.realized_gain) / cost * 100 if cost > 0 else 0.0
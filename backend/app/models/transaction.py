@@ -3,7 +3,7 @@ from datetime import date as date_type
 from typing import TYPE_CHECKING
 import enum
 
-from sqlalchemy import String, DateTime, Date, ForeignKey, Enum, Numeric
+from sqlalchemy import String, DateTime, Date, ForeignKey, Enum, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -21,7 +21,11 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
-    __table_args__ = {'comment': '매매 거래 내역 (매수/매도)'}
+    __table_args__ = (
+        Index("ix_transactions_user_date_id", "user_id", "transaction_date", "id"),
+        Index("ix_transactions_user_stock_date_id", "user_id", "stock_id", "transaction_date", "id"),
+        {'comment': '매매 거래 내역 (매수/매도)'}
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment='거래 ID (Primary Key)')
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, comment='사용자 ID (FK)')
@@ -2,6 +2,7 @@ from datetime import date
 from pydantic import BaseModel
 
 from app.models.stock import MarketType
+from app.schemas.analytics import RiskMetrics, SectorAllocation
 
 
 class PortfolioSummary(BaseModel):
@@ -24,6 +25,14 @@ class MarketBreakdown(BaseModel):
     unrealized_gain_percent: float
 
 
+class DashboardOverview(BaseModel):
+    """요청한 섹션(fields)만 채워서 반환"""
+    summary: PortfolioSummary | None = None
+    market_breakdown: list[MarketBreakdown] | None = None
+    sectors: list[SectorAllocation] | None = None
+    risk: RiskMetrics | None = None
+
+
 class DailyPerformancePoint(BaseModel):
     date: date
     total_value_krw: float
@@ -66,3 +66,17 @@ class TransactionPageResponse(BaseModel):
     total_pages: int
     current_page: int
     available_years: list[int]
+    next_cursor: str | None = None
+
+
+class TransactionImportRowError(BaseModel):
+    line: int
+    message: str
+
+
+class TransactionImportResult(BaseModel):
+    rows_read: int
+    imported: int
+    skipped: int
+    holdings_recalculated: int
+    errors: list[TransactionImportRowError]
@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_upsert
+from app.external.yfinance_client import yfinance_client
+from app.models.benchmark_index import BenchmarkIndexHistory
+
+# 코드: (yfinance 티커, 표시명)
+BENCHMARKS = {
+    "KOSPI": ("^KS11", "KOSPI"),
+    "SP500": ("^GSPC", "S&P 500"),
+    "NASDAQ": ("^IXIC", "NASDAQ"),
+}
+DEFAULT_BENCHMARK = "SP500"
+BENCHMARK_HISTORY_DAYS = 365 * 2
+
+# 연휴가 길어도 이 정도 이상 비어 있으면 앞쪽 이력이 없는 것으로 본다
+_HEAD_GAP_DAYS = 7
+
+# 프로세스별로 오늘 이미 꼬리 구간을 조회한 벤치마크 (주말/휴장일 반복 조회 방지)
+_tail_checked: dict[str, date] = {}
+_head_checked: dict[str, date] = {}
+
+
+async def _fetch_and_store(
+    db: AsyncSession, benchmark: str, start_date: date, end_date: date
+) -> int:
+    ticker, _ = BENCHMARKS[benchmark]
+    # yfinance의 end는 미포함
+    history = await yfinance_client.get_historical_data(
+        ticker, start_date, end_date + timedelta(days=1), columnar=True
+    )
+    valid = np.isfinite(history.close) & (history.close > 0)
+    rows = [
+        {"benchmark": benchmark, "record_date": record_date, "close_price": close}
+        for record_date, close in zip(
+            history.dates[valid].astype(object), history.close[valid].tolist()
+        )
+    ]
+    return await bulk_upsert(db, BenchmarkIndexHistory, rows, constraint="uq_benchmark_date")
+
+
+async def _stored_range(db: AsyncSession, benchmark: str) -> tuple[date | None, date | None]:
+    stmt = select(
+        func.min(BenchmarkIndexHistory.record_date),
+        func.max(BenchmarkIndexHistory.record_date),
+    ).where(BenchmarkIndexHistory.benchmark == benchmark)
+    first, last = (await db.execute(stmt)).one()
+    return first, last
+
+
+async def refresh_benchmark(
+    db: AsyncSession, benchmark: str, start_date: date | None = None
+) -> int:
+    """저장된 마지막 날짜(당일 종가 확정 전 값일 수 있어 다시 받음)부터 오늘까지 갱신"""
+    today = date.today()
+    if start_date is None:
+        _, last = await _stored_range(db, benchmark)
+        start_date = last or today - timedelta(days=BENCHMARK_HISTORY_DAYS)
+    processed = await _fetch_and_store(db, benchmark, start_date, today)
+    _tail_checked[benchmark] = today
+    return processed
+
+
+async def get_benchmark_closes(
+    db: AsyncSession, benchmark: str, start_date: date, end_date: date
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (dates[datetime64[D]], closes) 배열. 로컬 테이블에 없는 구간만 yfinance에서 받아 저장한다.
+    """
+    today = date.today()
+    first, last = await _stored_range(db, benchmark)
+
+    if first is None:
+        await _fetch_and_store(
+            db, benchmark, min(start_date, today - timedelta(days=BENCHMARK_HISTORY_DAYS)), today
+        )
+        _tail_checked[benchmark] = today
+    else:
+        if first - start_date > timedelta(days=_HEAD_GAP_DAYS) and _head_checked.get(benchmark, first) > start_date:
+            await _fetch_and_store(db, benchmark, start_date, first)
+            _head_checked[benchmark] = start_date
+        if last < min(end_date, today) and _tail_checked.get(benchmark) != today:
+            await refresh_benchmark(db, benchmark, last)
+
+    stmt = (
+        select(BenchmarkIndexHistory.record_date, cast(BenchmarkIndexHistory.close_price, Float))
+        .where(
+            BenchmarkIndexHistory.benchmark == benchmark,
+            BenchmarkIndexHistory.record_date >= start_date,
+            BenchmarkIndexHistory.record_date <= end_date,
+        )
+        .order_by(BenchmarkIndexHistory.record_date)
+    )
+    rows = (await db.execute(stmt)).all()
+    dates = np.array([r[0] for r in rows], dtype="datetime64[D]")
+    closes = np.array([r[1] for r in rows], dtype=np.float64)
+    return dates, closes
@@ -0,0 +1,115 @@
+import time
+from collections.abc import Sequence
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import bulk_upsert
+from app.external.yfinance_client import yfinance_client
+from app.models.exchange_rate import ExchangeRateHistory
+
+USD_KRW = "USDKRW"
+USD_KRW_TICKER = "USDKRW=X"
+DEFAULT_USD_KRW = 1300.0
+FX_HISTORY_START = date(2015, 1, 1)
+
+
+class FxRateSeries:
+    """일별 환율을 정렬된 배열로 보관하고 as-of 조회 제공 (최초 기록 이전 날짜는 첫 환율 사용)"""
+
+    def __init__(self, ordinals: np.ndarray, rates: np.ndarray, default: float = DEFAULT_USD_KRW):
+        self._ordinals = ordinals
+        self._rates = rates
+        self.default = default
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple[date, float]], default: float = DEFAULT_USD_KRW) -> "FxRateSeries":
+        rows = sorted(rows)
+        ordinals = np.fromiter((d.toordinal() for d, _ in rows), dtype=np.int64, count=len(rows))
+        rates = np.fromiter((r for _, r in rows), dtype=np.float64, count=len(rows))
+        return cls(ordinals, rates, default)
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def rates_for(self, dates: Sequence[date]) -> np.ndarray:
+        if not len(self._rates):
+            return np.full(len(dates), self.default)
+        ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+        idx = np.searchsorted(self._ordinals, ordinals, side="right") - 1
+        return self._rates[np.clip(idx, 0, None)]
+
+    def asof(self, target: date) -> float:
+        return float(self.rates_for([target])[0])
+
+
+# 통화쌍별 (마지막 확인 시각, 저장된 이력 지문, 시계열). 다른 프로세스(Celery 워커 등)의 백필은
+# 무효화 호출이 닿지 않으므로 TTL이 지나면 지문(행 수, 마지막 날짜, 환율 합)을 다시 읽어 바뀌었을 때만 다시 로드
+_series_cache: dict[str, tuple[float, tuple, FxRateSeries]] = {}
+
+
+def invalidate_fx_cache(pair: str | None = None) -> None:
+    """환율 이력 쓰기를 커밋한 뒤 호출 (같은 프로세스는 다음 조회에서 바로 다시 읽는다)"""
+    if pair is None:
+        _series_cache.clear()
+    else:
+        _series_cache.pop(pair, None)
+
+
+async def get_fx_series(db: AsyncSession, pair: str = USD_KRW) -> FxRateSeries:
+    now = time.monotonic()
+    cached = _series_cache.get(pair)
+    if cached and now - cached[0] < settings.fx_series_cache_ttl_seconds:
+        return cached[2]
+
+    stamp_stmt = select(
+        func.count(), func.max(ExchangeRateHistory.record_date), func.sum(ExchangeRateHistory.rate)
+    ).where(ExchangeRateHistory.currency_pair == pair)
+    stamp = tuple((await db.execute(stamp_stmt)).one())
+    if cached and cached[1] == stamp:
+        _series_cache[pair] = (now, stamp, cached[2])
+        return cached[2]
+
+    stmt = (
+        select(ExchangeRateHistory.record_date, cast(ExchangeRateHistory.rate, Float))
+        .where(ExchangeRateHistory.currency_pair == pair)
+        .order_by(ExchangeRateHistory.record_date)
+    )
+    series = FxRateSeries.from_rows((await db.execute(stmt)).all())
+    _series_cache[pair] = (now, stamp, series)
+    return series
+
+
+async def backfill_exchange_rates(
+    db: AsyncSession,
+    pair: str = USD_KRW,
+    ticker: str = USD_KRW_TICKER,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> int:
+    """저장된 마지막 날짜(장중 값일 수 있어 다시 받음)부터 end_date까지 환율을 일괄 UPSERT"""
+    if start_date is None:
+        last_stmt = select(func.max(ExchangeRateHistory.record_date)).where(
+            ExchangeRateHistory.currency_pair == pair
+        )
+        start_date = (await db.execute(last_stmt)).scalar() or FX_HISTORY_START
+    end_date = end_date or date.today()
+    if start_date > end_date:
+        return 0
+
+    # yfinance의 end는 미포함
+    history = await yfinance_client.get_historical_data(
+        ticker, start_date, end_date + timedelta(days=1), columnar=True
+    )
+    valid = np.isfinite(history.close) & (history.close > 0)
+    rows = [
+        {"currency_pair": pair, "record_date": record_date, "rate": rate}
+        for record_date, rate in zip(
+            history.dates[valid].astype(object), history.close[valid].tolist()
+        )
+    ]
+    # 캐시 무효화(invalidate_fx_cache)는 호출자가 커밋한 뒤에 한다
+    return await bulk_upsert(db, ExchangeRateHistory, rows, constraint="uq_currency_pair_date")
@@ -1,5 +1,8 @@
+from collections.abc import Sequence
 from decimal import Decimal
-from sqlalchemy import select
+
+import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -8,110 +11,236 @@ from app.models.transaction import Transaction, TransactionType
 from app.models.stock import Stock, MarketType
 from app.models.dividend import Dividend  # 추가
 from app.external.yfinance_client import yfinance_client
+from app.services.lot_ledger import append_to_lot_ledger, rebuild_lot_ledger
+
+
+def _holding_field(name: str) -> property:
+    return property(lambda self: getattr(self.holding, name))
+
+
+class HoldingMetrics:
+    """보유 종목 1건과 평가 지표. HoldingWithMetrics 응답 스키마가 속성으로 바로 읽는다."""
+
+    __slots__ = (
+        "holding",
+        "stock",
+        "current_value",
+        "current_value_krw",
+        "unrealized_gain",
+        "unrealized_gain_percent",
+        "weight_percent",
+    )
+
+    def __init__(
+        self,
+        holding: Holding,
+        current_value: float,
+        current_value_krw: float,
+        unrealized_gain: float,
+        unrealized_gain_percent: float,
+        weight_percent: float,
+    ):
+        self.holding = holding
+        self.stock = holding.stock
+        self.current_value = current_value
+        self.current_value_krw = current_value_krw
+        self.unrealized_gain = unrealized_gain
+        self.unrealized_gain_percent = unrealized_gain_percent
+        self.weight_percent = weight_percent
+
+    id = _holding_field("id")
+    user_id = _holding_field("user_id")
+    stock_id = _holding_field("stock_id")
+    quantity = _holding_field("quantity")
+    average_cost = _holding_field("average_cost")
+    average_exchange_rate = _holding_field("average_exchange_rate")
+    total_invested = _holding_field("total_invested")
+    total_dividends = _holding_field("total_dividends")
+    realized_gain = _holding_field("realized_gain")
+    created_at = _holding_field("created_at")
+    updated_at = _holding_field("updated_at")
+
+
+def compute_holding_metrics(holdings: Sequence[Holding], exchange_rate: float) -> list[HoldingMetrics]:
+    """평가금액/손익/비중을 배열 연산 한 번으로 계산 (종목 정보가 없는 보유 건은 제외)"""
+    holdings = [h for h in holdings if h.stock]
+    n = len(holdings)
+    quantity = np.fromiter((h.quantity for h in holdings), dtype=np.float64, count=n)
+    price = np.fromiter(
+        (h.stock.current_price or h.average_cost for h in holdings), dtype=np.float64, count=n
+    )
+    invested = np.fromiter((h.total_invested for h in holdings), dtype=np.float64, count=n)
+    fx = np.fromiter(
+        (exchange_rate if h.stock.market_type == MarketType.US else 1.0 for h in holdings),
+        dtype=np.float64,
+        count=n,
+    )
+
+    value = quantity * price
+    value_krw = value * fx
+    gain = value_krw - invested
+    gain_pct = np.divide(gain * 100, invested, out=np.zeros(n), where=invested > 0)
+    total_value_krw = value_krw.sum()
+    weight = value_krw / total_value_krw * 100 if total_value_krw > 0 else np.zeros(n)
+
+    return [
+        HoldingMetrics(h, *row)
+        for h, row in zip(
+            holdings,
+            zip(value.tolist(), value_krw.tolist(), gain.tolist(), gain_pct.tolist(), weight.tolist()),
+        )
+    ]
+
+
+class _PositionState:
+    """평균단가 기준 포지션 상태. 전체 재계산과 증분 반영이 같은 계산(apply)을 쓴다."""
+
+    __slots__ = ("quantity", "total_cost", "total_cost_krw", "realized_gain")
+
+    def __init__(
+        self,
+        quantity: Decimal = Decimal("0"),
+        total_cost: Decimal = Decimal("0"),
+        total_cost_krw: Decimal = Decimal("0"),
+        realized_gain: Decimal = Decimal("0"),
+    ):
+        self.quantity = quantity
+        self.total_cost = total_cost
+        self.total_cost_krw = total_cost_krw
+        self.realized_gain = realized_gain
+
+    @classmethod
+    def from_holding(cls, holding: Holding) -> "_PositionState":
+        return cls(
+            Decimal(str(holding.quantity)),
+            Decimal(str(holding.total_cost)),
+            Decimal(str(holding.total_invested)),
+            Decimal(str(holding.realized_gain)),
+        )
+
+    def apply(self, txn: Transaction) -> None:
+        txn_qty = Decimal(str(txn.quantity))
+        txn_price = Decimal(str(txn.price))
+        txn_rate = Decimal(str(txn.exchange_rate))
+
+        if txn.transaction_type == TransactionType.BUY:
+            self.total_cost += txn_qty * txn_price
+            self.total_cost_krw += txn_qty * txn_price * txn_rate
+            self.quantity += txn_qty
+
+        elif txn.transaction_type == TransactionType.SELL:
+            if self.quantity > 0:
+                avg_cost = self.total_cost / self.quantity
+                avg_cost_krw = self.total_cost_krw / self.quantity
+                sell_qty = min(txn_qty, self.quantity)
+
+                sell_proceeds = sell_qty * txn_price * txn_rate
+                sell_cost = sell_qty * avg_cost_krw
+                self.realized_gain += sell_proceeds - sell_cost
+
+                self.total_cost -= sell_qty * avg_cost
+                self.total_cost_krw -= sell_qty * avg_cost_krw
+                self.quantity -= sell_qty
+
+    def store(self, holding: Holding, last_txn: Transaction) -> None:
+        avg_cost = float(self.total_cost / self.quantity)
+        avg_cost_krw = float(self.total_cost_krw / self.quantity)
+        holding.quantity = float(self.quantity)
+        holding.average_cost = avg_cost
+        holding.average_exchange_rate = avg_cost_krw / avg_cost if avg_cost > 0 else 1.0
+        holding.total_invested = float(self.total_cost_krw)
+        holding.realized_gain = float(self.realized_gain)
+        holding.total_cost = float(self.total_cost)
+        holding.last_transaction_date = last_txn.transaction_date
+        holding.last_transaction_id = last_txn.id
 
 
 class HoldingService:
+    async def _get_holding(self, db: AsyncSession, user_id: int, stock_id: int) -> Holding | None:
+        """
+        (사용자, 종목) 단위 트랜잭션 잠금을 건 뒤 보유 상태를 읽는다. 동시에 들어온 거래 반영이
+        같은 상태에서 출발해 한쪽 거래가 유실되지 않도록 커밋/롤백까지 직렬화한다.
+        보유 행이 아직 없는 첫 매수도 막아야 하므로 행 잠금 대신 advisory lock을 쓴다.
+        """
+        await db.execute(select(func.pg_advisory_xact_lock(user_id, stock_id)))
+        stmt = (
+            select(Holding)
+            .where(Holding.user_id == user_id, Holding.stock_id == stock_id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
     async def recalculate_holding(
         self, db: AsyncSession, user_id: int, stock_id: int
     ) -> Holding | None:
+        holding = await self._get_holding(db, user_id, stock_id)
+
+        # 재계산에 필요한 컬럼만 조회 (ORM 객체를 만들지 않음)
         stmt = (
-            select(Transaction)
+            select(
+                Transaction.id, Transaction.transaction_type, Transaction.quantity,
+                Transaction.price, Transaction.exchange_rate, Transaction.transaction_date,
+            )
             .where(Transaction.user_id == user_id, Transaction.stock_id == stock_id)
             .order_by(Transaction.transaction_date, Transaction.id)
         )
         result = await db.execute(stmt)
-        transactions = result.scalars().all()
+        transactions = result.all()
+        await rebuild_lot_ledger(db, user_id, stock_id, transactions)
 
         if not transactions:
-            holding_stmt = select(Holding).where(
-                Holding.user_id == user_id, Holding.stock_id == stock_id
-            )
-            holding_result = await db.execute(holding_stmt)
-            existing = holding_result.scalar_one_or_none()
-            if existing:
-                await db.delete(existing)
+            if holding:
+                await db.delete(holding)
             return None
 
-        quantity = Decimal("0")
-        total_cost = Decimal("0")
-        total_cost_krw = Decimal("0")
-        total_dividends = Decimal("0")
-        realized_gain = Decimal("0")
-
-        # 배당금 조회 및 합산
-        dividend_stmt = select(Dividend).where(
+        # 배당금 합산
+        dividend_stmt = select(func.coalesce(func.sum(Dividend.amount), 0)).where(
             Dividend.user_id == user_id, Dividend.stock_id == stock_id
         )
-        dividend_result = await db.execute(dividend_stmt)
-        dividends = dividend_result.scalars().all()
-        
-        for div in dividends:
-            total_dividends += Decimal(str(div.amount))
+        total_dividends = Decimal(str((await db.execute(dividend_stmt)).scalar()))
 
+        state = _PositionState()
         for txn in transactions:
-            txn_qty = Decimal(str(txn.quantity))
-            txn_price = Decimal(str(txn.price))
-            txn_rate = Decimal(str(txn.exchange_rate))
-
-            if txn.transaction_type == TransactionType.BUY:
-                total_cost += txn_qty * txn_price
-                total_cost_krw += txn_qty * txn_price * txn_rate
-                quantity += txn_qty
-
-            elif txn.transaction_type == TransactionType.SELL:
-                if quantity > 0:
-                    avg_cost = total_cost / quantity
-                    avg_cost_krw = total_cost_krw / quantity
-                    sell_qty = min(txn_qty, quantity)
-                    
-                    sell_proceeds = sell_qty * txn_price * txn_rate
-                    sell_cost = sell_qty * avg_cost_krw
-                    realized_gain += sell_proceeds - sell_cost
-                    
-                    total_cost -= sell_qty * avg_cost
-                    total_cost_krw -= sell_qty * avg_cost_krw
-                    quantity -= sell_qty
-
-        holding_stmt = select(Holding).where(
-            Holding.user_id == user_id, Holding.stock_id == stock_id
-        )
-        holding_result = await db.execute(holding_stmt)
-        holding = holding_result.scalar_one_or_none()
+            state.apply(txn)
 
-        if quantity <= 0:
+        if state.quantity <= 0:
             if holding:
                 await db.delete(holding)
             return None
 
-        avg_cost = float(total_cost / quantity)
-        avg_cost_krw = float(total_cost_krw / quantity)
-        avg_exchange_rate = avg_cost_krw / avg_cost if avg_cost > 0 else 1.0
-
-        if holding:
-            holding.quantity = float(quantity)
-            holding.average_cost = avg_cost
-            holding.average_exchange_rate = avg_exchange_rate
-            holding.total_invested = float(total_cost_krw)
-            holding.total_dividends = float(total_dividends)
-            holding.realized_gain = float(realized_gain)
-        else:
-            holding = Holding(
-                user_id=user_id,
-                stock_id=stock_id,
-                quantity=float(quantity),
-                average_cost=avg_cost,
-                average_exchange_rate=avg_exchange_rate,
-                total_invested=float(total_cost_krw),
-                total_dividends=float(total_dividends),
-                realized_gain=float(realized_gain),
-            )
+        if not holding:
+            holding = Holding(user_id=user_id, stock_id=stock_id)
             db.add(holding)
+        state.store(holding, transactions[-1])
+        holding.total_dividends = float(total_dividends)
+        return holding
 
+    async def apply_transaction(self, db: AsyncSession, txn: Transaction) -> Holding | None:
+        """
+        새 거래 반영. 마지막으로 반영한 거래보다 뒤(거래일, ID 순)에 오는 거래면 저장된 상태에서
+        바로 갱신하고(O(1)), 과거 일자로 끼워 넣는 경우나 상태가 없으면 전체 재계산한다.
+        """
+        holding = await self._get_holding(db, txn.user_id, txn.stock_id)
+        if (
+            holding is None
+            or holding.last_transaction_id is None
+            or holding.total_cost is None
+            or (txn.transaction_date, txn.id) <= (holding.last_transaction_date, holding.last_transaction_id)
+        ):
+            return await self.recalculate_holding(db, txn.user_id, txn.stock_id)
+
+        await append_to_lot_ledger(db, txn)
+        state = _PositionState.from_holding(holding)
+        state.apply(txn)
+        if state.quantity <= 0:
+            await db.delete(holding)
+            return None
+        state.store(holding, txn)
         return holding
 
     async def get_holdings_with_metrics(
         self, db: AsyncSession, user_id: int, exchange_rate: float | None = None
-    ) -> list[dict]:
+    ) -> list[HoldingMetrics]:
         if exchange_rate is None:
             exchange_rate = await yfinance_client.get_exchange_rate()
 
@@ -121,65 +250,7 @@ class HoldingService:
             .where(Holding.user_id == user_id)
         )
         result = await db.execute(stmt)
-        holdings = result.scalars().all()
-
-        total_value_krw = Decimal("0")
-        holdings_data = []
-
-        for h in holdings:
-            if not h.stock:
-                continue
-            
-            current_price = h.stock.current_price or h.average_cost
-            current_value = Decimal(str(h.quantity)) * Decimal(str(current_price))
-            
-            if h.stock.market_type == MarketType.US:
-                current_value_krw = current_value * Decimal(str(exchange_rate))
-            else:
-                current_value_krw = current_value
-            
-            total_value_krw += current_value_krw
-            
-            holdings_data.append({
-                "holding": h,
-                "current_value": float(current_value),
-                "current_value_krw": float(current_value_krw),
-            })
-
-        result_list = []
-        for data in holdings_data:
-            h = data["holding"]
-            unrealized_gain = data["current_value_krw"] - float(h.total_invested)
-            unrealized_gain_pct = (
-                (unrealized_gain / float(h.total_invested) * 100)
-                if float(h.total_invested) > 0 else 0.0
-            )
-            weight = (
-                (Decimal(str(data["current_value_krw"])) / total_value_krw * 100)
-                if total_value_krw > 0 else Decimal("0")
-            )
-
-            result_list.append({
-                "id": h.id,
-                "user_id": h.user_id,
-                "stock_id": h.stock_id,
-                "quantity": h.quantity,
-                "average_cost": h.average_cost,
-                "average_exchange_rate": h.average_exchange_rate,
-                "total_invested": h.total_invested,
-                "total_dividends": h.total_dividends,
-                "realized_gain": h.realized_gain,
-                "created_at": h.created_at,
-                "updated_at": h.updated_at,
-                "stock": h.stock,
-                "current_value": data["current_value"],
-                "current_value_krw": data["current_value_krw"],
-                "unrealized_gain": float(unrealized_gain),
-                "unrealized_gain_percent": float(unrealized_gain_pct),
-                "weight_percent": float(weight),
-            })
-
-        return result_list
+        return compute_holding_metrics(result.scalars().all(), exchange_rate)
 
 
 holding_service = HoldingService()
@@ -1,19 +1,163 @@
 import asyncio
+import heapq
+import json
+import logging
+import os
 from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
 
+from app.core.config import settings
+from app.core.loop_local import LoopLocal
+
+logger = logging.getLogger(__name__)
+
 KRX_STOCK_LIST: list[dict[str, str]] = []
 _last_updated: datetime | None = None
-_lock = asyncio.Lock()
+_lock: LoopLocal[asyncio.Lock] = LoopLocal(asyncio.Lock)
+
+# 워커가 새로 뜰 때 KRX를 다시 호출하지 않도록 마지막 목록을 파일로 보관
+SNAPSHOT_FILE = settings.cache_dir / "krx_master_snapshot.json"
+REFRESH_INTERVAL = timedelta(hours=24)
+
+# 한글 음절 초성 (유니코드 가(0xAC00)부터 초성마다 588자씩)
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = set(_CHOSEONG)
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 문자는 그대로 (소문자, 공백 제거)"""
+    chars = []
+    for ch in _normalize(text):
+        code = ord(ch) - 0xAC00
+        chars.append(_CHOSEONG[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(chars)
+
+
+def _ngrams(text: str) -> set[str]:
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _NgramIndex:
+    """문자열 목록에 대한 바이그램(1글자는 유니그램) 역색인 + 접두어 정렬"""
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        postings: dict[str, set[int]] = {}
+        for i, text in enumerate(texts):
+            for gram in _ngrams(text) | set(text):
+                postings.setdefault(gram, set()).add(i)
+        self._postings = postings
+
+    def search(self, query: str, limit: int) -> list[int]:
+        if len(query) == 1:
+            candidates = self._postings.get(query, set())
+        else:
+            lists = sorted((self._postings.get(g, set()) for g in _ngrams(query)), key=len)
+            if not lists[0]:
+                return []
+            candidates = lists[0].intersection(*lists[1:])
+            # 바이그램이 모두 있어도 순서가 다를 수 있으므로 부분 문자열로 최종 확인
+            candidates = [i for i in candidates if query in self.texts[i]]
+        # 완전 일치 > 접두어 > 부분 일치, 같은 순위는 원래 목록 순서
+        return heapq.nsmallest(
+            limit,
+            candidates,
+            key=lambda i: (
+                0 if self.texts[i] == query else 1 if self.texts[i].startswith(query) else 2,
+                i,
+            ),
+        )
+
+
+class StockNameIndex:
+    """KRX 종목명 검색 색인 (목록이 갱신될 때마다 새로 생성)"""
+
+    def __init__(self, stocks: list[dict[str, str]]):
+        self.stocks = stocks
+        self._by_code = {s["code"]: i for i, s in enumerate(stocks)}
+        self._names = _NgramIndex([_normalize(s["name"]) for s in stocks])
+        self._choseong = _NgramIndex([to_choseong(s["name"]) for s in stocks])
+
+    def search(self, keyword: str, limit: int = 10) -> list[dict[str, str]]:
+        query = _normalize(keyword)
+        if not query:
+            return []
+
+        ids: list[int] = []
+        if keyword.strip() in self._by_code:
+            ids.append(self._by_code[keyword.strip()])
+        if all(ch in _CHOSEONG_SET for ch in query):
+            ids.extend(self._choseong.search(query, limit))
+        else:
+            ids.extend(self._names.search(query, limit))
+
+        results = []
+        seen = set()
+        for i in ids:
+            if i in seen:
+                continue
+            seen.add(i)
+            results.append(self.stocks[i])
+            if len(results) >= limit:
+                break
+        return results
+
+
+_index: StockNameIndex | None = None
+
+
+def _get_index(stocks: list[dict[str, str]]) -> StockNameIndex:
+    global _index
+    if _index is None or _index.stocks is not stocks:
+        _index = StockNameIndex(stocks)
+    return _index
+
+
+def _load_snapshot() -> tuple[list[dict[str, str]], datetime] | None:
+    if not os.path.exists(SNAPSHOT_FILE):
+        return None
+    try:
+        with open(SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        stocks = data.get("stocks") or []
+        if not stocks:
+            return None
+        return stocks, datetime.fromisoformat(data["updated_at"])
+    except Exception as e:
+        logger.warning(f"Failed to load KRX master snapshot: {e}")
+        return None
+
+
+def _save_snapshot(stocks: list[dict[str, str]], updated_at: datetime) -> None:
+    # 다른 워커가 읽는 도중 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{SNAPSHOT_FILE}.{os.getpid()}.tmp"
+    try:
+        SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": updated_at.isoformat(), "stocks": stocks}, f, ensure_ascii=False)
+        os.replace(tmp_path, SNAPSHOT_FILE)
+    except Exception as e:
+        logger.warning(f"Failed to save KRX master snapshot: {e}")
 
 
 async def fetch_krx_stock_list() -> list[dict[str, str]]:
     global KRX_STOCK_LIST, _last_updated
 
-    async with _lock:
-        if _last_updated and datetime.now() - _last_updated < timedelta(hours=24):
+    async with _lock.get():
+        if not KRX_STOCK_LIST:
+            snapshot = _load_snapshot()
+            if snapshot:
+                KRX_STOCK_LIST, _last_updated = snapshot
+
+        if _last_updated and datetime.now() - _last_updated < REFRESH_INTERVAL:
             return KRX_STOCK_LIST
 
         try:
@@ -46,12 +190,13 @@ async def fetch_krx_stock_list() -> list[dict[str, str]]:
                     if item.get("ISU_SRT_CD") and item.get("ISU_ABBRV")
                 ]
                 _last_updated = datetime.now()
+                _save_snapshot(KRX_STOCK_LIST, _last_updated)
                 return KRX_STOCK_LIST
 
         except Exception:
             if KRX_STOCK_LIST:
                 return KRX_STOCK_LIST
-            return _get_fallback_stocks()
+            return _FALLBACK_STOCKS
 
 
 def _get_fallback_stocks() -> list[dict[str, str]]:
@@ -109,22 +254,12 @@ def _get_fallback_stocks() -> list[dict[str, str]]:
     ]
 
 
+_FALLBACK_STOCKS = _get_fallback_stocks()
+
+
 async def search_by_name(keyword: str, limit: int = 10) -> list[dict[str, Any]]:
     stocks = await fetch_krx_stock_list()
-    keyword_lower = keyword.lower()
-
-    results = []
-    for stock in stocks:
-        name = stock["name"]
-        code = stock["code"]
-
-        if keyword in name or keyword_lower in name.lower() or keyword == code:
-            results.append({
-                "code": code,
-                "name": name,
-                "market": stock["market"],
-            })
-            if len(results) >= limit:
-                break
-
-    return results
+    return [
+        {"code": stock["code"], "name": stock["name"], "market": stock["market"]}
+        for stock in _get_index(stocks).search(keyword, limit)
+    ]
@@ -0,0 +1,139 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pubsub import PRICE_CHANNEL, Broadcaster
+from app.external.yfinance_client import yfinance_client
+from app.models.daily_performance import DailyPerformance
+from app.models.holding import Holding
+from app.models.stock import MarketType, Stock
+
+
+@dataclass(slots=True)
+class _Position:
+    quantity: float
+    price: float
+
+
+class LiveValuation:
+    """
+    한 사용자의 보유 수량/시세/환율을 메모리에 두고, 시세·환율 이벤트가 올 때 바뀐 종목만 반영해
+    평가금액과 일간 손익을 갱신한다 (보유 종목 전체 재계산 없음).
+    """
+
+    def __init__(
+        self,
+        positions: dict[tuple[str, str], _Position],
+        exchange_rate: float,
+        total_invested: float,
+        baseline_value: float | None,
+    ):
+        self.positions = positions
+        self.exchange_rate = exchange_rate
+        self.total_invested = total_invested
+        self.baseline_value = baseline_value
+        self.kr_value = sum(
+            p.quantity * p.price for (market, _), p in positions.items() if market == MarketType.KR.value
+        )
+        self.us_value_usd = sum(
+            p.quantity * p.price for (market, _), p in positions.items() if market == MarketType.US.value
+        )
+        self._last_sent_value = self.total_value_krw
+
+    @classmethod
+    async def load(cls, db: AsyncSession, user_id: int, exchange_rate: float) -> "LiveValuation":
+        stmt = (
+            select(Stock.market_type, Stock.ticker, Holding.quantity, Stock.current_price,
+                   Holding.average_cost, Holding.total_invested)
+            .join(Stock, Holding.stock_id == Stock.id)
+            .where(Holding.user_id == user_id)
+        )
+        positions: dict[tuple[str, str], _Position] = {}
+        total_invested = 0.0
+        for market, ticker, quantity, current_price, average_cost, invested in await db.execute(stmt):
+            positions[(market.value, ticker)] = _Position(
+                float(quantity), float(current_price or average_cost)
+            )
+            total_invested += float(invested)
+
+        # /dashboard/summary와 같이 전일 평가금액을 일간 손익 기준으로 사용
+        yesterday = date.today() - timedelta(days=1)
+        baseline = (await db.execute(
+            select(DailyPerformance.total_value_krw).where(
+                DailyPerformance.user_id == user_id,
+                DailyPerformance.record_date == yesterday,
+            )
+        )).scalar_one_or_none()
+        return cls(positions, exchange_rate, total_invested, float(baseline) if baseline is not None else None)
+
+    @property
+    def total_value_krw(self) -> float:
+        return self.kr_value + self.us_value_usd * self.exchange_rate
+
+    def snapshot(self) -> dict[str, Any]:
+        total_value = self.total_value_krw
+        unrealized = total_value - self.total_invested
+        if self.baseline_value is not None:
+            daily_pnl = total_value - self.baseline_value
+            daily_pnl_pct = daily_pnl / self.baseline_value * 100 if self.baseline_value > 0 else 0.0
+        else:
+            daily_pnl = total_value - self.total_invested
+            daily_pnl_pct = 0.0
+        return {
+            "total_value_krw": total_value,
+            "total_invested_krw": self.total_invested,
+            "total_unrealized_gain": unrealized,
+            "total_unrealized_gain_percent": (
+                unrealized / self.total_invested * 100 if self.total_invested > 0 else 0.0
+            ),
+            "daily_pnl": daily_pnl,
+            "daily_pnl_percent": daily_pnl_pct,
+            "exchange_rate": self.exchange_rate,
+        }
+
+    def apply(self, event: dict[str, Any]) -> dict[str, Any] | None:
+        """이벤트를 반영하고 평가금액이 바뀌었으면 클라이언트로 보낼 변경분을 반환"""
+        changed: dict[str, float] = {}
+        if event.get("type") == "prices":
+            market = event["market"]
+            for ticker, price in event["prices"].items():
+                position = self.positions.get((market, ticker))
+                if position is None or price is None or position.price == price:
+                    continue
+                delta = position.quantity * (price - position.price)
+                if market == MarketType.KR.value:
+                    self.kr_value += delta
+                else:
+                    self.us_value_usd += delta
+                position.price = price
+                changed[ticker] = price
+            if not changed:
+                return None
+        elif event.get("type") == "fx":
+            if event["rate"] == self.exchange_rate or not self.us_value_usd:
+                self.exchange_rate = event["rate"]
+                return None
+            self.exchange_rate = event["rate"]
+        else:
+            return None
+
+        payload = self.snapshot()
+        payload["value_change"] = payload["total_value_krw"] - self._last_sent_value
+        payload["changed_prices"] = changed
+        self._last_sent_value = payload["total_value_krw"]
+        return payload
+
+
+async def _refresh_exchange_rate() -> None:
+    """접속자가 있는 동안 환율을 주기적으로 조회 (캐시가 만료돼 실제로 조회될 때 fx 이벤트가 발행됨)"""
+    while True:
+        await asyncio.sleep(settings.exchange_rate_cache_ttl_seconds)
+        await yfinance_client.get_exchange_rate()
+
+
+price_broadcaster = Broadcaster(PRICE_CHANNEL, pollers=[_refresh_exchange_rate])
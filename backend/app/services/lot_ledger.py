@@ -0,0 +1,120 @@
+from collections import deque
+from collections.abc import Sequence
+from decimal import Decimal
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import copy_records
+from app.models.lot_ledger import OpenLot, RealizedGain
+from app.models.transaction import Transaction, TransactionType
+
+
+class _Lot:
+    __slots__ = ("buy_transaction_id", "acquired_date", "remaining_quantity", "price", "exchange_rate")
+
+    def __init__(self, buy_transaction_id, acquired_date, remaining_quantity, price, exchange_rate):
+        self.buy_transaction_id = buy_transaction_id
+        self.acquired_date = acquired_date
+        self.remaining_quantity = remaining_quantity
+        self.price = price
+        self.exchange_rate = exchange_rate
+
+    @classmethod
+    def from_buy(cls, txn: Transaction) -> "_Lot":
+        return cls(
+            txn.id, txn.transaction_date, Decimal(str(txn.quantity)),
+            Decimal(str(txn.price)), Decimal(str(txn.exchange_rate)),
+        )
+
+
+def match_sell(lots: deque[_Lot], txn: Transaction) -> tuple[Decimal, Decimal, list[_Lot]]:
+    """
+    매도 수량을 가장 오래된 lot부터 소진(FIFO)하고 (매칭 원가, 실현 손익, 수량이 바뀐 lot)을 반환.
+    보유보다 많이 판 경우 매칭되지 않은 수량은 원가 0으로 본다.
+    """
+    sell_qty = Decimal(str(txn.quantity))
+    remaining = sell_qty
+    cost_basis = Decimal("0")
+    touched: list[_Lot] = []
+
+    while remaining > 0 and lots:
+        lot = lots[0]
+        take = min(remaining, lot.remaining_quantity)
+        cost_basis += take * lot.price * lot.exchange_rate
+        lot.remaining_quantity -= take
+        remaining -= take
+        touched.append(lot)
+        if lot.remaining_quantity <= 0:
+            lots.popleft()
+
+    proceeds = sell_qty * Decimal(str(txn.price)) * Decimal(str(txn.exchange_rate))
+    return cost_basis, proceeds - cost_basis, touched
+
+
+_LOT_COLUMNS = ("buy_transaction_id", "user_id", "stock_id", "acquired_date", "remaining_quantity", "price", "exchange_rate")
+_GAIN_COLUMNS = ("sell_transaction_id", "user_id", "stock_id", "cost_basis_krw", "realized_gain")
+
+
+def _lot_record(user_id: int, stock_id: int, lot: _Lot) -> tuple:
+    return (
+        lot.buy_transaction_id, user_id, stock_id, lot.acquired_date,
+        lot.remaining_quantity, lot.price, lot.exchange_rate,
+    )
+
+
+async def rebuild_lot_ledger(
+    db: AsyncSession, user_id: int, stock_id: int, transactions: Sequence[Transaction]
+) -> None:
+    """(거래일, ID) 순으로 정렬된 한 종목의 전체 거래로 미청산 lot과 매도별 실현 손익을 다시 만든다"""
+    lots: deque[_Lot] = deque()
+    gains = []
+    for txn in transactions:
+        if txn.transaction_type == TransactionType.BUY:
+            lots.append(_Lot.from_buy(txn))
+        elif txn.transaction_type == TransactionType.SELL:
+            cost_basis, gain, _ = match_sell(lots, txn)
+            gains.append((txn.id, user_id, stock_id, cost_basis, gain))
+
+    for model in (OpenLot, RealizedGain):
+        await db.execute(delete(model).where(model.user_id == user_id, model.stock_id == stock_id))
+    await copy_records(db, OpenLot, _LOT_COLUMNS, [_lot_record(user_id, stock_id, lot) for lot in lots])
+    await copy_records(db, RealizedGain, _GAIN_COLUMNS, gains)
+
+
+async def append_to_lot_ledger(db: AsyncSession, txn: Transaction) -> None:
+    """마지막 거래보다 뒤에 오는 새 거래 하나를 반영 (매수는 lot 추가, 매도는 남은 lot만 읽어 FIFO 매칭)"""
+    if txn.transaction_type == TransactionType.BUY:
+        lot = _Lot.from_buy(txn)
+        db.add(OpenLot(**dict(zip(_LOT_COLUMNS, _lot_record(txn.user_id, txn.stock_id, lot)))))
+        return
+    if txn.transaction_type != TransactionType.SELL:
+        return
+
+    # 호출자(holding_service)가 (사용자, 종목) advisory lock을 먼저 잡지만,
+    # 다른 경로에서 불려도 소진할 lot을 동시에 읽지 않도록 행 잠금도 건다
+    stmt = (
+        select(OpenLot)
+        .where(OpenLot.user_id == txn.user_id, OpenLot.stock_id == txn.stock_id)
+        .order_by(OpenLot.acquired_date, OpenLot.buy_transaction_id)
+        .with_for_update()
+    )
+    rows = (await db.execute(stmt)).scalars().all()
+    by_id = {row.buy_transaction_id: row for row in rows}
+    lots = deque(
+        _Lot(row.buy_transaction_id, row.acquired_date, Decimal(str(row.remaining_quantity)),
+             Decimal(str(row.price)), Decimal(str(row.exchange_rate)))
+        for row in rows
+    )
+
+    cost_basis, gain, touched = match_sell(lots, txn)
+    for lot in touched:
+        row = by_id[lot.buy_transaction_id]
+        if lot.remaining_quantity <= 0:
+            await db.delete(row)
+        else:
+            row.remaining_quantity = lot.remaining_quantity
+    db.add(RealizedGain(
+        sell_transaction_id=txn.id, user_id=txn.user_id, stock_id=txn.stock_id,
+        cost_basis_krw=cost_basis, realized_gain=gain,
+    ))
@@ -0,0 +1,30 @@
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_upsert
+from app.models.market_data import MarketDataHistory
+
+OHLCV_COLUMNS = (
+    "stock_id",
+    "record_date",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+)
+
+
+async def upsert_market_data(db: AsyncSession, rows: Iterable[dict[str, Any]]) -> int:
+    # 같은 (stock_id, record_date)가 한 문장에 두 번 들어가면 ON CONFLICT가 실패하므로 마지막 값만 유지
+    deduped: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        deduped[(row["stock_id"], row["record_date"])] = {
+            column: row.get(column) for column in OHLCV_COLUMNS
+        }
+
+    return await bulk_upsert(
+        db, MarketDataHistory, list(deduped.values()), constraint="uq_stock_date"
+    )
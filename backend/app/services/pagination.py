@@ -0,0 +1,84 @@
+import base64
+import json
+import logging
+from datetime import date
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, extract, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.response_cache import get_user_version
+
+logger = logging.getLogger(__name__)
+
+YEAR_FACETS_KEY = "stockflow:facets:{user_id}:{scope}"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_date: date, row_id: int) -> str:
+    """목록의 마지막 행 (날짜, ID)로 다음 페이지 커서 생성"""
+    return base64.urlsafe_b64encode(f"{sort_date.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_date, row_id = raw.split("|")
+        return date.fromisoformat(sort_date), int(row_id)
+    except ValueError as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def before_cursor(date_column: Any, id_column: Any, cursor: str) -> ColumnElement[bool]:
+    """(날짜, ID) 내림차순 목록에서 커서 다음 행들 (행 비교라 복합 인덱스를 그대로 탄다)"""
+    sort_date, row_id = decode_cursor(cursor)
+    return tuple_(date_column, id_column) < tuple_(sort_date, row_id)
+
+
+def in_year(date_column: Any, year: int) -> ColumnElement[bool]:
+    """extract('year')와 달리 인덱스를 쓸 수 있는 날짜 범위 조건"""
+    return and_(date_column >= date(year, 1, 1), date_column < date(year + 1, 1, 1))
+
+
+async def get_year_counts(
+    db: AsyncSession,
+    user_id: int,
+    scope: str,
+    date_column: Any,
+    filters: list[ColumnElement[bool]],
+) -> dict[int, int]:
+    """
+    연도별 건수 (연도 필터 목록과 전체 건수 계산용). 사용자 버전과 함께 Redis에 저장해
+    거래/배당이 바뀌어 사용자 버전이 올라가기 전까지 재사용한다.
+    """
+    key = YEAR_FACETS_KEY.format(user_id=user_id, scope=scope)
+    version = None
+    try:
+        version = await get_user_version(user_id)
+        cached = await get_redis().get(key)
+        if cached:
+            entry = json.loads(cached)
+            if entry["version"] == version:
+                return {int(year): count for year, count in entry["counts"].items()}
+    except Exception as e:
+        logger.debug(f"year facet cache unavailable: {e}")
+
+    year = extract("year", date_column)
+    stmt = select(year, func.count()).where(*filters).group_by(year)
+    counts = {int(y): count for y, count in await db.execute(stmt)}
+
+    if version is not None:
+        try:
+            await get_redis().set(
+                key,
+                json.dumps({"version": version, "counts": counts}),
+                ex=settings.year_facet_cache_ttl_seconds,
+            )
+        except Exception as e:
+            logger.debug(f"year facet cache write failed: {e}")
+    return counts
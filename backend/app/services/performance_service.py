@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_upsert
+from app.models.daily_performance import DailyPerformance
+from app.models.dividend import Dividend
+from app.models.stock import MarketType, Stock
+from app.models.transaction import Transaction, TransactionType
+from app.services.fx_service import get_fx_series
+from app.services.price_series import PriceSeries, date_range
+from app.services.replay_engine import (
+    AMOUNT_DECIMALS,
+    close_matrix,
+    cumulative_series,
+    portfolio_values,
+    position_matrix,
+)
+
+_QUANTITY_SIGN = {TransactionType.BUY: 1.0, TransactionType.SELL: -1.0}
+
+
+def _invested_delta(tx: Transaction) -> float:
+    amount_krw = float(tx.quantity) * float(tx.price) * float(tx.exchange_rate)
+    if tx.transaction_type == TransactionType.BUY:
+        return amount_krw + float(tx.fees)
+    if tx.transaction_type == TransactionType.SELL:
+        return -(amount_krw - float(tx.fees))
+    return 0.0
+
+
+async def rebuild_daily_performance(
+    db: AsyncSession,
+    user_id: int,
+    since: date | None = None,
+    until: date | None = None,
+) -> int:
+    """
+    거래/배당 내역으로 daily_performances를 재계산한다.
+
+    since가 주어지면 그 전날까지 저장된 마지막 성과 행 다음 날부터 이어서 다시 계산해 UPSERT한다
+    (투자원금/누적 배당 시작값은 원장에서 합산). 이어갈 행이 없으면 전체 재계산한다.
+    """
+    last_date = until or date.today()
+
+    stmt = (
+        select(
+            Transaction.stock_id, Transaction.transaction_type, Transaction.quantity,
+            Transaction.price, Transaction.exchange_rate, Transaction.fees, Transaction.transaction_date,
+        )
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date, Transaction.id)
+    )
+    transactions = (await db.execute(stmt)).all()
+
+    if not transactions:
+        delete_stmt = delete(DailyPerformance).where(DailyPerformance.user_id == user_id)
+        if since:
+            delete_stmt = delete_stmt.where(DailyPerformance.record_date >= since)
+        await db.execute(delete_stmt)
+        return 0
+
+    first_date = transactions[0].transaction_date
+    start_date = first_date
+    total_invested = 0.0
+    total_dividends = 0.0
+    prev_value: float | None = None
+
+    if since and since > first_date:
+        resume_stmt = (
+            select(DailyPerformance)
+            .where(
+                DailyPerformance.user_id == user_id,
+                DailyPerformance.record_date < since,
+            )
+            .order_by(DailyPerformance.record_date.desc())
+            .limit(1)
+        )
+        resume = (await db.execute(resume_stmt)).scalar_one_or_none()
+        if resume:
+            # 이전 행은 일별 스냅샷(snapshot_service)이 다른 정의(잔여 원가, 세전 배당)로 썼을 수 있으므로
+            # 평가금액만 이어받고 투자원금/누적 배당은 거래·배당 원장에서 다시 합산한다
+            start_date = resume.record_date + timedelta(days=1)
+            prev_value = float(resume.total_value_krw)
+            total_invested = sum(
+                _invested_delta(tx) for tx in transactions if tx.transaction_date < start_date
+            )
+            dividend_sum_stmt = select(func.coalesce(func.sum(Dividend.amount - Dividend.tax), 0)).where(
+                Dividend.user_id == user_id, Dividend.dividend_date < start_date
+            )
+            total_dividends = float((await db.execute(dividend_sum_stmt)).scalar_one())
+
+    stock_ids = sorted({tx.stock_id for tx in transactions})
+    stock_stmt = select(Stock.id, Stock.market_type).where(Stock.id.in_(stock_ids))
+    market_types = dict((await db.execute(stock_stmt)).all())
+    stock_ids = [stock_id for stock_id in stock_ids if stock_id in market_types]
+
+    dividend_stmt = select(Dividend.dividend_date, Dividend.amount, Dividend.tax).where(
+        Dividend.user_id == user_id, Dividend.dividend_date >= start_date
+    )
+    dividends = (await db.execute(dividend_stmt)).all()
+
+    prices = await PriceSeries.load(db, stock_ids, start_date, last_date)
+
+    dates = date_range(start_date, last_date)
+    trades = [
+        tx for tx in transactions
+        if tx.stock_id in market_types and tx.transaction_type in _QUANTITY_SIGN
+    ]
+    # 보유 수량은 저장돼 있지 않으므로 재개 시점 이전 거래까지 포함해 행렬의 첫 행에 합산
+    positions = position_matrix(
+        dates,
+        stock_ids,
+        [tx.transaction_date for tx in trades],
+        [tx.stock_id for tx in trades],
+        [_QUANTITY_SIGN[tx.transaction_type] * float(tx.quantity) for tx in trades],
+    )
+    new_trades = [tx for tx in transactions if tx.transaction_date >= start_date]
+    invested = cumulative_series(
+        dates,
+        [tx.transaction_date for tx in new_trades],
+        [_invested_delta(tx) for tx in new_trades],
+        initial=total_invested,
+    )
+    total_dividends = cumulative_series(
+        dates,
+        [d.dividend_date for d in dividends],
+        [float(d.amount) - float(d.tax) for d in dividends],
+        initial=total_dividends,
+    )
+
+    closes = close_matrix(prices, dates, stock_ids)
+    is_kr = np.array([market_types[s] == MarketType.KR for s in stock_ids], dtype=bool)
+    fx = (await get_fx_series(db)).rates_for(dates)
+    kr_value, us_value_usd, us_value_krw, total_value = (
+        np.round(series, AMOUNT_DECIMALS)
+        for series in portfolio_values(positions, closes, is_kr, fx)
+    )
+
+    # 평가금액/투자원금이 모두 0인 날은 저장하지 않음 (일일 손익도 저장된 행끼리 비교)
+    keep = np.flatnonzero((total_value > 0) | (invested > 0))
+    kept_value = total_value[keep]
+    previous = np.r_[np.nan if prev_value is None else prev_value, kept_value[:-1]]
+    daily_pnl = np.where(np.isnan(previous), 0.0, kept_value - previous)
+    daily_pnl_pct = np.divide(
+        daily_pnl * 100, previous, out=np.zeros_like(daily_pnl), where=previous > 0
+    )
+    cumulative_return = kept_value + total_dividends[keep] - invested[keep]
+    cumulative_return_pct = np.divide(
+        cumulative_return * 100,
+        invested[keep],
+        out=np.zeros_like(cumulative_return),
+        where=invested[keep] > 0,
+    )
+
+    columns = {
+        "total_value_krw": kept_value,
+        "total_invested_krw": invested[keep],
+        "kr_value": kr_value[keep],
+        "us_value_usd": us_value_usd[keep],
+        "us_value_krw": us_value_krw[keep],
+        "exchange_rate": fx[keep],
+        "daily_pnl": daily_pnl,
+        "daily_pnl_percent": daily_pnl_pct,
+        "cumulative_return": cumulative_return,
+        "cumulative_return_percent": cumulative_return_pct,
+        "total_dividends": total_dividends[keep],
+    }
+    names = list(columns)
+    rows = [
+        {"user_id": user_id, "record_date": dates[i], **dict(zip(names, values))}
+        for i, *values in zip(keep.tolist(), *(columns[n].tolist() for n in names))
+    ]
+
+    # 재계산 구간의 기존 행을 지운 뒤 저장해 더 이상 값이 없는 날짜가 남지 않게 한다
+    await db.execute(
+        delete(DailyPerformance).where(
+            DailyPerformance.user_id == user_id,
+            DailyPerformance.record_date >= start_date,
+            DailyPerformance.record_date <= last_date,
+        )
+    )
+    return await bulk_upsert(db, DailyPerformance, rows, constraint="uq_user_date")
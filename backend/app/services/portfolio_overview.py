@@ -0,0 +1,224 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.daily_performance import DailyPerformance
+from app.models.stock import MarketType
+from app.services.holding_service import HoldingMetrics
+
+CONCENTRATION_THRESHOLD = 20.0
+
+# /dashboard/overview에서 선택할 수 있는 섹션
+OVERVIEW_FIELDS = ("summary", "market_breakdown", "sectors", "risk")
+
+
+async def get_previous_day_value(db: AsyncSession, user_id: int) -> float | None:
+    yesterday = date.today() - timedelta(days=1)
+    stmt = select(DailyPerformance.total_value_krw).where(
+        DailyPerformance.user_id == user_id,
+        DailyPerformance.record_date == yesterday,
+    )
+    value = (await db.execute(stmt)).scalar_one_or_none()
+    return float(value) if value is not None else None
+
+
+def build_summary(holdings: list[HoldingMetrics], exchange_rate: float, previous_value: float | None) -> dict:
+    total_value_krw = Decimal("0")
+    total_invested_krw = Decimal("0")
+    total_dividends = Decimal("0")
+
+    for h in holdings:
+        total_value_krw += Decimal(str(h.current_value_krw))
+        total_invested_krw += Decimal(str(h.total_invested))
+        total_dividends += Decimal(str(h.total_dividends))
+
+    total_unrealized_gain = total_value_krw - total_invested_krw
+    total_unrealized_gain_pct = (
+        float(total_unrealized_gain / total_invested_krw * 100)
+        if total_invested_krw > 0 else 0.0
+    )
+
+    daily_pnl = float(total_value_krw) - (previous_value if previous_value is not None else float(total_invested_krw))
+    daily_pnl_pct = (
+        (daily_pnl / previous_value * 100)
+        if previous_value is not None and previous_value > 0
+        else 0.0
+    )
+
+    return {
+        "total_value_krw": float(total_value_krw),
+        "total_invested_krw": float(total_invested_krw),
+        "total_unrealized_gain": float(total_unrealized_gain),
+        "total_unrealized_gain_percent": total_unrealized_gain_pct,
+        "daily_pnl": daily_pnl,
+        "daily_pnl_percent": daily_pnl_pct,
+        "total_dividends": float(total_dividends),
+        "exchange_rate": exchange_rate,
+    }
+
+
+def build_market_breakdown(holdings: list[HoldingMetrics]) -> list[dict]:
+    kr_value = Decimal("0")
+    kr_invested = Decimal("0")
+    us_value_usd = Decimal("0")
+    us_value_krw = Decimal("0")
+    us_invested = Decimal("0")
+    total_value_krw = Decimal("0")
+
+    for h in holdings:
+        stock = h.stock
+        if not stock:
+            continue
+
+        value_krw = Decimal(str(h.current_value_krw))
+        total_value_krw += value_krw
+
+        if stock.market_type == MarketType.KR:
+            kr_value += value_krw
+            kr_invested += Decimal(str(h.total_invested))
+        else:
+            us_value_krw += value_krw
+            us_value_usd += Decimal(str(h.current_value))
+            us_invested += Decimal(str(h.total_invested))
+
+    result = []
+
+    if kr_value > 0:
+        kr_gain = kr_value - kr_invested
+        result.append({
+            "market_type": MarketType.KR,
+            "value_original": float(kr_value),
+            "value_krw": float(kr_value),
+            "weight_percent": float(kr_value / total_value_krw * 100) if total_value_krw > 0 else 0,
+            "unrealized_gain": float(kr_gain),
+            "unrealized_gain_percent": float(kr_gain / kr_invested * 100) if kr_invested > 0 else 0,
+        })
+
+    if us_value_krw > 0:
+        us_gain = us_value_krw - us_invested
+        result.append({
+            "market_type": MarketType.US,
+            "value_original": float(us_value_usd),
+            "value_krw": float(us_value_krw),
+            "weight_percent": float(us_value_krw / total_value_krw * 100) if total_value_krw > 0 else 0,
+            "unrealized_gain": float(us_gain),
+            "unrealized_gain_percent": float(us_gain / us_invested * 100) if us_invested > 0 else 0,
+        })
+
+    return result
+
+
+def build_sector_allocation(holdings: list[HoldingMetrics]) -> list[dict]:
+    sector_values: dict[str, Decimal] = defaultdict(Decimal)
+    sector_stocks: dict[str, list[dict]] = defaultdict(list)
+    total_value = Decimal("0")
+
+    for h in holdings:
+        stock = h.stock
+        if not stock:
+            continue
+
+        sector = stock.sector
+        if not sector or sector == "Unknown":
+            sector = "기타"
+
+        value_krw = Decimal(str(h.current_value_krw))
+        total_value += value_krw
+        sector_values[sector] += value_krw
+        sector_stocks[sector].append({
+            "name": stock.name,
+            "ticker": stock.ticker,
+            "value_krw": float(value_krw),
+        })
+
+    result = []
+    for sector, sector_value in sorted(sector_values.items(), key=lambda x: x[1], reverse=True):
+        stocks_info = [
+            {
+                **s,
+                "weight_percent": float(Decimal(str(s["value_krw"])) / total_value * 100) if total_value > 0 else 0,
+            }
+            for s in sector_stocks[sector]
+        ]
+        stocks_info.sort(key=lambda x: x["value_krw"], reverse=True)
+
+        result.append({
+            "sector": sector,
+            "value_krw": float(sector_value),
+            "weight_percent": float(sector_value / total_value * 100) if total_value > 0 else 0,
+            "stock_count": len(stocks_info),
+            "stocks": stocks_info,
+        })
+
+    return result
+
+
+def build_concentration(holdings: list[HoldingMetrics]) -> dict:
+    warnings = []
+    sorted_holdings = sorted(holdings, key=lambda h: h.weight_percent, reverse=True)
+
+    for h in sorted_holdings:
+        if h.weight_percent >= CONCENTRATION_THRESHOLD:
+            stock = h.stock
+            if stock:
+                warnings.append({
+                    "ticker": stock.ticker,
+                    "name": stock.name,
+                    "weight_percent": h.weight_percent,
+                    "threshold_percent": CONCENTRATION_THRESHOLD,
+                    "message": f"{stock.ticker} is {h.weight_percent:.1f}% of portfolio (threshold: {CONCENTRATION_THRESHOLD}%)",
+                })
+
+    top_5_weight = sum(h.weight_percent for h in sorted_holdings[:5])
+
+    unique_sectors = len(set(h.stock.sector for h in holdings if h.stock and h.stock.sector))
+    total_stocks = len(holdings)
+    diversification_score = min(100, (unique_sectors * 10) + (total_stocks * 5))
+
+    return {
+        "concentration_warnings": warnings,
+        "top_5_weight_percent": top_5_weight,
+        "diversification_score": diversification_score,
+    }
+
+
+async def get_max_drawdown(db: AsyncSession, user_id: int, days: int) -> dict:
+    start_date = date.today() - timedelta(days=days)
+    stmt = (
+        select(DailyPerformance)
+        .where(
+            DailyPerformance.user_id == user_id,
+            DailyPerformance.record_date >= start_date,
+        )
+        .order_by(DailyPerformance.record_date)
+    )
+    result = await db.execute(stmt)
+    performances = list(result.scalars().all())
+
+    max_drawdown = Decimal("0")
+    max_drawdown_start = None
+    max_drawdown_end = None
+    peak_value = Decimal("0")
+    current_drawdown_start = None
+
+    for p in performances:
+        value = Decimal(str(p.total_value_krw))
+        if value >= peak_value:
+            peak_value = value
+            current_drawdown_start = p.record_date
+        else:
+            if peak_value > 0:
+                drawdown = (peak_value - value) / peak_value * 100
+                if drawdown > max_drawdown:
+                    max_drawdown = drawdown
+                    max_drawdown_start = current_drawdown_start
+                    max_drawdown_end = p.record_date
+
+    return {
+        "max_drawdown_percent": float(max_drawdown),
+        "max_drawdown_start": max_drawdown_start,
+        "max_drawdown_end": max_drawdown_end,
+    }
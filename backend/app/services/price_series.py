@@ -0,0 +1,114 @@
+from collections.abc import Iterable, Sequence
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Float, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.market_data import MarketDataHistory
+
+# 주말/연휴를 고려해 최대 10일 전 종가까지 사용 (기존 스크립트의 fallback과 동일)
+DEFAULT_MAX_GAP_DAYS = 10
+
+
+def date_range(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class PriceSeries:
+    """종목별 종가를 정렬된 배열로 보관하고 as-of(해당일 이전 마지막 종가) 조회를 제공"""
+
+    def __init__(
+        self,
+        series: dict[int, tuple[np.ndarray, np.ndarray]],
+        max_gap_days: int | None = DEFAULT_MAX_GAP_DAYS,
+    ):
+        self._series = series
+        self.max_gap_days = max_gap_days
+
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        stock_ids: Iterable[int],
+        start_date: date | None = None,
+        end_date: date | None = None,
+        max_gap_days: int | None = DEFAULT_MAX_GAP_DAYS,
+    ) -> "PriceSeries":
+        stock_ids = list(set(stock_ids))
+        if not stock_ids:
+            return cls({}, max_gap_days)
+
+        stmt = (
+            select(
+                MarketDataHistory.stock_id,
+                MarketDataHistory.record_date,
+                cast(MarketDataHistory.close_price, Float),
+            )
+            .where(MarketDataHistory.stock_id.in_(stock_ids))
+            .order_by(MarketDataHistory.stock_id, MarketDataHistory.record_date)
+        )
+        if start_date and max_gap_days is not None:
+            stmt = stmt.where(
+                MarketDataHistory.record_date >= start_date - timedelta(days=max_gap_days)
+            )
+        if end_date:
+            stmt = stmt.where(MarketDataHistory.record_date <= end_date)
+
+        rows = (await db.execute(stmt)).all()
+        return cls.from_rows(rows, max_gap_days)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[tuple[int, date, float]],
+        max_gap_days: int | None = DEFAULT_MAX_GAP_DAYS,
+    ) -> "PriceSeries":
+        grouped: dict[int, tuple[list[int], list[float]]] = {}
+        for stock_id, record_date, close in rows:
+            ordinals, closes = grouped.setdefault(stock_id, ([], []))
+            ordinals.append(record_date.toordinal())
+            closes.append(close)
+
+        series = {}
+        for stock_id, (ordinals, closes) in grouped.items():
+            ordinal_array = np.asarray(ordinals, dtype=np.int64)
+            close_array = np.asarray(closes, dtype=np.float64)
+            order = np.argsort(ordinal_array, kind="stable")
+            series[stock_id] = (ordinal_array[order], close_array[order])
+        return cls(series, max_gap_days)
+
+    def __contains__(self, stock_id: int) -> bool:
+        return stock_id in self._series
+
+    def _lookup(self, stock_id: int, ordinals: np.ndarray) -> np.ndarray:
+        result = np.full(ordinals.shape, np.nan)
+        if stock_id not in self._series:
+            return result
+
+        known_ordinals, closes = self._series[stock_id]
+        idx = np.searchsorted(known_ordinals, ordinals, side="right") - 1
+        found = idx >= 0
+        if self.max_gap_days is not None:
+            safe_idx = np.where(found, idx, 0)
+            found &= (ordinals - known_ordinals[safe_idx]) <= self.max_gap_days
+        result[found] = closes[idx[found]]
+        return result
+
+    def asof(self, stock_id: int, target: date) -> float | None:
+        value = self._lookup(stock_id, np.asarray([target.toordinal()], dtype=np.int64))[0]
+        return None if np.isnan(value) else float(value)
+
+    def forward_fill(self, stock_id: int, dates: Sequence[date]) -> np.ndarray:
+        """dates 각각에 대한 as-of 종가 배열 (없으면 NaN)"""
+        ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+        return self._lookup(stock_id, ordinals)
+
+    def record_dates(self, start: date, end: date) -> list[date]:
+        """start~end 사이에 한 종목이라도 시세가 있는 날짜 (오름차순)"""
+        lo, hi = start.toordinal(), end.toordinal()
+        ordinals: set[int] = set()
+        for known_ordinals, _ in self._series.values():
+            mask = (known_ordinals >= lo) & (known_ordinals <= hi)
+            ordinals.update(known_ordinals[mask].tolist())
+        return [date.fromordinal(o) for o in sorted(ordinals)]
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.core.pubsub import publish_prices
+from app.external.kis_websocket import KISWebSocketClient
+from app.external.quote_cache import MARKET_KR, quote_cache
+from app.models.holding import Holding
+from app.models.stock import MarketType, Stock
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 60.0
+
+
+async def get_held_kr_tickers(db: AsyncSession) -> list[str]:
+    stmt = (
+        select(Stock.ticker)
+        .join(Holding, Holding.stock_id == Stock.id)
+        .where(Stock.market_type == MarketType.KR, Holding.quantity > 0)
+        .group_by(Stock.ticker)
+        .order_by(Stock.ticker)
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def load_held_kr_tickers() -> list[str]:
+    async with get_db_context() as db:
+        return await get_held_kr_tickers(db)
+
+
+async def store_stream_prices(quotes: dict[str, dict[str, Any]]) -> int:
+    """모인 시세를 stocks.current_price에 executemany 한 번으로 반영하고 시세 캐시 갱신, 가격 이벤트 발행"""
+    stocks = Stock.__table__
+    stmt = (
+        update(stocks)
+        .where(stocks.c.ticker == bindparam("b_ticker"), stocks.c.market_type == MarketType.KR)
+        .values(current_price=bindparam("b_price"))
+    )
+    async with get_db_context() as db:
+        await db.execute(
+            stmt,
+            [{"b_ticker": ticker, "b_price": quote["current_price"]} for ticker, quote in quotes.items()],
+        )
+    await quote_cache.set_many(MARKET_KR, quotes)
+    await publish_prices(MARKET_KR, {ticker: quote["current_price"] for ticker, quote in quotes.items()})
+    return len(quotes)
+
+
+class PriceStreamService:
+    """
+    보유 중인 국내 종목의 실시간 체결가를 구독해 종목별 최신 시세만 남기고(coalesce)
+    flush_interval마다 가격이 바뀐 종목만 한 번에 저장한다.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], KISWebSocketClient] = KISWebSocketClient,
+        tickers_loader: Callable[[], Awaitable[list[str]]] = load_held_kr_tickers,
+        flush: Callable[[dict[str, dict[str, Any]]], Awaitable[int]] = store_stream_prices,
+        flush_interval: float | None = None,
+        refresh_interval: float | None = None,
+        max_subscriptions: int | None = None,
+    ):
+        self._client_factory = client_factory
+        self._tickers_loader = tickers_loader
+        self._flush = flush
+        self.flush_interval = flush_interval or settings.price_stream_flush_seconds
+        self.refresh_interval = refresh_interval or settings.price_stream_refresh_seconds
+        self.max_subscriptions = max_subscriptions or settings.kis_websocket_max_subscriptions
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._last_flushed: dict[str, float] = {}
+        self.counters: Counter[str] = Counter()
+
+    async def run(self) -> None:
+        """취소될 때까지 실행. 연결이 끊기면 지수 백오프로 재접속한다."""
+        backoff = 1.0
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            while True:
+                try:
+                    async with self._client_factory() as client:
+                        backoff = 1.0
+                        self.counters["connections"] += 1
+                        await self._sync_subscriptions(client)
+                        refresher = asyncio.create_task(self._refresh_loop(client))
+                        try:
+                            async for quote in client.quotes():
+                                self._pending[quote["ticker"]] = quote
+                                self.counters["ticks"] += 1
+                        finally:
+                            refresher.cancel()
+                    logger.warning("KIS realtime connection closed, reconnecting")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"KIS realtime stream failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF_SECONDS)
+        finally:
+            flusher.cancel()
+            await self.flush()
+
+    async def flush(self) -> int:
+        batch, self._pending = self._pending, {}
+        changed = {
+            ticker: quote
+            for ticker, quote in batch.items()
+            if self._last_flushed.get(ticker) != quote["current_price"]
+        }
+        if not changed:
+            return 0
+        try:
+            written = await self._flush(changed)
+        except Exception as e:
+            logger.warning(f"Failed to flush streamed prices: {e}")
+            # 그 사이 들어온 더 최신 시세는 유지
+            for ticker, quote in changed.items():
+                self._pending.setdefault(ticker, quote)
+            return 0
+        for ticker, quote in changed.items():
+            self._last_flushed[ticker] = quote["current_price"]
+        self.counters["flushes"] += 1
+        self.counters["rows_written"] += written
+        return written
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _sync_subscriptions(self, client: KISWebSocketClient) -> None:
+        tickers = await self._tickers_loader()
+        if len(tickers) > self.max_subscriptions:
+            logger.warning(
+                f"{len(tickers)} held KR tickers exceed the realtime limit, "
+                f"streaming the first {self.max_subscriptions}"
+            )
+            tickers = tickers[:self.max_subscriptions]
+        wanted = set(tickers)
+        await client.unsubscribe(client.subscribed - wanted)
+        await client.subscribe(sorted(wanted - client.subscribed))
+
+    async def _refresh_loop(self, client: KISWebSocketClient) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self._sync_subscriptions(client)
+            except Exception as e:
+                logger.warning(f"Failed to refresh realtime subscriptions: {e}")
@@ -0,0 +1,107 @@
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+
+from app.services.price_series import PriceSeries
+
+# DB 컬럼 스케일 (quantity Numeric(18, 8), 금액 Numeric(18, 4))에 맞춰 부동소수 잔차 제거
+QUANTITY_DECIMALS = 8
+AMOUNT_DECIMALS = 4
+
+
+def _day_index(dates: Sequence[date], event_dates: Sequence[date]) -> np.ndarray:
+    """이벤트 날짜 -> dates 상의 행 인덱스 (dates[0] 이전 이벤트는 0행에 합산)"""
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    event_ordinals = np.fromiter(
+        (d.toordinal() for d in event_dates), dtype=np.int64, count=len(event_dates)
+    )
+    return np.searchsorted(ordinals, event_ordinals, side="left")
+
+
+def cumulative_series(
+    dates: Sequence[date],
+    event_dates: Sequence[date],
+    amounts: Sequence[float],
+    initial: float = 0.0,
+) -> np.ndarray:
+    """날짜별 누적합 (투자원금, 누적 배당 등). dates 범위 밖 미래 이벤트는 무시"""
+    series = np.zeros(len(dates))
+    if len(event_dates):
+        idx = _day_index(dates, event_dates)
+        inside = idx < len(dates)
+        np.add.at(series, idx[inside], np.asarray(amounts, dtype=np.float64)[inside])
+    return np.round(initial + np.cumsum(series), AMOUNT_DECIMALS)
+
+
+def position_matrix(
+    dates: Sequence[date],
+    stock_ids: Sequence[int],
+    trade_dates: Sequence[date],
+    trade_stock_ids: Sequence[int],
+    signed_quantities: Sequence[float],
+) -> np.ndarray:
+    """
+    (날짜 x 종목) 보유수량 행렬.
+
+    거래는 (일자, ID) 순으로 정렬돼 있어야 한다. 보유 수량보다 많이 매도하면
+    0으로 잘라내던 기존 동작을 유지하기 위해 종목별 누적합을
+    S_t - min(0, min(S_1..S_t))로 보정한 뒤 일자별 증감을 cumsum한다.
+    """
+    positions = np.zeros((len(dates), len(stock_ids)))
+    if not len(trade_dates):
+        return positions
+
+    column = {stock_id: i for i, stock_id in enumerate(stock_ids)}
+    cols = np.fromiter(
+        (column[s] for s in trade_stock_ids), dtype=np.int64, count=len(trade_stock_ids)
+    )
+    rows = _day_index(dates, trade_dates)
+    quantities = np.asarray(signed_quantities, dtype=np.float64)
+
+    # 종목별로 거래 순서를 유지한 채 묶어 종목 내 누적합 계산
+    order = np.argsort(cols, kind="stable")
+    cols, rows, quantities = cols[order], rows[order], quantities[order]
+    running = np.cumsum(quantities)
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    group_offset = np.repeat(
+        np.r_[0.0, running[starts[1:] - 1]], np.diff(np.r_[starts, len(cols)])
+    )
+    levels = running - group_offset
+
+    if (levels < 0).any():
+        for start, end in zip(starts, np.r_[starts[1:], len(cols)]):
+            segment = levels[start:end]
+            levels[start:end] = segment - np.minimum(np.minimum.accumulate(segment), 0)
+
+    # 보정된 수량을 다시 거래별 증감으로 바꿔 (일자, 종목) 칸에 더한 뒤 cumsum
+    deltas = np.diff(levels, prepend=0.0)
+    deltas[starts] = levels[starts]
+    inside = rows < len(dates)
+    np.add.at(positions, (rows[inside], cols[inside]), deltas[inside])
+    return np.round(np.cumsum(positions, axis=0), QUANTITY_DECIMALS)
+
+
+def close_matrix(
+    prices: PriceSeries, dates: Sequence[date], stock_ids: Sequence[int]
+) -> np.ndarray:
+    """(날짜 x 종목) as-of 종가 행렬 (시세 없으면 NaN)"""
+    closes = np.full((len(dates), len(stock_ids)), np.nan)
+    for i, stock_id in enumerate(stock_ids):
+        closes[:, i] = prices.forward_fill(stock_id, dates)
+    return closes
+
+
+def portfolio_values(
+    positions: np.ndarray,
+    closes: np.ndarray,
+    is_kr: np.ndarray,
+    fx: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(kr_value, us_value_usd, us_value_krw, total_value_krw) 일별 시계열"""
+    valid = (positions > 0) & (closes > 0)
+    values = np.where(valid, positions * np.nan_to_num(closes), 0.0)
+    kr_value = values[:, is_kr].sum(axis=1)
+    us_value_usd = values[:, ~is_kr].sum(axis=1)
+    us_value_krw = us_value_usd * fx
+    return kr_value, us_value_usd, us_value_krw, kr_value + us_value_krw
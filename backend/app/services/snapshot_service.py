@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Numeric, case, cast, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_upsert
+from app.models.daily_performance import DailyPerformance
+from app.models.holding import Holding
+from app.models.stock import MarketType, Stock
+
+
+async def create_daily_snapshots(
+    db: AsyncSession, target: date, exchange_rate: float
+) -> int:
+    """전체 사용자의 일별 스냅샷을 집계 쿼리 2회 + 일괄 UPSERT로 생성"""
+    price = func.coalesce(
+        func.nullif(cast(Stock.current_price, Numeric(18, 4)), 0),
+        Holding.average_cost,
+    )
+    value = Holding.quantity * price
+    is_kr = Stock.market_type == MarketType.KR
+
+    totals_stmt = (
+        select(
+            Holding.user_id,
+            func.sum(case((is_kr, value), else_=0)).label("kr_value"),
+            func.sum(case((is_kr, 0), else_=value)).label("us_value_usd"),
+            func.sum(Holding.total_invested).label("total_invested_krw"),
+            func.sum(Holding.total_dividends).label("total_dividends"),
+        )
+        .join(Stock, Holding.stock_id == Stock.id)
+        .group_by(Holding.user_id)
+    )
+    totals = (await db.execute(totals_stmt)).all()
+    if not totals:
+        return 0
+
+    # 사용자별 직전 스냅샷: (user_id, record_date) 유니크 인덱스를 타는 LATERAL 조회
+    users = select(Holding.user_id).distinct().subquery()
+    previous = (
+        select(DailyPerformance.total_value_krw)
+        .where(
+            DailyPerformance.user_id == users.c.user_id,
+            DailyPerformance.record_date < target,
+        )
+        .order_by(DailyPerformance.record_date.desc())
+        .limit(1)
+        .lateral()
+    )
+    previous_stmt = select(users.c.user_id, previous.c.total_value_krw).select_from(
+        users.join(previous, true())
+    )
+    previous_values = {
+        user_id: Decimal(str(value))
+        for user_id, value in (await db.execute(previous_stmt)).all()
+    }
+
+    rate = Decimal(str(exchange_rate))
+    rows = []
+    for t in totals:
+        kr_value = Decimal(str(t.kr_value or 0))
+        us_value_usd = Decimal(str(t.us_value_usd or 0))
+        us_value_krw = us_value_usd * rate
+        total_value_krw = kr_value + us_value_krw
+        total_invested_krw = Decimal(str(t.total_invested_krw or 0))
+
+        daily_pnl = Decimal("0")
+        daily_pnl_pct = Decimal("0")
+        previous_value = previous_values.get(t.user_id)
+        if previous_value is not None:
+            daily_pnl = total_value_krw - previous_value
+            if previous_value > 0:
+                daily_pnl_pct = daily_pnl / previous_value * 100
+
+        cumulative_return = total_value_krw - total_invested_krw
+        cumulative_return_pct = (
+            cumulative_return / total_invested_krw * 100
+            if total_invested_krw > 0 else Decimal("0")
+        )
+
+        rows.append({
+            "user_id": t.user_id,
+            "record_date": target,
+            "total_value_krw": float(total_value_krw),
+            "total_invested_krw": float(total_invested_krw),
+            "kr_value": float(kr_value),
+            "us_value_usd": float(us_value_usd),
+            "us_value_krw": float(us_value_krw),
+            "exchange_rate": exchange_rate,
+            "daily_pnl": float(daily_pnl),
+            "daily_pnl_percent": float(daily_pnl_pct),
+            "cumulative_return": float(cumulative_return),
+            "cumulative_return_percent": float(cumulative_return_pct),
+            "total_dividends": float(t.total_dividends or 0),
+        })
+
+    return await bulk_upsert(db, DailyPerformance, rows, constraint="uq_user_date")
@@ -0,0 +1,180 @@
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Float, and_, cast, delete, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_upsert
+from app.models.holding import Holding
+from app.models.stock import Stock
+from app.models.stock_daily_performance import StockDailyPerformance
+from app.models.transaction import Transaction, TransactionType
+from app.services.price_series import PriceSeries, date_range
+from app.services.replay_engine import close_matrix, position_matrix
+
+
+def compute_stock_daily_pnl(
+    quantity: np.ndarray, close: np.ndarray, prev_close: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(daily_pnl, daily_pnl_percent, position_value)를 한 번에 계산"""
+    change = close - prev_close
+    daily_pnl = quantity * change
+    daily_pnl_percent = np.divide(
+        change * 100, prev_close, out=np.zeros_like(change), where=prev_close > 0
+    )
+    position_value = quantity * close
+    return daily_pnl, daily_pnl_percent, position_value
+
+
+async def calculate_stock_daily_pnl(db: AsyncSession, target: date) -> int:
+    close_price = func.coalesce(
+        func.nullif(Stock.current_price, 0), cast(Holding.average_cost, Float)
+    )
+    previous = (
+        select(cast(StockDailyPerformance.close_price, Float).label("prev_close"))
+        .where(
+            and_(
+                StockDailyPerformance.user_id == Holding.user_id,
+                StockDailyPerformance.stock_id == Holding.stock_id,
+                StockDailyPerformance.record_date < target,
+            )
+        )
+        .order_by(StockDailyPerformance.record_date.desc())
+        .limit(1)
+        .lateral()
+    )
+    stmt = (
+        select(
+            Holding.user_id,
+            Holding.stock_id,
+            cast(Holding.quantity, Float),
+            close_price,
+            previous.c.prev_close,
+        )
+        .join(Stock, Holding.stock_id == Stock.id)
+        .outerjoin(previous, true())
+        .where(Holding.quantity > 0)
+    )
+    records = (await db.execute(stmt)).all()
+    if not records:
+        return 0
+
+    user_ids, stock_ids, quantity, close, prev_close = zip(*records)
+    quantity = np.asarray(quantity, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.asarray(prev_close, dtype=np.float64)
+    # 직전 기록이 없으면 전일 종가 = 당일 종가 (손익 0)
+    prev_close = np.where(np.isnan(prev_close), close, prev_close)
+
+    daily_pnl, daily_pnl_percent, position_value = compute_stock_daily_pnl(
+        quantity, close, prev_close
+    )
+
+    rows = [
+        {
+            "user_id": user_id,
+            "stock_id": stock_id,
+            "record_date": target,
+            "quantity": q,
+            "close_price": c,
+            "prev_close_price": p,
+            "daily_pnl": pnl,
+            "daily_pnl_percent": pct,
+            "position_value": value,
+        }
+        for user_id, stock_id, q, c, p, pnl, pct, value in zip(
+            user_ids,
+            stock_ids,
+            quantity.tolist(),
+            close.tolist(),
+            prev_close.tolist(),
+            daily_pnl.tolist(),
+            daily_pnl_percent.tolist(),
+            position_value.tolist(),
+        )
+    ]
+    return await bulk_upsert(
+        db, StockDailyPerformance, rows, constraint="uq_user_stock_date"
+    )
+
+
+async def replay_stock_daily_pnl(
+    db: AsyncSession, user_id: int, until: date | None = None
+) -> int:
+    """거래 내역 전체를 (날짜 x 종목) 행렬로 재생해 사용자의 종목별 일일 손익을 다시 만든다"""
+    last_date = until or date.today()
+    stmt = (
+        select(
+            Transaction.transaction_date,
+            Transaction.stock_id,
+            Transaction.transaction_type,
+            cast(Transaction.quantity, Float),
+        )
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.transaction_type.in_([TransactionType.BUY, TransactionType.SELL]),
+        )
+        .order_by(Transaction.transaction_date, Transaction.id)
+    )
+    trades = (await db.execute(stmt)).all()
+
+    await db.execute(
+        delete(StockDailyPerformance).where(StockDailyPerformance.user_id == user_id)
+    )
+    if not trades:
+        return 0
+
+    dates = date_range(trades[0].transaction_date, last_date)
+    stock_ids = sorted({t.stock_id for t in trades})
+    positions = position_matrix(
+        dates,
+        stock_ids,
+        [t.transaction_date for t in trades],
+        [t.stock_id for t in trades],
+        [q if tx_type == TransactionType.BUY else -q for _, _, tx_type, q in trades],
+    )
+    prices = await PriceSeries.load(db, stock_ids, dates[0], last_date)
+    closes = close_matrix(prices, dates, stock_ids)
+
+    # 종목(열) 우선으로 펼쳐 보유 중이고 시세가 있는 칸만 남긴다
+    valid = ((positions > 0) & (closes > 0)).T
+    col_idx, row_idx = np.nonzero(valid)
+    if not len(col_idx):
+        return 0
+    quantity = positions.T[valid]
+    close = closes.T[valid]
+    # 전일 종가 = 같은 종목의 직전 기록 종가 (첫 기록은 당일 종가)
+    prev_close = np.r_[close[0], close[:-1]]
+    first = np.r_[True, col_idx[1:] != col_idx[:-1]]
+    prev_close[first] = close[first]
+
+    daily_pnl, daily_pnl_percent, position_value = compute_stock_daily_pnl(
+        quantity, close, prev_close
+    )
+
+    rows = [
+        {
+            "user_id": user_id,
+            "stock_id": stock_ids[col],
+            "record_date": dates[row],
+            "quantity": q,
+            "close_price": c,
+            "prev_close_price": p,
+            "daily_pnl": pnl,
+            "daily_pnl_percent": pct,
+            "position_value": value,
+        }
+        for col, row, q, c, p, pnl, pct, value in zip(
+            col_idx.tolist(),
+            row_idx.tolist(),
+            quantity.tolist(),
+            close.tolist(),
+            prev_close.tolist(),
+            daily_pnl.tolist(),
+            daily_pnl_percent.tolist(),
+            position_value.tolist(),
+        )
+    ]
+    return await bulk_upsert(
+        db, StockDailyPerformance, rows, constraint="uq_user_stock_date"
+    )
@@ -0,0 +1,257 @@
+import asyncio
+import csv
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import copy_records
+from app.models.stock import MarketType, Stock
+from app.models.transaction import Transaction, TransactionType
+from app.services.fx_service import get_fx_series
+from app.services.holding_service import holding_service
+from app.services.performance_service import rebuild_daily_performance
+
+IMPORT_CHUNK_SIZE = 10000
+MAX_REPORTED_ERRORS = 100
+
+# 앱 내보내기(영문) 헤더와 기존 가져오기 스크립트/증권사 내보내기(한글) 헤더를 모두 허용
+_COLUMN_ALIASES = {
+    "ticker": ("ticker", "symbol", "종목코드", "티커"),
+    "transaction_type": ("transaction_type", "type", "side", "거래유형", "매매구분"),
+    "quantity": ("quantity", "qty", "수량", "체결수량"),
+    "price": ("price", "단가", "체결단가"),
+    "transaction_date": ("transaction_date", "date", "거래일", "체결일"),
+    "exchange_rate": ("exchange_rate", "환율"),
+    "fees": ("fees", "fee", "수수료"),
+    "notes": ("notes", "memo", "메모"),
+}
+_REQUIRED_COLUMNS = ("ticker", "transaction_type", "quantity", "price", "transaction_date")
+
+_TYPE_ALIASES = {
+    "BUY": TransactionType.BUY, "B": TransactionType.BUY, "매수": TransactionType.BUY,
+    "SELL": TransactionType.SELL, "S": TransactionType.SELL, "매도": TransactionType.SELL,
+}
+_DATE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y%m%d")
+
+_COPY_COLUMNS = (
+    "user_id", "stock_id", "transaction_type", "quantity", "price",
+    "exchange_rate", "fees", "transaction_date", "notes", "created_at",
+)
+
+
+class TransactionImportError(ValueError):
+    def __init__(self, message: str, errors: list[dict] | None = None, rows_read: int = 0):
+        super().__init__(message)
+        self.errors = errors or []
+        self.rows_read = rows_read
+
+
+class _ParsedRow:
+    __slots__ = ("line", "ticker", "transaction_type", "quantity", "price",
+                 "exchange_rate", "fees", "transaction_date", "notes")
+
+    def __init__(self, line, ticker, transaction_type, quantity, price,
+                 exchange_rate, fees, transaction_date, notes):
+        self.line = line
+        self.ticker = ticker
+        self.transaction_type = transaction_type
+        self.quantity = quantity
+        self.price = price
+        self.exchange_rate = exchange_rate
+        self.fees = fees
+        self.transaction_date = transaction_date
+        self.notes = notes
+
+
+def _column_index(header: list[str]) -> dict[str, int]:
+    normalized = [h.strip().lower() for h in header]
+    index = {}
+    for column, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                index[column] = normalized.index(alias)
+                break
+    missing = [c for c in _REQUIRED_COLUMNS if c not in index]
+    if missing:
+        raise TransactionImportError(f"Missing required columns: {', '.join(missing)}")
+    return index
+
+
+def _decimal(value: str, field: str) -> Decimal:
+    try:
+        return Decimal(value.replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid {field}: {value!r}")
+
+
+def _date(value: str) -> date:
+    value = value.strip()
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"invalid transaction_date: {value!r}")
+
+
+def _parse_row(line: int, row: list[str], index: dict[str, int]) -> _ParsedRow:
+    def cell(column: str) -> str:
+        i = index.get(column)
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    ticker = cell("ticker").upper()
+    if not ticker:
+        raise ValueError("ticker is empty")
+    transaction_type = _TYPE_ALIASES.get(cell("transaction_type").upper())
+    if transaction_type is None:
+        raise ValueError(f"unsupported transaction_type: {cell('transaction_type')!r}")
+
+    quantity = _decimal(cell("quantity"), "quantity")
+    price = _decimal(cell("price"), "price")
+    exchange_rate = _decimal(cell("exchange_rate"), "exchange_rate") if cell("exchange_rate") else None
+    fees = _decimal(cell("fees"), "fees") if cell("fees") else Decimal("0")
+    if quantity <= 0:
+        raise ValueError("quantity must be greater than 0")
+    if price <= 0:
+        raise ValueError("price must be greater than 0")
+    if exchange_rate is not None and exchange_rate <= 0:
+        raise ValueError("exchange_rate must be greater than 0")
+    if fees < 0:
+        raise ValueError("fees must not be negative")
+
+    notes = cell("notes") or None
+    if notes and len(notes) > 500:
+        raise ValueError("notes must be at most 500 characters")
+
+    return _ParsedRow(
+        line, ticker, transaction_type, quantity, price,
+        exchange_rate, fees, _date(cell("transaction_date")), notes,
+    )
+
+
+def iter_transaction_csv(
+    lines: Iterable[str], batch_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[tuple[list[_ParsedRow], list[dict], int]]:
+    """CSV를 한 줄씩 읽어 batch_size 행마다 (검증된 행, 행별 오류(줄 번호 포함), 읽은 행 수)를 내보낸다"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        raise TransactionImportError("CSV is empty")
+    index = _column_index(header)
+
+    rows: list[_ParsedRow] = []
+    errors: list[dict] = []
+    rows_read = 0
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        rows_read += 1
+        try:
+            rows.append(_parse_row(reader.line_num, row, index))
+        except ValueError as e:
+            errors.append({"line": reader.line_num, "message": str(e)})
+        if rows_read == batch_size:
+            yield rows, errors, rows_read
+            rows, errors, rows_read = [], [], 0
+    if rows_read:
+        yield rows, errors, rows_read
+
+
+async def import_transactions(
+    db: AsyncSession,
+    user_id: int,
+    lines: Iterable[str],
+    skip_invalid: bool = False,
+) -> dict:
+    """
+    CSV 거래내역 일괄 가져오기. IMPORT_CHUNK_SIZE 행씩 읽기/검증(스레드) → 새 종목만 조회 → COPY 적재를 반복해
+    파일 전체를 메모리에 올리지 않는다. 이후 영향받은 보유 종목을 종목당 한 번씩, 일별 성과를 가장 이른 거래일부터 한 번 재계산한다.
+    skip_invalid가 False이면 오류가 하나라도 있을 때 TransactionImportError를 내며, 이미 적재한 배치는
+    호출자의 롤백으로 취소된다 (커밋은 호출자가 한다).
+    """
+    loop = asyncio.get_running_loop()
+    batches = iter_transaction_csv(lines)
+    stocks: dict[str, tuple[int, MarketType] | None] = {}
+    fx = None
+    errors: list[dict] = []
+    error_count = 0
+    rows_read = 0
+    imported = 0
+    stock_ids: set[int] = set()
+    since: date | None = None
+
+    while True:
+        # 업로드 파일 읽기/파싱은 블로킹이므로 이벤트 루프 밖에서
+        batch = await loop.run_in_executor(None, next, batches, None)
+        if batch is None:
+            break
+        rows, batch_errors, batch_read = batch
+        rows_read += batch_read
+
+        new_tickers = {row.ticker for row in rows} - stocks.keys()
+        if new_tickers:
+            stmt = select(Stock.ticker, Stock.id, Stock.market_type).where(Stock.ticker.in_(new_tickers))
+            found = {ticker: (stock_id, market) for ticker, stock_id, market in await db.execute(stmt)}
+            stocks.update({ticker: found.get(ticker) for ticker in new_tickers})
+
+        unknown = [row for row in rows if stocks[row.ticker] is None]
+        if unknown:
+            batch_errors.extend({"line": row.line, "message": f"unknown ticker: {row.ticker}"} for row in unknown)
+            batch_errors.sort(key=lambda e: e["line"])
+            rows = [row for row in rows if stocks[row.ticker] is not None]
+
+        error_count += len(batch_errors)
+        errors.extend(batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+        if error_count and not skip_invalid:
+            # 어차피 저장하지 않으므로 적재는 멈추고 오류만 끝까지 모은다
+            continue
+
+        # 환율이 비어 있는 미국 종목 거래는 거래일 기준 저장된 USD/KRW 환율로 채움
+        missing_fx = [
+            i for i, row in enumerate(rows)
+            if row.exchange_rate is None and stocks[row.ticker][1] == MarketType.US
+        ]
+        if missing_fx:
+            fx = fx or await get_fx_series(db)
+            rates = fx.rates_for([rows[i].transaction_date for i in missing_fx])
+            for i, rate in zip(missing_fx, rates.tolist()):
+                rows[i].exchange_rate = Decimal(str(rate))
+
+        now = datetime.utcnow()
+        records = [
+            (
+                user_id, stocks[row.ticker][0], row.transaction_type.value, row.quantity, row.price,
+                row.exchange_rate if row.exchange_rate is not None else Decimal("1"),
+                row.fees, row.transaction_date, row.notes, now,
+            )
+            for row in rows
+        ]
+        if not records:
+            continue
+        imported += await copy_records(db, Transaction, _COPY_COLUMNS, records, chunk_size=IMPORT_CHUNK_SIZE)
+        stock_ids.update(record[1] for record in records)
+        batch_since = min(row.transaction_date for row in rows)
+        since = batch_since if since is None else min(since, batch_since)
+
+    if error_count and not skip_invalid:
+        raise TransactionImportError(f"{error_count} invalid rows", errors, rows_read)
+
+    for stock_id in sorted(stock_ids):
+        await holding_service.recalculate_holding(db, user_id, stock_id)
+    if since is not None:
+        await rebuild_daily_performance(db, user_id, since=since)
+
+    return {
+        "rows_read": rows_read,
+        "imported": imported,
+        "skipped": rows_read - imported,
+        "holdings_recalculated": len(stock_ids),
+        "errors": errors,
+    }
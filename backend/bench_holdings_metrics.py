@@ -0,0 +1,144 @@
+"""
+보유 종목 평가 지표 계산 벤치마크
+- 500개 포지션(국내/미국 혼합)의 메모리 객체로 get_holdings_with_metrics의 계산 부분만 비교합니다 (DB 미사용)
+- before: 종목마다 17키 dict를 만들고 Decimal(str(float)) 변환으로 두 번 순회 (기존 구현)
+- after: compute_holding_metrics (배열 연산 한 번 + __slots__ HoldingMetrics)
+- 각 방식에 응답 직렬화(list[HoldingWithMetrics] 검증)까지 포함한 시간과 tracemalloc 최대 할당량을 출력합니다
+
+사용법: python bench_holdings_metrics.py --positions 500 --repeat 200
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.models.holding import Holding
+from app.models.stock import MarketType, Stock
+from app.schemas.holding import HoldingWithMetrics
+from app.services.holding_service import compute_holding_metrics
+
+
+def make_holdings(n: int, rng: random.Random) -> list[Holding]:
+    now = datetime.utcnow()
+    holdings = []
+    for i in range(n):
+        market = MarketType.KR if i % 2 else MarketType.US
+        price = rng.uniform(10, 500) if market == MarketType.US else rng.uniform(1_000, 500_000)
+        stock = Stock(
+            id=i + 1, ticker=f"T{i:04d}", name=f"Stock {i}", market_type=market, exchange="X",
+            currency="USD" if market == MarketType.US else "KRW", sector=f"Sector {i % 11}",
+            current_price=Decimal(f"{price:.4f}"), created_at=now, updated_at=now,
+        )
+        quantity = Decimal(f"{rng.uniform(1, 300):.8f}")
+        cost = Decimal(f"{price * rng.uniform(0.7, 1.2):.4f}")
+        holdings.append(Holding(
+            id=i + 1, user_id=1, stock_id=stock.id, stock=stock, quantity=quantity,
+            average_cost=cost, average_exchange_rate=Decimal("1300"),
+            total_invested=quantity * cost * (1300 if market == MarketType.US else 1),
+            total_dividends=Decimal("0"), realized_gain=Decimal("0"), created_at=now, updated_at=now,
+        ))
+    return holdings
+
+
+def legacy_metrics(holdings: list[Holding], exchange_rate: float) -> list[dict]:
+    total_value_krw = Decimal("0")
+    holdings_data = []
+
+    for h in holdings:
+        if not h.stock:
+            continue
+
+        current_price = h.stock.current_price or h.average_cost
+        current_value = Decimal(str(h.quantity)) * Decimal(str(current_price))
+
+        if h.stock.market_type == MarketType.US:
+            current_value_krw = current_value * Decimal(str(exchange_rate))
+        else:
+            current_value_krw = current_value
+
+        total_value_krw += current_value_krw
+
+        holdings_data.append({
+            "holding": h,
+            "current_value": float(current_value),
+            "current_value_krw": float(current_value_krw),
+        })
+
+    result_list = []
+    for data in holdings_data:
+        h = data["holding"]
+        unrealized_gain = data["current_value_krw"] - float(h.total_invested)
+        unrealized_gain_pct = (
+            (unrealized_gain / float(h.total_invested) * 100)
+            if float(h.total_invested) > 0 else 0.0
+        )
+        weight = (
+            (Decimal(str(data["current_value_krw"])) / total_value_krw * 100)
+            if total_value_krw > 0 else Decimal("0")
+        )
+
+        result_list.append({
+            "id": h.id,
+            "user_id": h.user_id,
+            "stock_id": h.stock_id,
+            "quantity": h.quantity,
+            "average_cost": h.average_cost,
+            "average_exchange_rate": h.average_exchange_rate,
+            "total_invested": h.total_invested,
+            "total_dividends": h.total_dividends,
+            "realized_gain": h.realized_gain,
+            "created_at": h.created_at,
+            "updated_at": h.updated_at,
+            "stock": h.stock,
+            "current_value": data["current_value"],
+            "current_value_krw": data["current_value_krw"],
+            "unrealized_gain": float(unrealized_gain),
+            "unrealized_gain_percent": float(unrealized_gain_pct),
+            "weight_percent": float(weight),
+        })
+
+    return result_list
+
+
+def measure(label: str, compute, holdings: list[Holding], repeat: int) -> float:
+    adapter = TypeAdapter(list[HoldingWithMetrics])
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compute(holdings, 1350.0)
+    compute_ms = (time.perf_counter() - started) / repeat * 1000
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        adapter.dump_python(adapter.validate_python(compute(holdings, 1350.0)), mode="json")
+    total_ms = (time.perf_counter() - started) / repeat * 1000
+
+    tracemalloc.start()
+    compute(holdings, 1350.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<28} compute {compute_ms:7.3f}ms  +serialize {total_ms:7.3f}ms  peak alloc {peak / 1024:8.1f}KiB")
+    return total_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    holdings = make_holdings(args.positions, random.Random(42))
+    print(f"{args.positions} positions, {args.repeat} repeats")
+
+    before = measure("before (dict + Decimal)", legacy_metrics, holdings, args.repeat)
+    after = measure("after  (HoldingMetrics)", compute_holding_metrics, holdings, args.repeat)
+    print(f"speedup (compute + serialize): x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
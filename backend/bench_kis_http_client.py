@@ -0,0 +1,147 @@
+"""
+KIS HTTP 클라이언트 마이크로벤치마크
+- 로컬 TLS 스텁 서버(aiohttp, 자체 서명 인증서)를 띄우고 시세 1건당 지연시간을 비교합니다
+- before: 요청마다 httpx.AsyncClient 생성 (매번 TCP + TLS 핸드셰이크)
+- after: KISClient의 상시 커넥션 풀 (keep-alive, 가능하면 HTTP/2)
+
+사용법: python bench_kis_http_client.py --requests 300
+"""
+import argparse
+import asyncio
+import datetime as dt
+import ipaddress
+import os
+import ssl
+import statistics
+import tempfile
+import time
+
+import httpx
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.core.config import settings
+from app.external.kis_client import HTTP2_AVAILABLE, KISClient
+
+QUOTE_PATH = "/uapi/domestic-stock/v1/quotations/inquire-price"
+
+
+def create_self_signed_cert(directory: str) -> tuple[str, str]:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+async def start_stub_server(port: int, cert_path: str, key_path: str) -> web.AppRunner:
+    async def token(request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "bench-token", "expires_in": 86400})
+
+    async def inquire_price(request: web.Request) -> web.Response:
+        return web.json_response({"output": {"stck_prpr": "72000", "acml_vol": "1000000"}})
+
+    app = web.Application()
+    app.router.add_post("/oauth2/tokenP", token)
+    app.router.add_get(QUOTE_PATH, inquire_price)
+
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ssl_context.load_cert_chain(cert_path, key_path)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port, ssl_context=ssl_context).start()
+    return runner
+
+
+async def per_request_client(ticker: str) -> None:
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.get(
+            f"{settings.kis_base_url}{QUOTE_PATH}",
+            params={"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": ticker},
+        )
+        response.raise_for_status()
+
+
+def summarize(label: str, samples: list[float]) -> float:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p50 = statistics.median(samples_ms)
+    p99 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))]
+    print(f"  {label:<24} p50 {p50:7.2f}ms   p99 {p99:7.2f}ms")
+    return p50
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--port", type=int, default=18443)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    cert_path, key_path = create_self_signed_cert(workdir)
+    os.environ["SSL_CERT_FILE"] = cert_path
+
+    runner = await start_stub_server(args.port, cert_path, key_path)
+    settings.kis_base_url = f"https://127.0.0.1:{args.port}"
+    settings.kis_app_key = settings.kis_app_key or "bench"
+    settings.kis_app_secret = settings.kis_app_secret or "bench"
+    settings.kis_rate_limit_per_second = 1_000_000
+
+    client = KISClient()
+    client.TOKEN_FILE = os.path.join(workdir, "kis_token_cache.json")
+
+    try:
+        await client._get_access_token()
+        tickers = [f"{i:06d}" for i in range(args.requests)]
+        print(f"{args.requests} sequential quotes over TLS (HTTP/2 available: {HTTP2_AVAILABLE})")
+
+        before = []
+        for ticker in tickers:
+            started = time.perf_counter()
+            await per_request_client(ticker)
+            before.append(time.perf_counter() - started)
+
+        after = []
+        for ticker in tickers:
+            started = time.perf_counter()
+            await client.get_stock_price(ticker)
+            after.append(time.perf_counter() - started)
+
+        p50_before = summarize("before (client per call)", before)
+        p50_after = summarize("after (pooled client)", after)
+        print(f"p50 speedup: x{p50_before / p50_after:.1f}")
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+국내 실시간 시세 스트리밍 벤치마크
+- 로컬 웹소켓 스텁(aiohttp)이 KIS H0STCNT0 형식의 체결 메시지를 보내고, PriceStreamService가 이를 받아
+  종목별로 합친 뒤 flush 주기마다 메모리 싱크에 기록합니다 (DB/실제 KIS 미사용)
+- 체결 건수 대비 실제 저장 건수(쓰기 감소율)와 PINGPONG 응답, 구독 요청 수를 확인합니다
+
+사용법: python bench_kis_stream.py --tickers 40 --ticks-per-second 500 --duration 10 --flush 2
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import WSMsgType, web
+
+from app.external.kis_websocket import REALTIME_PRICE_TR_ID, KISWebSocketClient
+from app.services.price_stream import PriceStreamService
+
+
+def make_record(ticker: str, price: int) -> list[str]:
+    record = ["0"] * 46
+    record[0] = ticker
+    record[1] = time.strftime("%H%M%S")
+    record[2] = str(price)
+    record[4] = "100"
+    record[5] = "0.14"
+    record[7] = record[8] = record[9] = str(price)
+    record[13] = "1000"
+    return record
+
+
+async def start_stub_server(port: int, ticks_per_second: float, stats: dict) -> web.AppRunner:
+    async def handler(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscribed: set[str] = set()
+        rng = random.Random(0)
+        prices: dict[str, int] = {}
+
+        async def emit():
+            interval = 1 / ticks_per_second
+            while not ws.closed:
+                await asyncio.sleep(interval * 10)
+                if not subscribed:
+                    continue
+                tickers = rng.choices(sorted(subscribed), k=10)
+                fields = []
+                for ticker in tickers:
+                    # 체결가는 대부분 직전 가격 근처에서 반복된다
+                    prices[ticker] = prices.get(ticker, 70000) + rng.choice((-100, 0, 0, 0, 100))
+                    fields.extend(make_record(ticker, prices[ticker]))
+                await ws.send_str(f"0|{REALTIME_PRICE_TR_ID}|{len(tickers):03d}|" + "^".join(fields))
+                stats["ticks_sent"] += len(tickers)
+
+        async def ping():
+            while not ws.closed:
+                await asyncio.sleep(1)
+                await ws.send_str(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": time.strftime("%Y%m%d%H%M%S")}}))
+                stats["pings_sent"] += 1
+
+        tasks = [asyncio.create_task(emit()), asyncio.create_task(ping())]
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(message.data)
+                header = payload["header"]
+                if header.get("tr_id") == "PINGPONG":
+                    stats["pongs_received"] += 1
+                    continue
+                ticker = payload["body"]["input"]["tr_key"]
+                if header["tr_type"] == "1":
+                    subscribed.add(ticker)
+                else:
+                    subscribed.discard(ticker)
+                stats["subscription_requests"] += 1
+                await ws.send_str(json.dumps({
+                    "header": {"tr_id": REALTIME_PRICE_TR_ID, "tr_key": ticker, "encrypt": "N"},
+                    "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": "SUBSCRIBE SUCCESS"},
+                }))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=40)
+    parser.add_argument("--ticks-per-second", type=float, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--flush", type=float, default=2.0, help="flush 주기 (초)")
+    parser.add_argument("--port", type=int, default=18091)
+    args = parser.parse_args()
+
+    stats = {"ticks_sent": 0, "pings_sent": 0, "pongs_received": 0, "subscription_requests": 0}
+    runner = await start_stub_server(args.port, args.ticks_per_second, stats)
+    tickers = [f"{i:06d}" for i in range(args.tickers)]
+    statements = 0
+
+    async def tickers_loader() -> list[str]:
+        return tickers
+
+    async def sink(quotes: dict) -> int:
+        nonlocal statements
+        statements += 1
+        return len(quotes)
+
+    service = PriceStreamService(
+        client_factory=lambda: KISWebSocketClient(url=f"ws://127.0.0.1:{args.port}/", approval_key="stub"),
+        tickers_loader=tickers_loader,
+        flush=sink,
+        flush_interval=args.flush,
+    )
+    print(f"{args.tickers} tickers, ~{args.ticks_per_second:.0f} ticks/s for {args.duration}s, flush every {args.flush}s")
+
+    task = asyncio.create_task(service.run())
+    await asyncio.sleep(args.duration)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    await runner.cleanup()
+
+    ticks = service.counters["ticks"]
+    rows = service.counters["rows_written"]
+    print(f"  ticks received: {ticks:,} (sent {stats['ticks_sent']:,})")
+    print(f"  flush statements: {statements}, rows written: {rows:,}")
+    print(f"  subscriptions: {stats['subscription_requests']}, pings answered: {stats['pongs_received']}/{stats['pings_sent']}")
+    if rows:
+        print(f"write reduction: x{ticks / rows:,.1f} (vs one UPDATE per tick)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
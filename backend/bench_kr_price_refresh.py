@@ -0,0 +1,96 @@
+"""
+국내 시세 갱신 벤치마크
+- 로컬 KIS 목 서버(aiohttp)를 띄우고 순차 조회와 동시 조회(토큰 버킷 적용)를 비교합니다
+- 실제 KIS API를 호출하지 않으며, 토큰 캐시 파일도 임시 경로를 사용합니다
+
+사용법: python bench_kr_price_refresh.py --tickers 60 --latency 0.25 --rate 18
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from aiohttp import web
+
+from app.core.config import settings
+from app.external.kis_client import KISClient
+from app.external.quote_cache import quote_cache
+
+
+async def start_mock_kis_server(latency: float, port: int) -> web.AppRunner:
+    async def token(request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "bench-token", "expires_in": 86400})
+
+    async def inquire_price(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({
+            "output": {
+                "stck_oprc": "71500",
+                "stck_hgpr": "72500",
+                "stck_lwpr": "71000",
+                "stck_prpr": "72000",
+                "prdy_vrss": "100",
+                "prdy_ctrt": "0.5",
+                "acml_vol": "1000000",
+            }
+        })
+
+    app = web.Application()
+    app.router.add_post("/oauth2/tokenP", token)
+    app.router.add_get("/uapi/domestic-stock/v1/quotations/inquire-price", inquire_price)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def run_once(tickers: list[str], concurrency: int, rate: float) -> float:
+    settings.kis_rate_limit_per_second = rate
+    client = KISClient()
+    client.TOKEN_FILE = os.path.join(tempfile.mkdtemp(), "kis_token_cache.json")
+    await client._get_access_token()
+    # 앞선 실행 결과가 시세 캐시에 남아 있으면 네트워크를 타지 않으므로 매번 비움
+    quote_cache.clear()
+
+    started = time.perf_counter()
+    prices = await client.get_stock_prices(tickers, concurrency=concurrency)
+    elapsed = time.perf_counter() - started
+
+    received = sum(1 for p in prices.values() if p)
+    print(
+        f"  concurrency={concurrency:>3}  {received}/{len(tickers)} quotes  "
+        f"{elapsed:6.2f}s  {len(tickers) / elapsed:6.2f} quotes/sec"
+    )
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.25, help="목 서버 응답 지연 (초)")
+    parser.add_argument("--rate", type=float, default=settings.kis_rate_limit_per_second)
+    parser.add_argument("--concurrency", type=int, default=settings.kis_max_concurrency)
+    parser.add_argument("--port", type=int, default=18090)
+    args = parser.parse_args()
+
+    runner = await start_mock_kis_server(args.latency, args.port)
+    settings.kis_base_url = f"http://127.0.0.1:{args.port}"
+    settings.kis_app_key = settings.kis_app_key or "bench"
+    settings.kis_app_secret = settings.kis_app_secret or "bench"
+    quote_cache.use_redis = False
+
+    tickers = [f"{i:06d}" for i in range(args.tickers)]
+    print(f"{args.tickers} tickers, latency {args.latency}s, limit {args.rate}/s")
+
+    try:
+        sequential = await run_once(tickers, 1, args.rate)
+        concurrent = await run_once(tickers, args.concurrency, args.rate)
+        print(f"speedup: x{sequential / concurrent:.1f}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+KRX 종목명 검색 벤치마크
+- 합성 종목 목록(기본 2,700개)에 10,000개 검색어를 실행해 지연 시간을 비교합니다 (네트워크 미사용)
+- before: 목록 전체 선형 탐색 (기존 search_by_name)
+- after: StockNameIndex (바이그램 역색인 + 초성 색인)
+
+사용법: python bench_krx_search.py --stocks 2700 --queries 10000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.services.krx_master import StockNameIndex, _get_fallback_stocks, to_choseong
+
+SYLLABLES = "가나다라마바사아자차카타파하삼성전자현대기아엘지에스케이한화롯데신한우리케미칼바이오제약반도체"
+
+
+def make_stocks(n: int, rng: random.Random) -> list[dict[str, str]]:
+    stocks = list(_get_fallback_stocks())
+    while len(stocks) < n:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 7)))
+        if rng.random() < 0.2:
+            name = rng.choice(["SK", "LG", "KB", "CJ", "GS"]) + name
+        stocks.append({"code": f"{len(stocks):06d}", "name": name, "market": "KOSDAQ"})
+    return stocks
+
+
+def make_queries(stocks: list[dict[str, str]], n: int, rng: random.Random) -> list[str]:
+    queries = []
+    for _ in range(n):
+        name = rng.choice(stocks)["name"]
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(name[: rng.randint(1, len(name))])
+        elif kind < 0.7:
+            start = rng.randint(0, len(name) - 1)
+            queries.append(name[start:start + rng.randint(1, 3)])
+        elif kind < 0.85:
+            queries.append(to_choseong(name)[: rng.randint(2, 4)])
+        else:
+            queries.append(rng.choice(stocks)["code"])
+    return queries
+
+
+def legacy_search(stocks: list[dict[str, str]], keyword: str, limit: int = 10) -> list[dict[str, str]]:
+    keyword_lower = keyword.lower()
+    results = []
+    for stock in stocks:
+        name = stock["name"]
+        code = stock["code"]
+        if keyword in name or keyword_lower in name.lower() or keyword == code:
+            results.append({"code": code, "name": name, "market": stock["market"]})
+            if len(results) >= limit:
+                break
+    return results
+
+
+def run(label: str, search, queries: list[str]) -> float:
+    latencies = np.empty(len(queries))
+    started = time.perf_counter()
+    for i, q in enumerate(queries):
+        t = time.perf_counter()
+        search(q)
+        latencies[i] = time.perf_counter() - t
+    total = time.perf_counter() - started
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    print(f"  {label:<32} total {total:7.3f}s  p50 {p50:8.1f}us  p99 {p99:8.1f}us")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stocks", type=int, default=2700)
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stocks = make_stocks(args.stocks, rng)
+    queries = make_queries(stocks, args.queries, rng)
+    print(f"{len(stocks):,} stocks, {len(queries):,} queries (prefix/substring/choseong/code)")
+
+    started = time.perf_counter()
+    index = StockNameIndex(stocks)
+    print(f"  index build: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    legacy_total = run("before (linear scan)", lambda q: legacy_search(stocks, q), queries)
+    index_total = run("after  (n-gram index)", lambda q: index.search(q), queries)
+    print(f"speedup: x{legacy_total / index_total:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
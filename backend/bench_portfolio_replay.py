@@ -0,0 +1,116 @@
+"""
+포트폴리오 일별 재생 벤치마크
+- 5년 x 200종목 거래/시세 데이터를 메모리에 생성하고 계산 단계만 비교합니다 (DB 미사용)
+- before: 하루씩 진행하며 defaultdict(Decimal) 보유수량 갱신 + 종목별 as-of 조회 (기존 재계산 루프)
+- after: replay_engine (보유수량 행렬 cumsum x 종가 행렬 x 환율 벡터)
+
+사용법: python bench_portfolio_replay.py --years 5 --stocks 200 --trades 5000
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from app.services.price_series import PriceSeries, date_range
+from app.services.replay_engine import close_matrix, portfolio_values, position_matrix
+
+
+def legacy_replay(dates, trades, prices, is_kr, max_days):
+    """기존 스크립트와 같은 하루 단위 루프 (max_days일만 실행)"""
+    tx_by_date = defaultdict(list)
+    for trade in trades:
+        tx_by_date[trade[0]].append(trade)
+
+    holdings = defaultdict(Decimal)
+    totals = []
+    for current_date in dates[:max_days]:
+        for _, stock_id, qty in tx_by_date.get(current_date, ()):
+            holdings[stock_id] += Decimal(str(qty))
+            if holdings[stock_id] < 0:
+                holdings[stock_id] = Decimal("0")
+
+        kr_value = Decimal("0")
+        us_value_krw = Decimal("0")
+        for stock_id, qty in holdings.items():
+            if qty <= 0:
+                continue
+            price = prices.asof(stock_id, current_date) or 0.0
+            if price <= 0:
+                continue
+            value = qty * Decimal(str(price))
+            if is_kr[stock_id]:
+                kr_value += value
+            else:
+                us_value_krw += value * Decimal("1300")
+        totals.append(kr_value + us_value_krw)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--stocks", type=int, default=200)
+    parser.add_argument("--trades", type=int, default=5000)
+    parser.add_argument(
+        "--legacy-sample-days", type=int, default=120,
+        help="기존 루프는 일부 기간만 실행 후 선형 외삽",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    end = date.today()
+    dates = date_range(end - timedelta(days=365 * args.years), end)
+    stock_ids = list(range(1, args.stocks + 1))
+    is_kr = rng.random(args.stocks) < 0.6
+
+    # 영업일 종가 (랜덤워크)
+    business_days = [d for d in dates if d.weekday() < 5]
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(business_days), args.stocks)), axis=0))
+    price_rows = [
+        (stock_id, d, float(closes[i, j]))
+        for i, d in enumerate(business_days)
+        for j, stock_id in enumerate(stock_ids)
+    ]
+    prices = PriceSeries.from_rows(price_rows)
+
+    # 첫 거래는 전 종목 매수, 이후 매수/매도 랜덤
+    trade_days = sorted(rng.integers(0, len(dates), args.trades).tolist())
+    trades = [(dates[0], stock_id, 100.0) for stock_id in stock_ids]
+    trades += [
+        (dates[day], int(rng.choice(stock_ids)), float(rng.integers(-50, 80)))
+        for day in trade_days
+    ]
+    print(
+        f"{len(dates):,} days x {args.stocks} stocks, {len(trades):,} trades, "
+        f"{len(price_rows):,} price rows"
+    )
+
+    sample = min(args.legacy_sample_days, len(dates))
+    started = time.perf_counter()
+    legacy_replay(dates, trades, prices, dict(zip(stock_ids, is_kr.tolist())), sample)
+    legacy_elapsed = (time.perf_counter() - started) * len(dates) / sample
+    print(f"  before (daily loop, extrapolated from {sample} days): {legacy_elapsed:8.2f}s")
+
+    started = time.perf_counter()
+    positions = position_matrix(
+        dates,
+        stock_ids,
+        [t[0] for t in trades],
+        [t[1] for t in trades],
+        [t[2] for t in trades],
+    )
+    close = close_matrix(prices, dates, stock_ids)
+    fx = np.full(len(dates), 1300.0)
+    kr_value, us_value_usd, us_value_krw, total = portfolio_values(positions, close, is_kr, fx)
+    vector_elapsed = time.perf_counter() - started
+    print(f"  after  (replay engine):                           {vector_elapsed:8.4f}s")
+    print(f"speedup: x{legacy_elapsed / vector_elapsed:,.0f}")
+    if vector_elapsed >= 1.0:
+        print("WARNING: replay took longer than 1s")
+
+
+if __name__ == "__main__":
+    main()
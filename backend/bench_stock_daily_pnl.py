@@ -0,0 +1,89 @@
+"""
+종목별 일일 손익 계산 벤치마크
+- 10,000명 x 30종목 보유 데이터를 메모리에 생성하고 계산 단계만 비교합니다 (DB 미사용)
+- before: 사용자별 리스트 컴프리헨션 + 보유 종목별 Decimal 계산 (기존 _calculate_stock_daily_pnl 루프)
+- after: stock_pnl_engine.compute_stock_daily_pnl (NumPy 컬럼 연산 1회)
+
+사용법: python bench_stock_daily_pnl.py --users 10000 --holdings 30
+"""
+import argparse
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from app.services.stock_pnl_engine import compute_stock_daily_pnl
+
+
+class FakeHolding:
+    __slots__ = ("user_id", "stock_id", "quantity", "close", "prev_close")
+
+    def __init__(self, user_id, stock_id, quantity, close, prev_close):
+        self.user_id = user_id
+        self.stock_id = stock_id
+        self.quantity = quantity
+        self.close = close
+        self.prev_close = prev_close
+
+
+def legacy_loop(all_holdings: list[FakeHolding], max_users: int) -> int:
+    processed = 0
+    user_ids = sorted(set(h.user_id for h in all_holdings))[:max_users]
+    for user_id in user_ids:
+        user_holdings = [h for h in all_holdings if h.user_id == user_id]
+        for h in user_holdings:
+            close_price = Decimal(str(h.close))
+            prev_close = Decimal(str(h.prev_close))
+            quantity = Decimal(str(h.quantity))
+
+            daily_pnl = quantity * (close_price - prev_close)
+            daily_pnl_pct = (
+                (close_price - prev_close) / prev_close * 100 if prev_close > 0 else Decimal("0")
+            )
+            position_value = quantity * close_price
+            float(daily_pnl), float(daily_pnl_pct), float(position_value)
+            processed += 1
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--holdings", type=int, default=30)
+    parser.add_argument(
+        "--legacy-sample-users", type=int, default=200,
+        help="기존 루프는 O(users x holdings)라 일부 사용자만 실행 후 선형 외삽",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    n = args.users * args.holdings
+    user_ids = np.repeat(np.arange(args.users), args.holdings)
+    stock_ids = np.tile(np.arange(args.holdings), args.users)
+    quantity = rng.integers(1, 500, n).astype(np.float64)
+    close = rng.uniform(1_000, 500_000, n).round(0)
+    prev_close = close * rng.uniform(0.95, 1.05, n).round(4)
+
+    holdings = [
+        FakeHolding(u, s, q, c, p)
+        for u, s, q, c, p in zip(
+            user_ids.tolist(), stock_ids.tolist(), quantity.tolist(), close.tolist(), prev_close.tolist()
+        )
+    ]
+    print(f"{args.users:,} users x {args.holdings} holdings = {n:,} positions")
+
+    sample = min(args.legacy_sample_users, args.users)
+    started = time.perf_counter()
+    legacy_loop(holdings, sample)
+    legacy_elapsed = (time.perf_counter() - started) * args.users / sample
+    print(f"  before (loop, extrapolated from {sample} users): {legacy_elapsed:8.2f}s")
+
+    started = time.perf_counter()
+    daily_pnl, daily_pnl_percent, position_value = compute_stock_daily_pnl(quantity, close, prev_close)
+    vector_elapsed = time.perf_counter() - started
+    print(f"  after  (NumPy vectorized):                    {vector_elapsed:8.4f}s")
+    print(f"speedup: x{legacy_elapsed / vector_elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+미국 시세 갱신 벤치마크
+- yfinance 네트워크 호출을 스텁으로 대체하고 500종목 유니버스로 비교합니다
+- before: 종목마다 yf.Ticker(t).info 조회 (기존 _update_us_prices 루프, 호출당 --info-latency초)
+- after: get_quotes_batch (yf.download 일괄 호출 1회 + 컬럼 단위 파싱, 호출당 --download-latency초)
+
+사용법: python bench_us_quotes_batch.py --tickers 500 --info-latency 0.3 --download-latency 2.0
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.external.yfinance_client as yfc
+
+
+class StubTicker:
+    def __init__(self, ticker: str, latency: float):
+        self.ticker = ticker
+        self.latency = latency
+
+    @property
+    def info(self) -> dict:
+        time.sleep(self.latency)
+        return {
+            "shortName": self.ticker,
+            "regularMarketOpen": 100.0,
+            "regularMarketDayHigh": 101.0,
+            "regularMarketDayLow": 99.0,
+            "regularMarketPrice": 100.5,
+            "regularMarketVolume": 1_000_000,
+            "currency": "USD",
+        }
+
+
+def make_download_stub(latency: float):
+    def download(tickers, period="5d", **kwargs):
+        time.sleep(latency)
+        rng = np.random.default_rng(0)
+        index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=5, freq="B")
+        fields = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+        columns = pd.MultiIndex.from_product([fields, tickers])
+        data = rng.uniform(10, 500, (len(index), len(columns)))
+        return pd.DataFrame(data, index=index, columns=columns)
+    return download
+
+
+async def legacy(tickers: list[str]) -> int:
+    received = 0
+    for ticker in tickers:
+        info = await yfc.yfinance_client.get_stock_info(ticker)
+        if info and info.get("current_price"):
+            received += 1
+    return received
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--info-latency", type=float, default=0.3)
+    parser.add_argument("--download-latency", type=float, default=2.0)
+    parser.add_argument(
+        "--legacy-sample", type=int, default=20,
+        help="기존 루프는 일부 종목만 실행 후 선형 외삽",
+    )
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    yfc.yf.Ticker = lambda t: StubTicker(t, args.info_latency)
+    yfc.yf.download = make_download_stub(args.download_latency)
+    yfc.quote_cache.use_redis = False
+    print(
+        f"{args.tickers} tickers, .info latency {args.info_latency}s, "
+        f"download latency {args.download_latency}s per call"
+    )
+
+    sample = min(args.legacy_sample, args.tickers)
+    started = time.perf_counter()
+    asyncio.run(legacy(tickers[:sample]))
+    legacy_elapsed = (time.perf_counter() - started) * args.tickers / sample
+    print(f"  before (per-ticker .info, extrapolated from {sample}): {legacy_elapsed:8.2f}s")
+
+    yfc.quote_cache.clear()
+    started = time.perf_counter()
+    quotes = asyncio.run(yfc.yfinance_client.get_quotes_batch(tickers))
+    batch_elapsed = time.perf_counter() - started
+    received = sum(1 for q in quotes.values() if q)
+    print(f"  after  (get_quotes_batch):                        {batch_elapsed:8.2f}s  ({received}/{len(tickers)} quotes)")
+
+    frame = make_download_stub(0)(tickers)
+    started = time.perf_counter()
+    yfc._parse_quotes_frame(frame, tickers)
+    print(f"  parse only ({len(tickers)} tickers):                    {time.perf_counter() - started:8.4f}s")
+    print(f"speedup: x{legacy_elapsed / batch_elapsed:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
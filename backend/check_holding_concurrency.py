@@ -0,0 +1,110 @@
+"""
+동시 거래 반영 점검
+- 두 세션이 같은 종목에 매수/매도를 동시에 추가(apply_transaction)하고, 결과 보유 상태가
+  전체 재계산(recalculate_holding) 결과와 같은지 확인합니다. 확인 후 추가한 거래는 삭제합니다.
+
+사용법: python check_holding_concurrency.py --email user@example.com --ticker 005930
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import select
+
+from app.core.database import async_session_maker, close_db
+from app.models.holding import Holding
+from app.models.stock import Stock
+from app.models.transaction import Transaction, TransactionType
+from app.services.auth_service import get_user_by_email
+from app.services.holding_service import holding_service
+
+HOLD_SECONDS = 1.0
+
+
+def _state(holding: Holding | None) -> tuple | None:
+    if holding is None:
+        return None
+    return (
+        float(holding.quantity),
+        float(holding.total_invested),
+        float(holding.realized_gain),
+        holding.last_transaction_id,
+    )
+
+
+def _same(a: tuple | None, b: tuple | None) -> bool:
+    # 금액 컬럼은 Numeric(18, 4)로 저장할 때마다 반올림되므로 그 오차는 허용
+    if a is None or b is None:
+        return a == b
+    return a[3] == b[3] and all(abs(x - y) < 0.01 for x, y in zip(a[:3], b[:3]))
+
+
+async def _append(user_id: int, stock_id: int, transaction_type: TransactionType, quantity: float,
+                  price: float, commit_after: float = 0.0) -> tuple[int, float]:
+    async with async_session_maker() as session:
+        txn = Transaction(
+            user_id=user_id, stock_id=stock_id, transaction_type=transaction_type,
+            quantity=quantity, price=price, exchange_rate=1.0, fees=0.0,
+            transaction_date=date.today(), notes="check_holding_concurrency",
+        )
+        session.add(txn)
+        await session.flush()
+        started = time.perf_counter()
+        await holding_service.apply_transaction(session, txn)
+        waited = time.perf_counter() - started
+        # 잠금을 쥔 채로 잠시 대기해 다른 세션의 반영이 겹치도록 한다
+        await asyncio.sleep(commit_after)
+        await session.commit()
+        return txn.id, waited
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        async with async_session_maker() as session:
+            user = await get_user_by_email(session, args.email)
+            stock = (await session.execute(select(Stock).where(Stock.ticker == args.ticker))).scalar_one_or_none()
+            if not user or not stock:
+                print("사용자 또는 종목을 찾을 수 없습니다.")
+                return 1
+            user_id, stock_id = user.id, stock.id
+            # 증분 반영 경로를 타도록 현재 상태를 한 번 저장
+            await holding_service.recalculate_holding(session, user_id, stock_id)
+            await session.commit()
+
+        first = asyncio.create_task(
+            _append(user_id, stock_id, TransactionType.BUY, 3, 100.0, commit_after=HOLD_SECONDS)
+        )
+        await asyncio.sleep(0.2)
+        second = asyncio.create_task(_append(user_id, stock_id, TransactionType.SELL, 1, 120.0))
+        (buy_id, _), (sell_id, waited) = await asyncio.gather(first, second)
+        print(f"두 번째 반영 대기 시간: {waited:.2f}s (잠금이 동작하면 약 {HOLD_SECONDS - 0.2:.1f}s 이상)")
+
+        async with async_session_maker() as session:
+            stmt = select(Holding).where(Holding.user_id == user_id, Holding.stock_id == stock_id)
+            incremental = _state((await session.execute(stmt)).scalar_one_or_none())
+            replayed = _state(await holding_service.recalculate_holding(session, user_id, stock_id))
+            await session.rollback()
+
+        ok = _same(incremental, replayed)
+        print(f"증분 반영: {incremental}")
+        print(f"전체 재계산: {replayed}")
+        print("✅ 일치" if ok else "❌ 불일치 (거래 유실)")
+
+        async with async_session_maker() as session:
+            for txn_id in (buy_id, sell_id):
+                await session.delete(await session.get(Transaction, txn_id))
+            await session.flush()
+            await holding_service.recalculate_holding(session, user_id, stock_id)
+            await session.commit()
+        return 0 if ok else 1
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--ticker", required=True)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -22,22 +22,22 @@ async def main():
         total_value_krw = Decimal("0")
 
         for h in holdings:
-            stock = h["stock"]
+            stock = h.stock
             if not stock:
                 continue
             
-            value_krw = Decimal(str(h["current_value_krw"]))
+            value_krw = Decimal(str(h.current_value_krw))
             total_value_krw += value_krw
             
             print(f"Stock: {stock.name}, Market: {stock.market_type}, Value(KRW): {value_krw}")
 
             if stock.market_type == MarketType.KR:
                 kr_value += value_krw
-                kr_invested += Decimal(str(h["total_invested"]))
+                kr_invested += Decimal(str(h.total_invested))
             else:
                 us_value_krw += value_krw
-                us_value_usd += Decimal(str(h["current_value"]))
-                us_invested += Decimal(str(h["total_invested"]))
+                us_value_usd += Decimal(str(h.current_value))
+                us_invested += Decimal(str(h.total_invested))
 
         print("\n--- Results ---")
         print(f"Total Value (KRW): {total_value_krw}")
@@ -21,9 +21,9 @@ async def main():
             
             total_value_krw = Decimal("0")
             for h in holdings:
-                print(f"Stock: {h['stock'].name}, Qty: {h['quantity']}, Curr Price: {h['stock'].current_price}, Avg Cost: {h['average_cost']}")
-                print(f"  -> Value KRW: {h['current_value_krw']}")
-                total_value_krw += Decimal(str(h["current_value_krw"]))
+                print(f"Stock: {h.stock.name}, Qty: {h.quantity}, Curr Price: {h.stock.current_price}, Avg Cost: {h.average_cost}")
+                print(f"  -> Value KRW: {h.current_value_krw}")
+                total_value_krw += Decimal(str(h.current_value_krw))
                 
             print(f"Total Value KRW: {total_value_krw}")
             
@@ -9,12 +9,12 @@ import logging
 from datetime import datetime, date, timedelta
 from typing import Any
 
-from sqlalchemy import select, and_
+from sqlalchemy import select
 from app.core.database import async_session_maker
 from app.models.stock import Stock
 from app.models.transaction import Transaction, TransactionType
-from app.models.market_data import MarketDataHistory
 from app.external.kis_client import kis_client
+from app.services.market_data_service import upsert_market_data
 
 logging.basicConfig(
     level=logging.INFO,
@@ -96,16 +96,6 @@ async def fetch_stock_historical_data(
         logger.info(f"종목: {name} ({ticker})")
         logger.info(f"첫 매수일: {first_buy_date}")
         
-        # 이미 수집된 데이터 확인
-        existing_stmt = select(MarketDataHistory).where(
-            MarketDataHistory.stock_id == stock_id
-        )
-        existing_result = await session.execute(existing_stmt)
-        existing_dates = {row.record_date for row in existing_result.scalars().all()}
-        
-        if existing_dates:
-            logger.info(f"기존 데이터: {len(existing_dates)}일치")
-        
         # 수집 기간 설정
         end_date = date.today()
         current_start = first_buy_date
@@ -139,38 +129,29 @@ async def fetch_stock_historical_data(
         logger.info(f"총 API 호출: {api_call_count}회")
         logger.info(f"수신 데이터: {len(all_data)}일치")
         
-        # DB 저장
-        saved_count = 0
-        skipped_count = 0
+        # DB 저장 (multi-row UPSERT)
+        rows = []
         
         for item in all_data:
             try:
-                record_date = datetime.strptime(item['stck_bsop_date'], "%Y%m%d").date()
-                
-                # 이미 존재하는 데이터는 스킵
-                if record_date in existing_dates:
-                    skipped_count += 1
-                    continue
-                
-                market_data = MarketDataHistory(
-                    stock_id=stock_id,
-                    record_date=record_date,
-                    open_price=float(item['stck_oprc']),
-                    high_price=float(item['stck_hgpr']),
-                    low_price=float(item['stck_lwpr']),
-                    close_price=float(item['stck_clpr']),
-                    volume=int(item['acml_vol'])
-                )
-                session.add(market_data)
-                saved_count += 1
+                rows.append({
+                    "stock_id": stock_id,
+                    "record_date": datetime.strptime(item['stck_bsop_date'], "%Y%m%d").date(),
+                    "open_price": float(item['stck_oprc']),
+                    "high_price": float(item['stck_hgpr']),
+                    "low_price": float(item['stck_lwpr']),
+                    "close_price": float(item['stck_clpr']),
+                    "volume": int(item['acml_vol']),
+                })
                 
             except Exception as e:
                 logger.error(f"  데이터 파싱 오류: {item}, {e}")
                 continue
         
+        saved_count = await upsert_market_data(session, rows)
         await session.commit()
         
-        logger.info(f"저장 완료: {saved_count}개 신규 저장, {skipped_count}개 스킵")
+        logger.info(f"저장 완료: {saved_count}개 저장 (기존 데이터는 갱신)")
 
 
 async def main():
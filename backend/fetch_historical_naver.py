@@ -15,7 +15,7 @@ from sqlalchemy import select
 from app.core.database import async_session_maker
 from app.models.stock import Stock
 from app.models.transaction import Transaction, TransactionType
-from app.models.market_data import MarketDataHistory
+from app.services.market_data_service import upsert_market_data
 
 logging.basicConfig(
     level=logging.INFO,
@@ -124,15 +124,6 @@ async def fetch_stock_historical_data(
         logger.info(f"종목: {name} ({ticker})")
         logger.info(f"첫 매수일: {first_buy_date}")
         
-        existing_stmt = select(MarketDataHistory).where(
-            MarketDataHistory.stock_id == stock_id
-        )
-        existing_result = await session.execute(existing_stmt)
-        existing_dates = {row.record_date for row in existing_result.scalars().all()}
-        
-        if existing_dates:
-            logger.info(f"기존 데이터: {len(existing_dates)}일치")
-        
         end_date = date.today()
         
         logger.info(f"수집 기간: {first_buy_date} ~ {end_date}")
@@ -147,29 +138,13 @@ async def fetch_stock_historical_data(
         
         logger.info(f"수신 데이터: {len(data)}일치")
         
-        saved_count = 0
-        skipped_count = 0
-        
-        for item in data:
-            if item['record_date'] in existing_dates:
-                skipped_count += 1
-                continue
-            
-            market_data = MarketDataHistory(
-                stock_id=stock_id,
-                record_date=item['record_date'],
-                open_price=item['open_price'],
-                high_price=item['high_price'],
-                low_price=item['low_price'],
-                close_price=item['close_price'],
-                volume=item['volume']
-            )
-            session.add(market_data)
-            saved_count += 1
-        
+        saved_count = await upsert_market_data(
+            session,
+            ({"stock_id": stock_id, **item} for item in data),
+        )
         await session.commit()
         
-        logger.info(f"저장 완료: {saved_count}개 신규 저장, {skipped_count}개 스킵")
+        logger.info(f"저장 완료: {saved_count}개 저장 (기존 데이터는 갱신)")
 
 
 async def main():
@@ -0,0 +1,58 @@
+"""
+CSV 거래내역 일괄 가져오기 (POST /api/transactions/import와 같은 처리)
+
+사용법: python import_transactions_csv.py --email user@example.com --file trades.csv [--skip-invalid] [--encoding cp949]
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.core.database import async_session_maker, close_db
+from app.core.redis import close_redis
+from app.core.response_cache import bump_user_version
+from app.services.auth_service import get_user_by_email
+from app.services.transaction_import import TransactionImportError, import_transactions
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        async with async_session_maker() as session:
+            user = await get_user_by_email(session, args.email)
+            if not user:
+                print(f"사용자를 찾을 수 없습니다: {args.email}")
+                return 1
+
+            started = time.perf_counter()
+            try:
+                with open(args.file, encoding=args.encoding, newline="") as f:
+                    result = await import_transactions(session, user.id, f, skip_invalid=args.skip_invalid)
+            except TransactionImportError as e:
+                print(f"❌ {e} (읽은 행 {e.rows_read})")
+                for error in e.errors:
+                    print(f"  line {error['line']}: {error['message']}")
+                return 1
+
+            await session.commit()
+            await bump_user_version(user.id)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"✅ {result['imported']}/{result['rows_read']}건 저장, "
+            f"보유 종목 {result['holdings_recalculated']}개 재계산 ({elapsed:.2f}s)"
+        )
+        for error in result["errors"]:
+            print(f"  skipped line {error['line']}: {error['message']}")
+        return 0
+    finally:
+        await close_redis()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--file", required=True)
+    parser.add_argument("--skip-invalid", action="store_true")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    sys.exit(asyncio.run(main(parser.parse_args())))
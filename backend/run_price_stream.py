@@ -0,0 +1,29 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import close_db
+from app.core.redis import close_redis
+from app.services.price_stream import PriceStreamService
+
+
+async def main():
+    if not settings.kis_app_key:
+        print("KIS_APP_KEY is not set, realtime streaming disabled.")
+        return
+
+    service = PriceStreamService()
+    print(f"Streaming KR prices from {settings.kis_websocket_url} (flush every {service.flush_interval}s)...")
+    try:
+        await service.run()
+    finally:
+        await close_redis()
+        await close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -243,4 +243,5 @@ export interface TransactionPageResponse {
   total_pages: number
   current_page: number
   available_years: number[]
+  next_cursor?: string | null
 }